@@ -10,8 +10,6 @@ import json
 import os
 from typing import Dict, Optional
 import logging
-import vertexai
-from vertexai.generative_models import GenerativeModel, GenerationConfig
 from prompts.system_prompt import SYSTEM_PROMPT, build_user_prompt
 
 logging.basicConfig(level=logging.INFO)
@@ -42,6 +40,10 @@ class ADKScorer:
         self.location = location
         self.model_name = model_name
 
+        # Imported here so MockADKScorer does not pull in the Vertex AI SDK
+        import vertexai
+        from vertexai.generative_models import GenerativeModel, GenerationConfig
+
         # Initialize Vertex AI
         try:
             vertexai.init(project=project_id, location=location)
@@ -201,8 +203,18 @@ class MockADKScorer:
     Always returns sample classification results
     """
 
+    scorer_version = 'mock'
+
     def __init__(self, *args, **kwargs):
         logger.warning("Using MockADKScorer - for testing only!")
+        self.reset_run_stats()
+
+    def evaluate(self, news_item: Dict) -> Dict:
+        """Mock verdict for kept and discarded items"""
+        result = self.score(news_item)
+        if result is None:
+            return {'keep': False, 'relevance_score': 0.1, 'reasoning': 'Mock discard (testing mode)'}
+        return {key: value for key, value in result.items() if key not in news_item}
 
     def score(self, news_item: Dict) -> Optional[Dict]:
         """Mock scoring - returns sample data"""
@@ -219,8 +231,11 @@ class MockADKScorer:
                          for keyword in mobility_keywords)
 
         if not is_relevant:
+            self.run_stats['discarded'] += 1
             return None
 
+        self.run_stats['kept'] += 1
+
         # Return mock enrichment
         return {
             **news_item,
@@ -231,12 +246,28 @@ class MockADKScorer:
             'entities': ['Mock Entity'],
             'summary': 'Mock summary for testing',
             'relevance_score': 0.75,
-            'reasoning': 'Mock reasoning (testing mode)'
+            'reasoning': 'Mock reasoning (testing mode)',
+            'scorer_version': self.scorer_version
         }
 
     def score_batch(self, news_items: list[Dict]) -> list[Dict]:
         """Mock batch scoring"""
         return [result for result in (self.score(item) for item in news_items) if result]
 
+    def get_run_stats(self) -> Dict:
+        return dict(self.run_stats)
+
+    def reset_run_stats(self):
+        self.run_stats = {
+            'kept': 0, 'discarded': 0, 'failed': 0, 'throttled': 0, 'retried': 0,
+            'input_tokens': 0, 'output_tokens': 0, 'metered_calls': 0,
+            'early_exits': 0, 'saved_output_tokens': 0, 'early_exit_seconds': 0.0,
+            'full_discards': 0, 'full_discard_seconds': 0.0,
+            'timeouts': 0, 'hedged': 0, 'hedge_wins': 0
+        }
+
+    def close(self):
+        pass
+
     def get_stats(self) -> Dict:
         return {'model': 'mock', 'mode': 'testing'}
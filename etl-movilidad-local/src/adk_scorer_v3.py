@@ -5,20 +5,44 @@ Replaces V2 which incorrectly used google-generativeai SDK
 """
 import logging
 import asyncio
+import json
 import os
-from typing import Dict, Optional
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
 from google import genai
 from google.adk.agents import LlmAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.models import Gemini
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 from schemas.scoring_schema import ScoringResponse
-from prompts.system_prompt import SYSTEM_PROMPT, build_user_prompt
+from prompts.system_prompt import SYSTEM_PROMPT, build_scorer_version, build_user_prompt
+from prompts.token_budget import DEFAULT_BODY_TOKEN_BUDGET, estimate_tokens
+from latency_tracker import LatencyTracker
+from metrics import METRICS
+from rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    RetryPolicy,
+    ScoringError,
+    TokenBucket,
+    classify_error,
+    FATAL,
+    INVALID_RESPONSE,
+    THROTTLED,
+    TRANSIENT,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Matches the keep field as soon as it has been streamed
+_KEEP_FIELD_RE = re.compile(r'"keep"\s*:\s*(true|false)')
+
 
 class ADKScorerV3:
     """
@@ -28,14 +52,40 @@ class ADKScorerV3:
     - Uses google.adk.agents.LlmAgent (NOT google.generativeai)
     - Enforces structured output via output_schema with Pydantic
     - Automatic JSON validation and error handling
+    - Client-side rate limiting (RPM/TPM), AIMD concurrency and retries
+    - Per-call deadlines and optional hedged requests for tail latency
+    - Thread-safe: all calls run on one background event-loop thread, so a
+      single instance (and its GenAI client) can be shared across threads
     - Production-ready for mobility news classification
     """
 
+    # Output tokens reserved per call in the tokens/min bucket until the
+    # real usage is known
+    EXPECTED_OUTPUT_TOKENS = 300
+
+    # Initial estimate of the output size of a complete keep=false response,
+    # refined from usage metadata of the discards that run to completion
+    EXPECTED_DISCARD_OUTPUT_TOKENS = 120
+
     def __init__(
         self,
         project_id: str,
         location: str = "us-central1",
-        model_name: str = "gemini-2.0-flash"
+        model_name: str = "gemini-2.0-flash",
+        requests_per_minute: Optional[float] = 60,
+        tokens_per_minute: Optional[float] = 120000,
+        max_concurrency: int = 16,
+        initial_concurrency: int = 4,
+        retry_policy: Optional[RetryPolicy] = None,
+        body_token_budget: Optional[int] = DEFAULT_BODY_TOKEN_BUDGET,
+        runner=None,
+        streaming: bool = False,
+        call_timeout: Optional[float] = 60.0,
+        hedge: bool = False,
+        hedge_percentile: float = 95.0,
+        hedge_max_ratio: float = 0.1,
+        hedge_min_delay: float = 0.5,
+        label_sink: Optional[Callable[[Dict, Dict, str], None]] = None
     ):
         """
         Initialize ADK Scorer V3 with Google ADK Agent
@@ -44,10 +94,72 @@ class ADKScorerV3:
             project_id: Google Cloud project ID
             location: Vertex AI location (default: us-central1)
             model_name: Gemini model to use (default: gemini-2.0-flash)
+            requests_per_minute: Client-side request quota (None = unlimited)
+            tokens_per_minute: Client-side token quota (None = unlimited)
+            max_concurrency: Upper bound for concurrent model calls
+            initial_concurrency: Starting concurrency for the AIMD limiter
+            retry_policy: Backoff policy for throttled/transient errors
+            body_token_budget: Token budget for the news body in the user
+                prompt (None = full body without boilerplate)
+            runner: Pre-built backend exposing the ADK Runner interface
+                (e.g. fake_llm.FakeRunner for offline benchmarks); when set,
+                no GenAI client or agent is created
+            streaming: Stream responses and cancel the generation as soon as
+                keep=false is parsed (discards skip summary/entities/reasoning)
+            call_timeout: Deadline per model call in seconds; an expired call
+                is cancelled and retried as a transient error (None = no deadline)
+            hedge: Send a duplicate request when a call has not answered
+                by the model's observed hedge_percentile latency; the first
+                response wins and the other call is cancelled
+            hedge_percentile: Latency percentile used as hedge delay
+            hedge_max_ratio: Cap on hedged requests as a fraction of calls
+            hedge_min_delay: Lower bound for the hedge delay in seconds
+            label_sink: Called as label_sink(news_item, verdict, scorer_version)
+                for every verdict, kept or discarded (e.g. the database's
+                save_scoring_label, to collect training labels)
         """
         self.project_id = project_id
         self.location = location
         self.model_name = model_name
+        self.scorer_version = build_scorer_version(model_name, body_token_budget)
+        self.body_token_budget = body_token_budget
+        self.streaming = streaming
+        self.run_config = RunConfig(streaming_mode=StreamingMode.SSE) if streaming else None
+        self._discard_output_tokens = float(self.EXPECTED_DISCARD_OUTPUT_TOKENS)
+
+        # Tail latency control
+        self.call_timeout = call_timeout
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_max_ratio = hedge_max_ratio
+        self.hedge_min_delay = hedge_min_delay
+        self.latency = LatencyTracker()
+        self._calls = 0
+        self._hedges = 0
+        self.label_sink = label_sink
+
+        # Dedicated event loop, started on first use (see _ensure_loop)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+
+        # Client-side throttling
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            initial_limit=initial_concurrency,
+            max_limit=max_concurrency
+        )
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.run_stats = self._empty_run_stats()
+
+        if runner is not None:
+            self.genai_client = None
+            self.agent = None
+            self.runner = runner
+            self.session_service = getattr(runner, 'session_service', None) or InMemorySessionService()
+            logger.info(f"✅ ADK scorer using injected runner: {type(runner).__name__}")
+            return
 
         # Create ADK components
         try:
@@ -103,16 +215,19 @@ class ADKScorerV3:
             logger.error(f"   3. Authenticated: gcloud auth application-default login")
             raise
 
-    async def _score_async(self, news_item: Dict, session_id: str) -> Optional[Dict]:
+    async def _run_agent(self, news_item: Dict, session_id: str) -> tuple:
         """
-        Internal async method to score news item
+        Run the ADK agent once and validate its structured output
 
         Args:
             news_item: Dict with keys: source, title, body, published_at, url
             session_id: Session ID for the runner
 
         Returns:
-            Enriched news item or None
+            Tuple (validated ScoringResponse dict, usage metadata or None)
+
+        Raises:
+            ScoringError: If the response is empty or fails validation
         """
         # Create session first
         await self.session_service.create_session(
@@ -122,7 +237,10 @@ class ADKScorerV3:
         )
 
         # Build user prompt from news item
-        user_prompt_text = build_user_prompt(news_item)
+        user_prompt_text = build_user_prompt(news_item, self.body_token_budget)
+        METRICS.observe(
+            'etl_scoring_prompt_bytes', len(user_prompt_text.encode('utf-8')), model=self.model_name
+        )
 
         logger.debug(f"Scoring: {news_item.get('title', 'Unknown')[:50]}...")
 
@@ -132,70 +250,440 @@ class ADKScorerV3:
             parts=[types.Part(text=user_prompt_text)]
         )
 
-        # Run the agent using Runner (returns async generator)
-        response_generator = self.runner.run_async(
-            user_id="scorer_user",
-            session_id=session_id,
-            new_message=message_content
-        )
+        if self.streaming:
+            early_exit, final_response = await self._stream_until_verdict(
+                news_item, session_id, message_content
+            )
+            if early_exit is not None:
+                return early_exit, None
+        else:
+            # Run the agent using Runner (returns async generator)
+            response_generator = self.runner.run_async(
+                user_id="scorer_user",
+                session_id=session_id,
+                new_message=message_content
+            )
 
-        # Iterate through the generator to get the final response
-        final_response = None
-        async for response in response_generator:
-            final_response = response
+            # Iterate through the generator to get the final response
+            final_response = None
+            async for response in response_generator:
+                final_response = response
 
         # Extract the agent response
         if not final_response:
-            logger.warning(f"No response from ADK for: {news_item.get('title', 'Unknown')}")
-            return None
+            raise ScoringError(
+                f"No response from ADK for: {news_item.get('title', 'Unknown')}",
+                error_class=INVALID_RESPONSE
+            )
+
+        usage = getattr(final_response, 'usage_metadata', None)
 
         # Extract JSON from Event object's content
         if hasattr(final_response, 'content') and final_response.content:
             if hasattr(final_response.content, 'parts') and final_response.content.parts:
                 # Get the text from the first part
-                response_text = final_response.content.parts[0].text
+                response_text = final_response.content.parts[0].text or ''
                 logger.debug(f"Extracted response text: {response_text[:200]}...")
 
                 # Parse JSON and validate with Pydantic
                 try:
-                    import json
                     result_dict = json.loads(response_text)
-
-                    # Validate with Pydantic model
                     scoring_result = ScoringResponse.model_validate(result_dict)
+                except json.JSONDecodeError as e:
+                    logger.error(f"Response text: {response_text}")
+                    raise ScoringError(f"JSON decode error: {e}", error_class=INVALID_RESPONSE)
+                except Exception as e:
+                    raise ScoringError(f"Validation error: {e}", error_class=INVALID_RESPONSE)
 
-                    # Convert to dict
-                    result = scoring_result.model_dump()
+                return scoring_result.model_dump(), usage
 
-                    # Check if news should be kept
-                    if not result.get('keep', False):
-                        logger.debug(
-                            f"News discarded: {news_item.get('title', 'Unknown')[:50]} "
-                            f"| Reason: {result.get('reasoning', 'N/A')}"
-                        )
-                        return None
+        raise ScoringError(
+            f"No scoring result in response for: {news_item.get('title', 'Unknown')}",
+            error_class=INVALID_RESPONSE
+        )
 
-                    # Merge ADK enrichment with original news item
-                    enriched = {**news_item, **result}
+    async def _stream_until_verdict(
+        self,
+        news_item: Dict,
+        session_id: str,
+        message_content: types.Content
+    ) -> tuple:
+        """
+        Stream the agent response and stop as soon as keep=false is parsed
 
-                    logger.info(
-                        f"✅ News kept: {news_item.get('title', 'Unknown')[:50]}... "
-                        f"| Severity: {result.get('severity')} "
-                        f"| Score: {result.get('relevance_score'):.2f}"
-                    )
+        Args:
+            news_item: News item being scored
+            session_id: Session ID for the runner
+            message_content: User message
 
-                    return enriched
+        Returns:
+            Tuple (early-exit verdict or None, final event or None). The
+            early-exit verdict only carries keep=false: the generation is
+            cancelled before summary, entities and reasoning are produced.
+        """
+        streamed = ''
+        final_event = None
 
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error: {e}")
-                    logger.error(f"Response text: {response_text}")
-                    return None
-                except Exception as e:
-                    logger.error(f"Validation error: {e}")
-                    return None
+        response_generator = self.runner.run_async(
+            user_id="scorer_user",
+            session_id=session_id,
+            new_message=message_content,
+            run_config=self.run_config
+        )
+        try:
+            async for event in response_generator:
+                if not getattr(event, 'partial', False):
+                    final_event = event
+                    continue
+
+                if event.content and event.content.parts:
+                    streamed += event.content.parts[0].text or ''
+                match = _KEEP_FIELD_RE.search(streamed)
+                if match and match.group(1) == 'false':
+                    return self._early_exit_verdict(news_item, streamed), None
+        finally:
+            # Closing the generator cancels the in-flight generation
+            await response_generator.aclose()
+
+        return None, final_event
+
+    def _early_exit_verdict(self, news_item: Dict, streamed: str) -> Dict:
+        """Account for a cancelled discard and build its minimal verdict"""
+        input_tokens = estimate_tokens(
+            SYSTEM_PROMPT + build_user_prompt(news_item, self.body_token_budget)
+        )
+        emitted_tokens = estimate_tokens(streamed)
+        saved_tokens = max(0, int(self._discard_output_tokens) - emitted_tokens)
+
+        # Usage metadata only comes with the final chunk, so early exits are
+        # metered with the local estimate
+        self.run_stats['input_tokens'] += input_tokens
+        self.run_stats['output_tokens'] += emitted_tokens
+        self.run_stats['metered_calls'] += 1
+        self.run_stats['early_exits'] += 1
+        self._count_tokens(input_tokens, emitted_tokens)
+        self.run_stats['saved_output_tokens'] += saved_tokens
+        self.token_bucket.adjust(self.EXPECTED_OUTPUT_TOKENS - emitted_tokens)
 
-        logger.warning(f"No scoring result in response for: {news_item.get('title', 'Unknown')}")
-        return None
+        return {
+            'keep': False,
+            'severity': None,
+            'tags': [],
+            'area': None,
+            'entities': [],
+            'summary': None,
+            'relevance_score': None,
+            'reasoning': 'Generation cancelled after keep=false (streaming early exit)',
+            'early_exit': True
+        }
+
+    async def _evaluate_async(self, news_item: Dict, session_id: str) -> Dict:
+        """
+        Internal async method to get the model verdict for a news item
+
+        Args:
+            news_item: Dict with keys: source, title, body, published_at, url
+            session_id: Session ID for the runner
+
+        Returns:
+            Validated ScoringResponse dict (for kept and discarded items).
+            Streaming early exits return a minimal keep=false verdict with
+            early_exit=True and no relevance_score.
+        """
+        start = time.monotonic()
+        result, usage = await self._run_agent(news_item, session_id)
+        elapsed = time.monotonic() - start
+        self._record_usage(news_item, usage)
+
+        if result.get('early_exit'):
+            self.run_stats['early_exit_seconds'] += elapsed
+        elif not result.get('keep'):
+            self.run_stats['full_discards'] += 1
+            self.run_stats['full_discard_seconds'] += elapsed
+            output_tokens = getattr(usage, 'candidates_token_count', None) if usage else None
+            if output_tokens:
+                # Moving average of complete discard size (for saved-token estimates)
+                self._discard_output_tokens += 0.1 * (output_tokens - self._discard_output_tokens)
+
+        return result
+
+    async def _score_async(self, news_item: Dict, session_id: str) -> Optional[Dict]:
+        """
+        Internal async method to score news item
+
+        Args:
+            news_item: Dict with keys: source, title, body, published_at, url
+            session_id: Session ID for the runner
+
+        Returns:
+            Enriched news item or None
+        """
+        result = await self._evaluate_async(news_item, session_id)
+        return self.merge_result(news_item, result)
+
+    def merge_result(self, news_item: Dict, result: Dict) -> Optional[Dict]:
+        """
+        Merge a model verdict into the news item
+
+        Args:
+            news_item: Original news item
+            result: Validated ScoringResponse dict
+
+        Returns:
+            Enriched news item, or None if the verdict is keep=false
+        """
+        # Check if news should be kept
+        if not result.get('keep', False):
+            logger.debug(
+                f"News discarded: {news_item.get('title', 'Unknown')[:50]} "
+                f"| Reason: {result.get('reasoning', 'N/A')}"
+            )
+            return None
+
+        # Merge ADK enrichment with original news item
+        enriched = {**news_item, **result, 'scorer_version': self.scorer_version}
+
+        logger.info(
+            f"✅ News kept: {news_item.get('title', 'Unknown')[:50]}... "
+            f"| Severity: {result.get('severity')} "
+            f"| Score: {result.get('relevance_score'):.2f}"
+        )
+
+        return enriched
+
+    def _estimate_call_tokens(self, news_item: Dict) -> int:
+        """Tokens reserved in the tokens/min bucket before a call"""
+        prompt = SYSTEM_PROMPT + build_user_prompt(news_item, self.body_token_budget)
+        return estimate_tokens(prompt) + self.EXPECTED_OUTPUT_TOKENS
+
+    def _record_usage(self, news_item: Dict, usage):
+        """
+        Record token usage reported by the model and correct the
+        tokens/min reservation with the real cost
+        """
+        if not usage:
+            return
+
+        input_tokens = getattr(usage, 'prompt_token_count', None) or 0
+        output_tokens = getattr(usage, 'candidates_token_count', None) or 0
+        total = getattr(usage, 'total_token_count', None) or input_tokens + output_tokens
+
+        self.run_stats['input_tokens'] += input_tokens
+        self.run_stats['output_tokens'] += output_tokens
+        self.run_stats['metered_calls'] += 1
+        self._count_tokens(input_tokens, output_tokens)
+
+        if total:
+            self.token_bucket.adjust(self._estimate_call_tokens(news_item) - total)
+
+    def _count_tokens(self, input_tokens: int, output_tokens: int):
+        METRICS.inc('etl_scoring_tokens_total', input_tokens, model=self.model_name, direction='input')
+        METRICS.inc('etl_scoring_tokens_total', output_tokens, model=self.model_name, direction='output')
+
+    async def _evaluate_with_retries(self, news_item: Dict) -> Dict:
+        """
+        Get the model verdict under the rate limiters, retrying throttled,
+        transient and invalid responses with jittered backoff
+
+        Args:
+            news_item: Dict with keys: source, title, body, published_at, url
+
+        Returns:
+            Validated ScoringResponse dict
+
+        Raises:
+            ScoringError: If the item could not be scored
+        """
+        title = news_item.get('title', 'Unknown')
+        attempt = 0
+
+        while True:
+            attempt += 1
+
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(self._estimate_call_tokens(news_item))
+            await self.concurrency.acquire()
+
+            error_class = None
+            last_error = None
+            try:
+                result = await self._hedged_call(news_item)
+                self.run_stats['kept' if result.get('keep') else 'discarded'] += 1
+                self._emit_label(news_item, result)
+                return result
+            except Exception as e:
+                error_class = classify_error(e)
+                last_error = e
+            finally:
+                self.concurrency.release(
+                    throttled=error_class == THROTTLED,
+                    success=error_class is None
+                )
+
+            if error_class == THROTTLED:
+                self.run_stats['throttled'] += 1
+
+            if not self.retry_policy.should_retry(error_class, attempt):
+                self.run_stats['failed'] += 1
+                logger.error(
+                    f"❌ Giving up on '{title[:50]}' after {attempt} attempt(s) "
+                    f"[{error_class}]: {last_error}"
+                )
+                raise ScoringError(
+                    str(last_error), error_class=error_class, attempts=attempt
+                ) from last_error
+
+            delay = self.retry_policy.backoff(attempt, error_class)
+            self.run_stats['retried'] += 1
+            logger.warning(
+                f"Retrying '{title[:50]}' in {delay:.1f}s "
+                f"(attempt {attempt}/{self.retry_policy.max_attempts}, {error_class}): {last_error}"
+            )
+            await asyncio.sleep(delay)
+
+    async def _timed_call(self, news_item: Dict, hedged: bool = False) -> Dict:
+        """
+        One model call under the per-call deadline
+
+        Successful calls feed the latency tracker; expired calls record the
+        deadline so a backend that keeps timing out raises the percentiles.
+
+        Raises:
+            ScoringError: TRANSIENT if the deadline expired
+        """
+        if hedged:
+            # The duplicate spends quota like any other request; the
+            # concurrency slot of the original call is shared
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(self._estimate_call_tokens(news_item))
+
+        session_id = f"score_{uuid.uuid4().hex[:8]}"
+        self._calls += 1
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(
+                self._evaluate_async(news_item, session_id), timeout=self.call_timeout
+            )
+        except asyncio.TimeoutError:
+            self.run_stats['timeouts'] += 1
+            self.latency.record(self.call_timeout)
+            METRICS.observe('etl_scoring_call_seconds', self.call_timeout, model=self.model_name)
+            raise ScoringError(
+                f"Model call exceeded the {self.call_timeout:.0f}s deadline",
+                error_class=TRANSIENT
+            )
+        elapsed = time.monotonic() - start
+        self.latency.record(elapsed)
+        METRICS.observe('etl_scoring_call_seconds', elapsed, model=self.model_name)
+        return result
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None if hedging is not allowed"""
+        if not self.hedge or not self.latency.is_warm:
+            return None
+        if self._hedges + 1 > self.hedge_max_ratio * self._calls:
+            return None
+        delay = max(self.hedge_min_delay, self.latency.percentile(self.hedge_percentile))
+        if self.call_timeout is not None and delay >= self.call_timeout:
+            return None
+        return delay
+
+    async def _hedged_call(self, news_item: Dict) -> Dict:
+        """
+        Model call that is duplicated if it is slower than the hedge delay
+
+        Returns:
+            Verdict of whichever call answered first
+
+        Raises:
+            ScoringError: If every call failed (first error is raised)
+        """
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._timed_call(news_item)
+
+        primary = asyncio.ensure_future(self._timed_call(news_item))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        # Re-check the cap: other items may have hedged while this one waited
+        if done or self._hedge_delay() is None:
+            return await primary
+
+        self._hedges += 1
+        self.run_stats['hedged'] += 1
+        hedge = asyncio.ensure_future(self._timed_call(news_item, hedged=True))
+        logger.debug(f"Hedging '{news_item.get('title', 'Unknown')[:50]}' after {delay:.2f}s")
+
+        pending = {primary, hedge}
+        first_error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.run_stats['hedge_wins'] += 1
+                        return task.result()
+                    first_error = first_error or task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise first_error
+
+    def _emit_label(self, news_item: Dict, result: Dict):
+        """Pass a verdict to the label sink; sink errors never fail scoring"""
+        if self.label_sink is None:
+            return
+        try:
+            self.label_sink(news_item, result, self.scorer_version)
+        except Exception as e:
+            logger.warning(f"Could not record scoring label: {e}")
+
+    async def _score_with_retries(self, news_item: Dict) -> Optional[Dict]:
+        """Score a news item with retries; None if the model discarded it"""
+        result = await self._evaluate_with_retries(news_item)
+        return self.merge_result(news_item, result)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the scorer's event-loop thread if it is not running"""
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name=f"adk-scorer-{self.model_name}",
+                    daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def _submit_coro(self, coro) -> Future:
+        """Schedule a coroutine on the scorer's loop from any thread"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def submit(self, news_item: Dict) -> Future:
+        """
+        Score a news item in the background (callable from any thread)
+
+        Args:
+            news_item: Dict with keys: source, title, body, published_at, url
+
+        Returns:
+            concurrent.futures.Future resolving to the enriched news item or
+            None (discarded); it raises ScoringError if the item failed
+        """
+        return self._submit_coro(self._score_with_retries(news_item))
+
+    def submit_evaluate(self, news_item: Dict) -> Future:
+        """Future-based version of evaluate() (callable from any thread)"""
+        return self._submit_coro(self._evaluate_with_retries(news_item))
+
+    async def score_async(self, news_item: Dict) -> Optional[Dict]:
+        """Async version of score(), usable from any event loop"""
+        return await asyncio.wrap_future(self.submit(news_item))
+
+    async def evaluate_async(self, news_item: Dict) -> Dict:
+        """Async version of evaluate(), usable from any event loop"""
+        return await asyncio.wrap_future(self.submit_evaluate(news_item))
 
     def score(self, news_item: Dict) -> Optional[Dict]:
         """
@@ -206,33 +694,67 @@ class ADKScorerV3:
 
         Returns:
             Enriched news item with ADK scoring fields, or None if not relevant
+
+        Raises:
+            ScoringError: If the item could not be scored after retries
         """
-        try:
-            # Generate unique session ID for this scoring request
-            import uuid
-            session_id = f"score_{uuid.uuid4().hex[:8]}"
+        return self._wait(self.submit(news_item), news_item)
 
-            # Get or create event loop
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_closed():
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+    def evaluate(self, news_item: Dict) -> Dict:
+        """
+        Get the raw model verdict for a news item, kept or not
+
+        Args:
+            news_item: Dict with keys: source, title, body, published_at, url
 
-            # Run async scoring in event loop
-            return loop.run_until_complete(self._score_async(news_item, session_id))
+        Returns:
+            Validated ScoringResponse dict
+
+        Raises:
+            ScoringError: If the item could not be scored after retries
+        """
+        return self._wait(self.submit_evaluate(news_item), news_item)
 
+    def _wait(self, future: Future, news_item: Dict):
+        """Block on a scoring future from sync code"""
+        if threading.current_thread() is self._loop_thread:
+            future.cancel()
+            raise RuntimeError("Blocking scorer call from its own event loop; use score_async()")
+        try:
+            return future.result()
+        except ScoringError:
+            logger.error(f"   News title: {news_item.get('title', 'Unknown')}")
+            raise
         except Exception as e:
             logger.error(f"❌ Error scoring news with ADK Agent: {e}")
             logger.error(f"   News title: {news_item.get('title', 'Unknown')}")
-            return None
+            self._count_failed()
+            raise ScoringError(str(e), error_class=FATAL) from e
+
+    def _count_failed(self):
+        """Count a failure seen by a caller thread on the loop, the stats' only writer"""
+        loop = self._loop
+        try:
+            loop.call_soon_threadsafe(self._bump_failed)
+        except (AttributeError, RuntimeError):
+            # No loop (closed meanwhile), so nothing else writes the stats
+            self._bump_failed()
+
+    def _bump_failed(self):
+        self.run_stats['failed'] += 1
+
+    async def _score_batch_async(self, news_items: list[Dict]) -> list:
+        return await asyncio.gather(
+            *(self._score_with_retries(item) for item in news_items),
+            return_exceptions=True
+        )
 
     def score_batch(self, news_items: list[Dict]) -> list[Dict]:
         """
-        Score multiple news items using ADK Agent
+        Score multiple news items concurrently using ADK Agent
+
+        Concurrency is bounded by the adaptive limiter and the RPM/TPM buckets.
+        Items that fail after retries are logged and left out of the result.
 
         Args:
             news_items: List of news items to score
@@ -242,23 +764,80 @@ class ADKScorerV3:
         """
         logger.info(f"Starting batch scoring of {len(news_items)} news items...")
 
-        enriched_items = []
+        results = self._submit_coro(self._score_batch_async(news_items)).result()
 
-        for i, item in enumerate(news_items, 1):
-            logger.debug(f"Processing {i}/{len(news_items)}...")
-            result = self.score(item)
-            if result:
+        enriched_items = []
+        failed = 0
+        for item, result in zip(news_items, results):
+            if isinstance(result, BaseException):
+                failed += 1
+                logger.error(f"Error scoring '{item.get('title', 'Unknown')[:50]}': {result}")
+            elif result:
                 enriched_items.append(result)
 
         kept_percentage = len(enriched_items) / len(news_items) * 100 if news_items else 0
 
         logger.info(
             f"✅ Batch scoring complete: "
-            f"{len(news_items)} input → {len(enriched_items)} kept ({kept_percentage:.1f}%)"
+            f"{len(news_items)} input → {len(enriched_items)} kept ({kept_percentage:.1f}%), "
+            f"{failed} failed"
         )
 
         return enriched_items
 
+    def close(self):
+        """Stop the event-loop thread (pending calls are cancelled)"""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is None:
+            return
+
+        async def _cancel_pending():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            loop.stop()
+
+        asyncio.run_coroutine_threadsafe(_cancel_pending(), loop)
+        thread.join(timeout=5)
+        if thread.is_alive():
+            # Closing a running loop raises; leave the daemon thread to exit
+            logger.warning("⚠️  Scorer event loop did not stop within 5s; leaving it open")
+            return
+        loop.close()
+
+    @staticmethod
+    def _empty_run_stats() -> Dict:
+        return {
+            'kept': 0, 'discarded': 0, 'failed': 0, 'throttled': 0, 'retried': 0,
+            'input_tokens': 0, 'output_tokens': 0, 'metered_calls': 0,
+            'early_exits': 0, 'saved_output_tokens': 0, 'early_exit_seconds': 0.0,
+            'full_discards': 0, 'full_discard_seconds': 0.0,
+            'timeouts': 0, 'hedged': 0, 'hedge_wins': 0
+        }
+
+    def get_run_stats(self) -> Dict:
+        """
+        Get outcome and token counters since the last reset
+
+        Returns:
+            Dict with kept, discarded, failed, throttled (429 responses),
+            retried (extra attempts), input_tokens and output_tokens (from the
+            model's usage metadata) and metered_calls (calls with usage data).
+            Streaming mode adds early_exits, saved_output_tokens (estimated)
+            and the time spent on early-exit vs complete discards. timeouts,
+            hedged and hedge_wins count expired calls, duplicate requests and
+            duplicates that answered first; latency holds the model's recent
+            call percentiles.
+        """
+        return {**self.run_stats, 'latency': self.latency.snapshot()}
+
+    def reset_run_stats(self):
+        """Reset run counters (called at the start of each run)"""
+        self.run_stats = self._empty_run_stats()
+
     def get_stats(self) -> Dict:
         """
         Get scorer statistics and configuration
@@ -268,10 +847,21 @@ class ADKScorerV3:
         """
         return {
             'model': self.model_name,
+            'scorer_version': self.scorer_version,
             'project': self.project_id,
             'location': self.location,
             'sdk_version': 'google-adk (Agent Development Kit)',
-            'agent_name': self.agent.name,
+            'agent_name': self.agent.name if self.agent else type(self.runner).__name__,
             'output_schema': 'ScoringResponse (Pydantic)',
-            'framework': 'Google ADK v0.2+'
+            'framework': 'Google ADK v0.2+',
+            'requests_per_minute': self.request_bucket.rate_per_minute or None,
+            'tokens_per_minute': self.token_bucket.rate_per_minute or None,
+            'concurrency_limit': self.concurrency.current_limit,
+            'max_attempts': self.retry_policy.max_attempts,
+            'body_token_budget': self.body_token_budget,
+            'streaming': self.streaming,
+            'call_timeout': self.call_timeout,
+            'hedge': self.hedge,
+            'hedge_max_ratio': self.hedge_max_ratio if self.hedge else None,
+            'run_stats': self.get_run_stats()
         }
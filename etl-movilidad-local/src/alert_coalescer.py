@@ -0,0 +1,199 @@
+"""
+Alert coalescing for bursts of related alerts
+The first alert for an area goes out at once and opens a window; follow-ups
+for the same area (sharing a tag) within the window are held and sent as a
+single digest when it closes. Critical alerts are never held.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from metrics import METRICS
+from text_utils import normalize_area
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class _Group:
+    """Open window of one area/tag group"""
+
+    def __init__(self, alert: Dict, expires_at: float):
+        self.area = normalize_area(alert.get('area'))
+        self.tags = set(alert.get('tags') or [])
+        self.expires_at = expires_at
+        self.first = alert
+        self.held: List[Dict] = []
+
+    def matches(self, alert: Dict) -> bool:
+        if normalize_area(alert.get('area')) != self.area:
+            return False
+        tags = set(alert.get('tags') or [])
+        return not tags or not self.tags or bool(tags & self.tags)
+
+
+class AlertCoalescer:
+    """
+    Decides which alerts go out now and folds the rest into digests
+
+    Digests are sent from a background timer thread when their window
+    closes (or by flush() at shutdown); a digest that is not delivered keeps
+    its follow-ups and is sent again after retry_seconds.
+    """
+
+    def __init__(
+        self,
+        send_digest: Callable[[Dict, List[Dict]], bool],
+        window_seconds: float = 600,
+        immediate_severities: tuple = ('critical',),
+        retry_seconds: float = 60
+    ):
+        """
+        Initialize alert coalescer
+
+        Args:
+            send_digest: Called with the group's first alert and the held
+                follow-ups when a window closes; returns True once the
+                digest is delivered (False or an exception = not delivered)
+            window_seconds: Length of a group's window, from its first alert
+            immediate_severities: Severities that are never held
+            retry_seconds: Delay before a digest that failed is sent again
+        """
+        self.send_digest = send_digest
+        self.window_seconds = window_seconds
+        self.immediate_severities = immediate_severities
+        self.retry_seconds = retry_seconds
+        self._groups: List[_Group] = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self._closed = False
+        self._listeners: List[Callable[[List[Dict], bool], List[Dict]]] = []
+        self.stats = {'immediate': 0, 'coalesced': 0, 'digests': 0, 'digest_failures': 0}
+
+    def add_listener(self, callback: Callable[[List[Dict], bool], List[Dict]]):
+        """
+        Be told the outcome of every digest
+
+        Args:
+            callback: Called with a digest's follow-ups and whether it was
+                delivered; returns the follow-ups it takes back after a
+                failure (those are not kept for the digest's retry)
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, follow_ups: List[Dict], delivered: bool) -> List[Dict]:
+        """Report a digest to the listeners; returns the follow-ups none took back"""
+        taken = []
+        for callback in self._listeners:
+            try:
+                taken.extend(callback(follow_ups, delivered) or [])
+            except Exception as e:
+                logger.error(f"Error in alert digest listener: {e}")
+        return [alert for alert in follow_ups if not any(alert is other for other in taken)]
+
+    def hold(self, alert: Dict) -> bool:
+        """
+        Register an alert
+
+        Args:
+            alert: Prepared alert data (severity, area, tags, ...)
+
+        Returns:
+            True if the alert was folded into an open digest, False if it
+            must be sent now
+        """
+        now = time.monotonic()
+        with self._condition:
+            # Closed windows without follow-ups have nothing left to send
+            self._groups = [g for g in self._groups if g.expires_at > now or g.held]
+            group = next((g for g in self._groups if g.expires_at > now and g.matches(alert)), None)
+            if group is None:
+                self._groups.append(_Group(alert, now + self.window_seconds))
+                held = False
+            else:
+                group.tags.update(alert.get('tags') or [])
+                held = alert.get('severity') not in self.immediate_severities
+                if held:
+                    group.held.append(alert)
+                    self._start_timer()
+                    self._condition.notify_all()
+
+            self.stats['coalesced' if held else 'immediate'] += 1
+        METRICS.inc('etl_alerts_total', delivery='coalesced' if held else 'immediate')
+        return held
+
+    def _start_timer(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='alert-digests', daemon=True)
+            self._thread.start()
+
+    def _take_due(self, everything: bool = False) -> List[_Group]:
+        """Remove closed windows (all of them if everything); return those with follow-ups"""
+        now = time.monotonic()
+        due = [g for g in self._groups if everything or g.expires_at <= now]
+        self._groups = [g for g in self._groups if g not in due]
+        return [g for g in due if g.held]
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                due = self._take_due()
+                if not due:
+                    pending = [g.expires_at for g in self._groups if g.held]
+                    timeout = min(pending) - time.monotonic() if pending else None
+                    self._condition.wait(timeout)
+                    continue
+            self._send(due)
+
+    def _send(self, groups: List[_Group]):
+        for group in groups:
+            area = group.area or 'unknown area'
+            try:
+                delivered = self.send_digest(group.first, group.held)
+            except Exception as e:
+                logger.error(f"Error sending alert digest for {area}: {e}")
+                delivered = False
+            if not delivered:
+                with self._condition:
+                    self.stats['digest_failures'] += 1
+                group.held = self._notify(group.held, False)
+                if group.held:
+                    self._keep(group)
+                continue
+            self._notify(group.held, True)
+            with self._condition:
+                self.stats['digests'] += 1
+            METRICS.inc('etl_alert_digests_total')
+            logger.info(f"📨 Digest sent: {len(group.held)} follow-up alerts for {area}")
+
+    def _keep(self, group: _Group):
+        """Hold an undelivered digest's follow-ups for another attempt"""
+        area = group.area or 'unknown area'
+        with self._condition:
+            if self._closed:
+                logger.error(f"❌ Digest for {area} not delivered at shutdown: {len(group.held)} follow-up alerts lost")
+                return
+            group.expires_at = time.monotonic() + self.retry_seconds
+            self._groups.append(group)
+            self._start_timer()
+            self._condition.notify_all()
+        logger.warning(
+            f"Digest for {area} not delivered; keeping {len(group.held)} follow-up alerts, "
+            f"retry in {self.retry_seconds:g}s"
+        )
+
+    def flush(self):
+        """Send the digests of every open window now"""
+        with self._condition:
+            due = self._take_due(everything=True)
+        self._send(due)
+
+    def close(self):
+        """Flush open digests and stop the timer thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self.flush()
@@ -0,0 +1,252 @@
+"""
+Append-only alert log (JSON Lines)
+Each alert is one line written with a single append, so recording an alert
+costs the same regardless of history size and a crash can at most leave
+one torn last line (skipped when reading). The log rotates by size and age;
+recent alerts are read backwards from the end of the file.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FSYNC_MODES = ('always', 'interval', 'never')
+# Bytes read per step when scanning the log backwards
+READ_BLOCK = 64 * 1024
+
+
+class AlertLog:
+    """
+    JSONL alert log with fsync control and size/time rotation
+
+    Rotated files are renamed to <path>.<YYYYmmdd-HHMMSS> and the newest
+    `backups` are kept. Writers in other processes notice the rotation
+    (the file at path changes) and reopen it.
+    """
+
+    def __init__(
+        self,
+        path: str = "logs/alerts.jsonl",
+        fsync: str = "always",
+        fsync_interval: float = 1.0,
+        max_bytes: int = 10 * 1024 * 1024,
+        max_age_seconds: float = 30 * 86400,
+        backups: int = 10,
+        legacy_path: Optional[str] = None
+    ):
+        """
+        Initialize alert log
+
+        Args:
+            path: JSONL file
+            fsync: 'always' (every alert), 'interval' (at most every
+                fsync_interval seconds) or 'never' (left to the OS)
+            fsync_interval: Seconds between fsyncs in 'interval' mode
+            max_bytes: Rotate when the file reaches this size (0 = never)
+            max_age_seconds: Rotate when the file is older than this (0 = never)
+            backups: Rotated files kept
+            legacy_path: Old JSON-array log converted once into this one
+
+        Raises:
+            ValueError: If fsync is not a known mode
+        """
+        if fsync not in FSYNC_MODES:
+            raise ValueError(f"fsync must be one of {FSYNC_MODES}, got {fsync!r}")
+        self.path = Path(path)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.backups = backups
+        self._lock = threading.Lock()
+        self._file = None
+        self._opened_at = 0.0
+        self._last_fsync = 0.0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if legacy_path and os.path.exists(legacy_path):
+            self._migrate(Path(legacy_path))
+
+    def _migrate(self, legacy: Path):
+        """Convert the old JSON-array log, keeping its alerts before any new ones"""
+        # Claim the file first: of several processes starting at once, one migrates
+        claimed = legacy.with_name(legacy.name + '.migrating')
+        try:
+            os.rename(legacy, claimed)
+        except FileNotFoundError:
+            return
+        try:
+            with open(claimed, 'r', encoding='utf-8') as f:
+                alerts = json.load(f)
+            if not isinstance(alerts, list):
+                raise ValueError("not a JSON array")
+        except (OSError, ValueError) as e:
+            os.rename(claimed, legacy)
+            logger.error(f"Could not migrate {legacy}: {e}; left in place")
+            return
+
+        with self._lock:
+            tmp = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp, 'w', encoding='utf-8') as out:
+                for alert in alerts:
+                    out.write(json.dumps(alert, ensure_ascii=False, default=str) + '\n')
+                if self.path.exists():
+                    with open(self.path, 'r', encoding='utf-8') as current:
+                        for line in current:
+                            out.write(line)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, self.path)
+        os.rename(claimed, legacy.with_name(legacy.name + '.migrated'))
+        logger.info(f"✓ Migrated {len(alerts)} alerts from {legacy} to {self.path}")
+
+    def _open(self):
+        self._file = open(self.path, 'a', encoding='utf-8')
+        stat = os.fstat(self._file.fileno())
+        if stat.st_size and not self._ends_with_newline():
+            # Close a line torn by a crash so the next alert starts clean
+            self._file.write('\n')
+        # Age counts from the first alert in the file (mtime of an empty one)
+        self._opened_at = self._first_timestamp() or stat.st_mtime
+        self._inode = stat.st_ino
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def _first_timestamp(self) -> Optional[float]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                first = f.readline()
+            return datetime.fromisoformat(json.loads(first)['timestamp']).timestamp()
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _rotated_by_other_process(self) -> bool:
+        try:
+            return os.stat(self.path).st_ino != self._inode
+        except FileNotFoundError:
+            return True
+
+    def _should_rotate(self, incoming: int) -> bool:
+        size = self._file.tell()
+        if not size:
+            return False
+        if self.max_bytes and size + incoming > self.max_bytes:
+            return True
+        return bool(self.max_age_seconds) and time.time() - self._opened_at > self.max_age_seconds
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        base = f"{self.path.name}.{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        target = self.path.with_name(base)
+        suffix = 1
+        while target.exists():
+            target = self.path.with_name(f"{base}-{suffix:03d}")
+            suffix += 1
+        os.replace(self.path, target)
+        for old in self.rotated_files()[self.backups:]:
+            old.unlink()
+        logger.info(f"Rotated alert log to {target.name}")
+
+    def rotated_files(self) -> List[Path]:
+        """Rotated logs, newest first"""
+        files = self.path.parent.glob(self.path.name + '.2*')
+        return sorted(files, key=lambda p: p.name, reverse=True)
+
+    def append(self, alert: Dict):
+        """
+        Append one alert
+
+        Raises:
+            OSError: If the alert could not be written
+        """
+        line = json.dumps(alert, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            if self._file is not None and self._rotated_by_other_process():
+                self._file.close()
+                self._file = None
+            if self._file is None:
+                self._open()
+            if self._should_rotate(len(line.encode('utf-8'))):
+                self._rotate()
+                self._open()
+
+            # One write per line: appends from several processes never interleave
+            self._file.write(line)
+            self._file.flush()
+            now = time.time()
+            if self.fsync == 'always' or (
+                self.fsync == 'interval' and now - self._last_fsync >= self.fsync_interval
+            ):
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+
+    def _read_backwards(self, path: Path) -> Iterator[Dict]:
+        """Alerts of one file, last first, reading fixed-size blocks from the end"""
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            position = f.seek(0, os.SEEK_END)
+            tail = b''
+            while position > 0:
+                step = min(READ_BLOCK, position)
+                position -= step
+                f.seek(position)
+                lines = (f.read(step) + tail).split(b'\n')
+                # The first piece may be the end of a line in the previous block
+                tail = lines.pop(0)
+                for line in reversed(lines):
+                    alert = self._parse(line)
+                    if alert is not None:
+                        yield alert
+            alert = self._parse(tail)
+            if alert is not None:
+                yield alert
+
+    def _parse(self, line: bytes) -> Optional[Dict]:
+        if not line.strip():
+            return None
+        try:
+            return json.loads(line)
+        except ValueError:
+            # Torn write from a crash
+            logger.warning(f"Skipping malformed line in {self.path}")
+            return None
+
+    def recent(self, limit: int = 20) -> List[Dict]:
+        """
+        Most recent alerts, oldest first (as they were written)
+
+        Reads backwards from the end of the current file, continuing into
+        rotated files only when it holds fewer than limit alerts.
+        """
+        alerts = []
+        for path in [self.path] + self.rotated_files():
+            for alert in self._read_backwards(path):
+                if len(alerts) >= limit:
+                    break
+                alerts.append(alert)
+            if len(alerts) >= limit:
+                break
+        alerts.reverse()
+        return alerts
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                if self.fsync != 'never':
+                    os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
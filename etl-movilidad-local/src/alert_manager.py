@@ -3,14 +3,18 @@ Alert Manager for ETL Movilidad Medellín
 Sends alerts for high/critical severity news via multiple channels
 """
 import os
-import smtplib
-import json
 import logging
+import requests
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from typing import Dict, List, Optional
-from pathlib import Path
+
+from alert_coalescer import AlertCoalescer
+from alert_log import AlertLog
+from alert_outbox import AlertChannel
+from email_transport import EmailSender, SMTPTransport
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,7 +23,7 @@ logger = logging.getLogger(__name__)
 class AlertManager:
     """
     Manages alerts for high-severity news
-    Supports: Email, Console, and File-based alerts
+    Supports: Email, Console, File-based and Webhook alerts
     """
 
     def __init__(
@@ -30,9 +34,11 @@ class AlertManager:
         smtp_user: str = None,
         smtp_password: str = None,
         alert_recipients: List[str] = None,
+        smtp_starttls: bool = True,
         console_alerts: bool = True,
         file_alerts: bool = True,
-        alerts_file: str = "logs/alerts.json"
+        alerts_file: str = "logs/alerts.jsonl",
+        webhook_url: Optional[str] = None
     ):
         """
         Initialize Alert Manager
@@ -44,9 +50,13 @@ class AlertManager:
             smtp_user: SMTP username
             smtp_password: SMTP password
             alert_recipients: List of recipient emails
+            smtp_starttls: Upgrade the SMTP session with STARTTLS
             console_alerts: Enable console output
-            file_alerts: Enable JSON file logging
-            alerts_file: Path to alerts log file
+            file_alerts: Enable JSON Lines file logging
+            alerts_file: Path to alerts log file (an old JSON-array log next
+                to it, alerts.json, is migrated on first use)
+            webhook_url: URL the alert JSON is POSTed to (default
+                ALERT_WEBHOOK_URL; None/empty = no webhook)
         """
         self.email_enabled = email_enabled
         self.smtp_host = smtp_host
@@ -57,10 +67,22 @@ class AlertManager:
         self.console_alerts = console_alerts
         self.file_alerts = file_alerts
         self.alerts_file = alerts_file
+        self.webhook_url = webhook_url or os.getenv("ALERT_WEBHOOK_URL") or None
+        self.webhook_timeout = float(os.getenv("ALERT_WEBHOOK_TIMEOUT", "5"))
+        self.email_timeout = float(os.getenv("ALERT_EMAIL_TIMEOUT", "120"))
 
-        # Create logs directory if needed
+        # Append-only log; every alert is written (and by default fsynced) on its own
+        self.alert_log = None
         if self.file_alerts:
-            Path(alerts_file).parent.mkdir(parents=True, exist_ok=True)
+            self.alert_log = AlertLog(
+                alerts_file,
+                fsync=os.getenv("ALERT_LOG_FSYNC", "always"),
+                fsync_interval=float(os.getenv("ALERT_LOG_FSYNC_INTERVAL", "1")),
+                max_bytes=int(float(os.getenv("ALERT_LOG_MAX_MB", "10")) * 1024 * 1024),
+                max_age_seconds=float(os.getenv("ALERT_LOG_MAX_AGE_DAYS", "30")) * 86400,
+                backups=int(os.getenv("ALERT_LOG_BACKUPS", "10")),
+                legacy_path=os.path.splitext(alerts_file)[0] + '.json'
+            )
 
         # Validate email config
         if self.email_enabled:
@@ -68,6 +90,31 @@ class AlertManager:
                 logger.warning("Email alerts enabled but configuration incomplete. Disabling email.")
                 self.email_enabled = False
 
+        # Emails go out from a background thread over one reused SMTP session
+        self.email_sender = None
+        if self.email_enabled:
+            self.email_sender = EmailSender(
+                SMTPTransport(
+                    smtp_host, smtp_port, smtp_user, smtp_password,
+                    starttls=smtp_starttls,
+                    idle_timeout=float(os.getenv("SMTP_IDLE_TIMEOUT", "120"))
+                ),
+                max_attempts=int(os.getenv("SMTP_MAX_ATTEMPTS", "3"))
+            )
+
+        # Follow-up alerts for an area already alerted within the window are
+        # folded into one digest (0 = every alert goes out on its own)
+        self.coalescer = None
+        coalesce_window = float(os.getenv("ALERT_COALESCE_WINDOW_SECONDS", "0"))
+        if coalesce_window > 0:
+            self.coalescer = AlertCoalescer(
+                self._send_digest,
+                window_seconds=coalesce_window,
+                immediate_severities=tuple(
+                    os.getenv("ALERT_COALESCE_IMMEDIATE", "critical").split(",")
+                )
+            )
+
     def send_alert(self, news_item: Dict) -> bool:
         """
         Send alert for a news item
@@ -86,6 +133,12 @@ class AlertManager:
 
         alert_data = self._prepare_alert_data(news_item)
 
+        if self.coalescer is not None and self.coalescer.hold(alert_data):
+            # Goes out in the area's digest; the file log records it now
+            if self.file_alerts:
+                return self._send_file_alert({**alert_data, 'delivery': 'coalesced'})
+            return True
+
         success = True
 
         # Console alert
@@ -100,8 +153,77 @@ class AlertManager:
         if self.email_enabled:
             success = success and self._send_email_alert(alert_data)
 
+        # Webhook alert
+        if self.webhook_url:
+            try:
+                self._send_webhook_alert(alert_data)
+            except Exception as e:
+                logger.error(f"Error sending webhook alert: {e}")
+                success = False
+
         return success
 
+    def channels(self) -> List[AlertChannel]:
+        """
+        Enabled delivery channels, for the alert outbox dispatcher
+
+        Each channel's deliver() returns once the alert is confirmed
+        delivered and raises otherwise, so the dispatcher can retry it.
+        Console and email alerts can be folded into a digest; the file log
+        records every alert and digests are not posted to the webhook, so
+        those two always deliver each alert.
+        """
+        channels = []
+        if self.console_alerts:
+            channels.append(AlertChannel('console', self._send_console_alert))
+        if self.file_alerts:
+            channels.append(AlertChannel('file', self._deliver_file_alert, coalesce=False, concurrency=1))
+        if self.email_enabled:
+            channels.append(AlertChannel('email', self._deliver_email_alert))
+        if self.webhook_url:
+            channels.append(AlertChannel('webhook', self._send_webhook_alert, coalesce=False, concurrency=4))
+        return channels
+
+    def _deliver_file_alert(self, alert_data: Dict):
+        if not self._send_file_alert(alert_data):
+            raise IOError(f"could not append to {self.alerts_file}")
+
+    def _deliver_email_alert(self, alert_data: Dict):
+        """Send the alert email and wait for the SMTP server to accept it"""
+        self._wait_email(self._build_email(alert_data))
+
+    def _wait_email(self, msg: MIMEMultipart):
+        """
+        Send an email through the sender and wait until it is delivered
+
+        A message still queued after email_timeout is cancelled, so a retry
+        by the caller cannot send it twice; one already being sent is
+        waited for (the SMTP socket timeout bounds it).
+
+        Raises:
+            TimeoutError: If the message was cancelled unsent
+            Exception: The sender's last error if the message was given up
+        """
+        future = self.email_sender.submit(msg)
+        try:
+            future.result(self.email_timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                raise TimeoutError(f"email still queued after {self.email_timeout:g}s (cancelled)")
+            future.result()
+
+    def _send_webhook_alert(self, alert_data: Dict):
+        """
+        POST the alert as JSON to the webhook
+
+        Raises:
+            requests.RequestException: If the request failed or the
+                endpoint answered with an error status
+        """
+        response = requests.post(self.webhook_url, json=alert_data, timeout=self.webhook_timeout)
+        response.raise_for_status()
+        logger.debug(f"Webhook alert delivered: {response.status_code}")
+
     def send_batch_alert(self, news_items: List[Dict]) -> int:
         """
         Send alerts for multiple news items
@@ -130,7 +252,9 @@ class AlertManager:
             'source': news_item.get('source'),
             'url': news_item.get('url'),
             'published_at': news_item.get('published_at'),
-            'relevance_score': news_item.get('relevance_score')
+            'relevance_score': news_item.get('relevance_score'),
+            'incident_id': news_item.get('incident_id'),
+            'incident_size': news_item.get('incident_size', 1)
         }
 
     def _send_console_alert(self, alert_data: Dict):
@@ -152,44 +276,69 @@ class AlertManager:
         print(f"Fuente: {alert_data['source']}")
         print(f"URL: {alert_data['url']}")
         print(f"Tags: {', '.join(alert_data['tags'])}")
+        if alert_data.get('incident_size', 1) > 1:
+            print(f"Incidente: #{alert_data['incident_id']} ({alert_data['incident_size']} reportes)")
         print(f"{'='*60}\n")
 
     def _send_file_alert(self, alert_data: Dict) -> bool:
-        """Append alert to JSON file"""
+        """Append alert to the JSONL log"""
         try:
-            # Read existing alerts
-            alerts = []
-            if os.path.exists(self.alerts_file):
-                with open(self.alerts_file, 'r', encoding='utf-8') as f:
-                    try:
-                        alerts = json.load(f)
-                    except json.JSONDecodeError:
-                        alerts = []
-
-            # Append new alert
-            alerts.append(alert_data)
-
-            # Write back
-            with open(self.alerts_file, 'w', encoding='utf-8') as f:
-                json.dump(alerts, f, indent=2, ensure_ascii=False)
-
+            self.alert_log.append(alert_data)
             logger.debug(f"Alert logged to file: {self.alerts_file}")
             return True
         except Exception as e:
             logger.error(f"Error writing alert to file: {e}")
             return False
 
+    def _send_digest(self, first: Dict, follow_ups: List[Dict]) -> bool:
+        """
+        Send the follow-ups of an area's window as one console/email digest
+
+        Returns:
+            True once the digest is delivered (the email accepted by the
+            SMTP server), False otherwise
+        """
+        if self.console_alerts:
+            print(f"\n📨 RESUMEN DE ALERTAS - {first['area'] or 'Área sin definir'}")
+            print(f"{'='*60}")
+            print(f"{len(follow_ups)} alertas adicionales desde: {first['title']}")
+            for alert in follow_ups:
+                print(f"- [{alert['severity'].upper()}] {alert['title']} ({alert['source']})")
+            print(f"{'='*60}\n")
+
+        if self.email_enabled:
+            try:
+                self._wait_email(self._build_digest_email(first, follow_ups))
+            except Exception as e:
+                logger.error(f"Error sending digest email: {e}")
+                return False
+        return True
+
     def _send_email_alert(self, alert_data: Dict) -> bool:
-        """Send alert via email"""
+        """
+        Queue alert email; delivery (with retries) happens off the calling
+        thread, and failures are logged by the sender
+        """
+        return self._queue_email(self._build_email(alert_data))
+
+    def _queue_email(self, msg: MIMEMultipart) -> bool:
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"[{alert_data['severity'].upper()}] Alerta Movilidad: {alert_data['title'][:50]}"
-            msg['From'] = self.smtp_user
-            msg['To'] = ', '.join(self.alert_recipients)
-
-            # Plain text version
-            text_body = f"""
+            self.email_sender.submit(msg)
+            return True
+        except Exception as e:
+            logger.error(f"Error queueing email alert: {e}")
+            return False
+
+    def _build_email(self, alert_data: Dict) -> MIMEMultipart:
+        """Build the plain text + HTML alert email"""
+        # Create message
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = f"[{alert_data['severity'].upper()}] Alerta Movilidad: {alert_data['title'][:50]}"
+        msg['From'] = self.smtp_user
+        msg['To'] = ', '.join(self.alert_recipients)
+
+        # Plain text version
+        text_body = f"""
 ALERTA DE MOVILIDAD - {alert_data['severity'].upper()}
 
 Título: {alert_data['title']}
@@ -209,8 +358,8 @@ Score de relevancia: {alert_data['relevance_score']}
 Timestamp alerta: {alert_data['timestamp']}
 """
 
-            # HTML version
-            html_body = f"""
+        # HTML version
+        html_body = f"""
 <html>
 <head>
     <style>
@@ -247,39 +396,84 @@ Timestamp alerta: {alert_data['timestamp']}
 </html>
 """
 
-            # Attach both versions
-            part1 = MIMEText(text_body, 'plain', 'utf-8')
-            part2 = MIMEText(html_body, 'html', 'utf-8')
-            msg.attach(part1)
-            msg.attach(part2)
-
-            # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
-
-            logger.info(f"Email alert sent to {len(self.alert_recipients)} recipients")
-            return True
+        # Attach both versions
+        part1 = MIMEText(text_body, 'plain', 'utf-8')
+        part2 = MIMEText(html_body, 'html', 'utf-8')
+        msg.attach(part1)
+        msg.attach(part2)
+        return msg
+
+    def _build_digest_email(self, first: Dict, follow_ups: List[Dict]) -> MIMEMultipart:
+        """Build the plain text + HTML digest email of an area's follow-ups"""
+        area = first['area'] or 'Área sin definir'
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = f"[RESUMEN] {len(follow_ups)} alertas más de movilidad: {area[:50]}"
+        msg['From'] = self.smtp_user
+        msg['To'] = ', '.join(self.alert_recipients)
+
+        text_lines = [
+            f"RESUMEN DE ALERTAS - {area}",
+            "",
+            f"Alertas adicionales desde \"{first['title']}\" ({first['timestamp']}):",
+            ""
+        ]
+        html_items = []
+        for alert in follow_ups:
+            text_lines.append(
+                f"- [{alert['severity'].upper()}] {alert['title']}\n"
+                f"  {alert['summary']}\n  {alert['source']} - {alert['url']}"
+            )
+            html_items.append(
+                f"<li><strong>[{alert['severity'].upper()}]</strong> "
+                f"<a href=\"{alert['url']}\">{alert['title']}</a><br>"
+                f"{alert['summary']}<br><small>{alert['source']}</small></li>"
+            )
+
+        html_body = f"""
+<html>
+<body>
+    <h2>📨 RESUMEN DE ALERTAS - {area}</h2>
+    <p>Alertas adicionales desde <em>{first['title']}</em> ({first['timestamp']}):</p>
+    <ul>
+        {''.join(html_items)}
+    </ul>
+</body>
+</html>
+"""
 
-        except Exception as e:
-            logger.error(f"Error sending email alert: {e}")
-            return False
+        msg.attach(MIMEText('\n'.join(text_lines), 'plain', 'utf-8'))
+        msg.attach(MIMEText(html_body, 'html', 'utf-8'))
+        return msg
 
     def get_recent_alerts(self, limit: int = 20) -> List[Dict]:
-        """Get recent alerts from file"""
-        if not os.path.exists(self.alerts_file):
+        """Get recent alerts from file (read backwards from its end)"""
+        if self.alert_log is None:
             return []
 
         try:
-            with open(self.alerts_file, 'r', encoding='utf-8') as f:
-                alerts = json.load(f)
-                return alerts[-limit:]
+            return self.alert_log.recent(limit)
         except Exception as e:
             logger.error(f"Error reading alerts file: {e}")
             return []
 
 
+    def close(self):
+        """
+        Send open digests and queued emails, then close the SMTP session and
+        the alert log
+        """
+        if self.coalescer is not None:
+            self.coalescer.close()
+        if self.email_sender is not None:
+            stats = self.email_sender.close()
+            logger.info(
+                f"Email alerts: {stats['sent']} sent, {stats['failed']} failed "
+                f"over {self.email_sender.transport.connects} SMTP connections"
+            )
+        if self.alert_log is not None:
+            self.alert_log.close()
+
+
 class ConsoleOnlyAlertManager(AlertManager):
     """Simplified alert manager that only prints to console"""
 
@@ -288,5 +482,5 @@ class ConsoleOnlyAlertManager(AlertManager):
             email_enabled=False,
             console_alerts=True,
             file_alerts=True,
-            alerts_file="logs/alerts.json"
+            alerts_file="logs/alerts.jsonl"
         )
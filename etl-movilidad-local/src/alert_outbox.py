@@ -0,0 +1,313 @@
+"""
+Transactional alert outbox dispatcher
+High/critical items get one alert_outbox row per channel, written in the
+same transaction as the news item. The dispatcher leases due rows and
+delivers them concurrently, each channel on its own threads (a slow
+channel never holds up the others), retries failed channels with
+exponential backoff and sets news_item.alerted only once every channel
+has confirmed delivery. Rows folded into an area digest wait as 'held'
+until the digest is delivered, or go back to 'pending' if it fails.
+"""
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from metrics import METRICS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class AlertChannel:
+    """
+    One delivery channel
+
+    deliver(alert) must raise when the alert was not delivered. Channels
+    with coalesce=True are carried by the digest for alerts folded into one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        deliver: Callable[[Dict], None],
+        coalesce: bool = True,
+        concurrency: int = 2
+    ):
+        self.name = name
+        self.deliver = deliver
+        self.coalesce = coalesce
+        self.concurrency = concurrency
+
+
+class AlertDispatcher:
+    """
+    Delivers alert_outbox rows over the alert manager's channels
+
+    dispatch() hands an item's rows to the channel executors and returns at
+    once; a background thread picks up rows whose retry time has come (and
+    rows left by an earlier process) every poll_seconds.
+    """
+
+    def __init__(
+        self,
+        db,
+        alert_manager,
+        max_attempts: int = 6,
+        base_delay_seconds: float = 30,
+        max_delay_seconds: float = 3600,
+        lease_seconds: float = 300,
+        poll_seconds: float = 15
+    ):
+        """
+        Initialize alert dispatcher
+
+        Args:
+            db: NewsDatabase or SupabaseNewsDatabase instance
+            alert_manager: AlertManager providing channels(), the alert
+                payload and the coalescer
+            max_attempts: Delivery attempts per channel before giving up
+            base_delay_seconds: Delay before a channel's first retry
+            max_delay_seconds: Upper bound for a single delay
+            lease_seconds: How long a claimed row is reserved for this process
+            poll_seconds: Interval of the background retry scan
+        """
+        self.db = db
+        self.alert_manager = alert_manager
+        self.channels = {channel.name: channel for channel in alert_manager.channels()}
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay_seconds
+        self.max_delay = max_delay_seconds
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self._executors = {
+            name: ThreadPoolExecutor(channel.concurrency, thread_name_prefix=f'alert-{name}')
+            for name, channel in self.channels.items()
+        }
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        # news_id → time.time() the alert was due from (for time-to-alert)
+        self._started: Dict[int, float] = {}
+        # id(alert) → (alert, outbox rows) waiting for the alert's digest
+        self._held: Dict[int, tuple] = {}
+        self._held_lock = threading.Lock()
+        if alert_manager.coalescer is not None:
+            alert_manager.coalescer.add_listener(self._digest_done)
+        self._thread = None
+        self._closed = False
+        self.stats = {'delivered': 0, 'retried': 0, 'failed': 0, 'coalesced': 0}
+
+    def channel_names(self) -> List[str]:
+        """Channels each alert gets an outbox row for"""
+        return list(self.channels)
+
+    def start(self):
+        """Start the background retry scan (idempotent)"""
+        with self._condition:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name='alert-dispatcher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait(self.poll_seconds)
+                if self._closed:
+                    return
+            try:
+                # Fresh rows are left to the dispatch() of the process that
+                # wrote them (it also records their time-to-alert)
+                self.dispatch(due_before=datetime.now() - timedelta(seconds=self.poll_seconds))
+            except Exception as e:
+                logger.error(f"Error scanning alert outbox: {e}")
+
+    def next_attempt_at(self, attempts: int, now: datetime = None) -> Optional[datetime]:
+        """
+        When to retry a channel that has failed `attempts` times
+
+        Returns:
+            Retry time, or None once max_attempts is reached
+        """
+        if attempts >= self.max_attempts:
+            return None
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+        return (now or datetime.now()) + timedelta(seconds=delay)
+
+    def dispatch(
+        self,
+        news_id: Optional[int] = None,
+        started_at: Optional[float] = None,
+        due_before: Optional[datetime] = None
+    ) -> int:
+        """
+        Claim the due outbox rows (of one item, or all) and start delivering them
+
+        Args:
+            news_id: Only this item's rows (None = every due row)
+            started_at: time.time() the item's alert became due (for time-to-alert)
+            due_before: Only rows due (or with a lease expired) before this
+                time (default: now)
+
+        Returns:
+            Number of rows handed to the channels
+        """
+        now = datetime.now()
+        rows = self.db.claim_alerts(
+            (due_before or now).isoformat(),
+            (now + timedelta(seconds=self.lease_seconds)).isoformat(),
+            news_id
+        )
+        if started_at is not None and news_id is not None:
+            with self._condition:
+                self._started[news_id] = started_at
+
+        by_news: Dict[int, List[Dict]] = {}
+        for row in rows:
+            by_news.setdefault(row['news_id'], []).append(row)
+
+        for item_id, item_rows in by_news.items():
+            news = dict(item_rows[0]['news'], id=item_id)
+            alert = self.alert_manager._prepare_alert_data(news)
+            coalesce_rows = [row for row in item_rows if self._coalesces(row)]
+            # Decided once, on the item's first dispatch: later retries are
+            # single channels catching up
+            if (
+                self.alert_manager.coalescer is not None
+                and coalesce_rows
+                and all(row['attempts'] == 0 for row in item_rows)
+                and len(item_rows) == len(self.channels)
+            ):
+                # Held before the coalescer can close the window and report
+                with self._held_lock:
+                    if self.alert_manager.coalescer.hold(alert):
+                        self._hold(alert, coalesce_rows)
+                        alert = {**alert, 'delivery': 'coalesced'}
+                        item_rows = [row for row in item_rows if not self._coalesces(row)]
+            for row in item_rows:
+                self._submit(row, alert)
+        return len(rows)
+
+    def _coalesces(self, row: Dict) -> bool:
+        channel = self.channels.get(row['channel'])
+        return channel is not None and channel.coalesce
+
+    def _hold(self, alert: Dict, rows: List[Dict]):
+        """Park an alert's digest channels until the digest reports back"""
+        # Reclaimed by the outbox scan if the digest never reports (process exit)
+        deadline = datetime.now() + timedelta(
+            seconds=self.alert_manager.coalescer.window_seconds + self.lease_seconds
+        )
+        for row in rows:
+            # The hold counts as an attempt: a reclaimed row is sent on its own
+            self.db.update_alert_delivery(row['id'], 'held', row['attempts'] + 1, deadline.isoformat())
+        self._held[id(alert)] = (alert, rows)
+        self.stats['coalesced'] += len(rows)
+
+    def _digest_done(self, follow_ups: List[Dict], delivered: bool) -> List[Dict]:
+        """
+        Coalescer listener: settle the held rows of a digest's follow-ups
+
+        Delivered digests deliver their rows; failed ones send the rows
+        back to the outbox as pending, so each alert is retried on its own.
+
+        Returns:
+            The follow-ups this dispatcher owns (taken back after a failure)
+        """
+        with self._held_lock:
+            entries = [self._held.pop(id(alert)) for alert in follow_ups if id(alert) in self._held]
+        now = datetime.now().isoformat()
+        for alert, rows in entries:
+            for row in rows:
+                if delivered:
+                    self.db.update_alert_delivery(row['id'], 'delivered', row['attempts'] + 1)
+                else:
+                    self.db.update_alert_delivery(
+                        row['id'], 'pending', row['attempts'] + 1, now, 'digest not delivered'
+                    )
+                METRICS.inc(
+                    'etl_alert_deliveries_total', channel=row['channel'],
+                    outcome='delivered' if delivered else 'pending'
+                )
+            if delivered:
+                self.stats['delivered'] += len(rows)
+                self._complete(rows[0]['news_id'])
+            else:
+                self.stats['retried'] += len(rows)
+                logger.warning(f"Digest with alert {rows[0]['news_id']} not delivered; back to the outbox")
+        return [alert for alert, _ in entries]
+
+    def _submit(self, row: Dict, alert: Dict):
+        channel = self.channels.get(row['channel'])
+        if channel is None:
+            # Channel disabled since the row was written
+            self.db.update_alert_delivery(
+                row['id'], 'failed', row['attempts'], error='channel not configured'
+            )
+            return
+        with self._condition:
+            self._in_flight += 1
+        self._executors[channel.name].submit(self._deliver, channel, row, alert)
+
+    def _deliver(self, channel: AlertChannel, row: Dict, alert: Dict):
+        try:
+            channel.deliver(alert)
+            self.db.update_alert_delivery(row['id'], 'delivered', row['attempts'] + 1)
+            self.stats['delivered'] += 1
+            METRICS.inc('etl_alert_deliveries_total', channel=channel.name, outcome='delivered')
+            self._complete(row['news_id'])
+        except Exception as e:
+            attempts = row['attempts'] + 1
+            retry_at = self.next_attempt_at(attempts)
+            status = 'pending' if retry_at else 'failed'
+            self.db.update_alert_delivery(
+                row['id'], status, attempts,
+                retry_at.isoformat() if retry_at else None, str(e)
+            )
+            self.stats['retried' if retry_at else 'failed'] += 1
+            METRICS.inc('etl_alert_deliveries_total', channel=channel.name, outcome=status)
+            if retry_at:
+                logger.warning(
+                    f"Alert {row['news_id']} not delivered via {channel.name} "
+                    f"(attempt {attempts}): {e}; retry at {retry_at:%H:%M:%S}"
+                )
+            else:
+                logger.error(f"☠️ Giving up alert {row['news_id']} via {channel.name} after {attempts} attempts: {e}")
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def _complete(self, news_id: int):
+        """Set alerted once the item's last channel is delivered"""
+        if not self.db.mark_alerted_if_delivered(news_id):
+            return
+        with self._condition:
+            started_at = self._started.pop(news_id, None)
+        if started_at is not None:
+            METRICS.observe('etl_time_to_alert_seconds', time.time() - started_at)
+        logger.info(f"✓ Alert {news_id} delivered on every channel")
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the deliveries in flight have finished (retries scheduled
+        for later stay in the outbox)
+
+        Returns:
+            True if nothing is in flight
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def close(self, timeout: float = 30):
+        """Finish the deliveries in flight and stop the dispatcher"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if not self.wait_idle(timeout):
+            logger.warning(f"{self._in_flight} alert deliveries still in flight at shutdown (left in the outbox)")
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
@@ -0,0 +1,64 @@
+"""
+Backend registry
+Maps each configurable component to the module implementing it, so a
+backend's SDK (google-adk/genai, vertexai, apify-client, supabase, numpy)
+is only imported when the configuration selects it
+"""
+import importlib
+import logging
+from typing import Dict, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# kind → name → (module, attribute)
+BACKENDS: Dict[str, Dict[str, Tuple[str, str]]] = {
+    'database': {
+        'sqlite': ('db', 'NewsDatabase'),
+        'supabase': ('db_supabase', 'SupabaseNewsDatabase'),
+    },
+    'scorer': {
+        'adk': ('adk_scorer_v3', 'ADKScorerV3'),
+        'mock': ('adk_scorer', 'MockADKScorer'),
+        'cascade': ('cascade_scorer', 'CascadeScorer'),
+        'local_first': ('local_first_scorer', 'LocalFirstScorer'),
+        'gazetteer': ('gazetteer_scorer', 'GazetteerScorer'),
+    },
+    'llm_runner': {
+        'fake': ('fake_llm', 'FakeRunner'),
+    },
+    'classifier': {
+        'local': ('local_classifier', 'LocalRelevanceClassifier'),
+    },
+    'extractor': {
+        # Apify when APIFY_API_TOKEN is set, direct scraping otherwise
+        'hybrid': ('extractors_apify_simple', 'HybridApifyExtractor'),
+        'direct': ('extractors', 'NewsExtractor'),
+    },
+}
+
+
+def load_backend(kind: str, name: str):
+    """
+    Import and return the class registered for a backend
+
+    Args:
+        kind: Component kind (database, scorer, llm_runner, classifier, extractor)
+        name: Backend name within that kind
+
+    Returns:
+        The backend class
+
+    Raises:
+        ValueError: If the backend is not registered
+        ImportError: If the backend's dependencies are not installed
+    """
+    try:
+        module_name, attribute = BACKENDS[kind][name]
+    except KeyError:
+        known = ', '.join(sorted(BACKENDS.get(kind, {}))) or 'none'
+        raise ValueError(f"Unknown {kind} backend '{name}' (available: {known})")
+
+    module = importlib.import_module(module_name)
+    logger.debug(f"Loaded {kind} backend '{name}' from {module_name}")
+    return getattr(module, attribute)
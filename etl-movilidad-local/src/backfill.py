@@ -0,0 +1,299 @@
+"""
+Historical backfill job
+Walks the paginated archive of each source page by page (a generator, so
+only the current chunk is in memory), runs the items through dedup,
+scoring and storage in bounded chunks, and checkpoints the last finished
+page per source. Runs as its own process at its own rate; historical items
+are stored but never alerted.
+
+Usage:
+    python backfill.py --source AMVA --chunk-size 50 --rpm 20
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, Tuple
+
+from dotenv import load_dotenv
+
+from backends import load_backend
+from factories import build_database, build_incident_index, build_scorer, with_gazetteer, with_local_classifier
+from rate_limiter import ScoringError, TokenBucket
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+JOB_PREFIX = "backfill:"
+# Errors kept for the summary (the rest are only logged)
+MAX_REPORTED_ERRORS = 20
+
+
+class BackfillJob:
+    """
+    Resumable, rate-limited backfill of source archives
+
+    The checkpoint of a source stores the last page whose items were all
+    processed. Archives list newest first, so news published meanwhile push
+    older items to later pages: resuming may see some items again (skipped
+    as duplicates) but never misses one.
+    """
+
+    def __init__(
+        self,
+        db,
+        scorer,
+        extractor,
+        chunk_size: int = 50,
+        requests_per_minute: float = 20,
+        page_delay: float = 2.0,
+        incidents=None
+    ):
+        """
+        Initialize backfill job
+
+        Args:
+            db: NewsDatabase or SupabaseNewsDatabase instance
+            scorer: Scorer exposing score() and reset_run_stats()
+            extractor: Extractor exposing archive_tasks() and iter_archive()
+            chunk_size: Items processed (and checkpointed) together
+            requests_per_minute: Job-level scoring rate (None/0 = unlimited)
+            page_delay: Seconds between archive page fetches
+            incidents: IncidentIndex the stored items are matched against
+                (by publication time), or None
+        """
+        self.db = db
+        self.scorer = scorer
+        self.extractor = extractor
+        self.chunk_size = chunk_size
+        self.pacer = TokenBucket(requests_per_minute, capacity=1)
+        self.page_delay = page_delay
+        self.incidents = incidents
+        self.version = getattr(scorer, 'scorer_version', None) or 'unknown'
+
+    def sources(self) -> List[str]:
+        """Names of the sources with an archive"""
+        return [name for name, _ in self.extractor.archive_tasks()]
+
+    def _start_page(self, source: str, reset: bool) -> Dict:
+        checkpoint = None if reset else self.db.get_job_checkpoint(JOB_PREFIX + source)
+        if checkpoint:
+            logger.info(
+                f"Resuming {source} backfill after page {checkpoint['last_id']} "
+                f"({checkpoint['processed']} items already processed)"
+            )
+            return {'page': checkpoint['last_id'] + 1, 'processed': checkpoint['processed']}
+        return {'page': 1, 'processed': 0}
+
+    def _chunks(self, pages: Iterator[Tuple[int, List[Dict]]]) -> Iterator[Tuple[int, List[Dict]]]:
+        """
+        Group whole archive pages into chunks of about chunk_size items
+
+        Yields:
+            (last page of the chunk, items of the chunk)
+        """
+        chunk = []
+        for page, items in pages:
+            chunk.extend(items)
+            if len(chunk) >= self.chunk_size:
+                yield page, chunk
+                chunk = []
+            if self.page_delay:
+                time.sleep(self.page_delay)
+        if chunk:
+            yield page, chunk
+
+    def _process_chunk(self, chunk: List[Dict], stats: Dict):
+        """Dedup, score and store one chunk; every item ends done, discarded or failed"""
+        seen = set()
+        fresh = []
+        for news in chunk:
+            if news['url'] in seen or self.db.is_duplicate(news['url']):
+                stats['duplicates'] += 1
+                continue
+            seen.add(news['url'])
+            fresh.append(news)
+
+        # Items a live run already staged (and scored or discarded) are skipped
+        to_score = self.db.stage_items(fresh)
+        stats['duplicates'] += len(fresh) - len(to_score)
+
+        # Run stats are per chunk, so the scorer keeps no per-item history
+        self.scorer.reset_run_stats()
+        for news in to_score:
+            time.sleep(self.pacer.reserve(1))
+            try:
+                result = self.scorer.score(news)
+            except Exception as e:
+                # Not dead-lettered: a live retry would alert historical news
+                error = f"[{e.error_class}] {e}" if isinstance(e, ScoringError) else str(e)
+                self.db.update_stage(news['url'], 'failed')
+                stats['failed'] += 1
+                logger.warning(f"Could not score {news['url']}: {error}")
+                if len(stats['errors']) < MAX_REPORTED_ERRORS:
+                    stats['errors'].append(error)
+                continue
+
+            stats['scored'] += 1
+            if not result:
+                self.db.update_stage(news['url'], 'discarded')
+                stats['discarded'] += 1
+                continue
+
+            if self.incidents is not None and not self.db.is_duplicate(result['url']):
+                try:
+                    self.incidents.assign(result)
+                except Exception as e:
+                    logger.error(f"Error matching {result['url']} to an incident: {e}")
+            news_id = self.db.insert_news(result)
+            self.db.update_stage(news['url'], 'done', payload=result, news_id=news_id)
+            if news_id:
+                stats['saved'] += 1
+            else:
+                stats['duplicates'] += 1
+
+    def run_source(
+        self,
+        source: str,
+        max_pages: int = None,
+        max_items: int = None,
+        reset: bool = False
+    ) -> Dict:
+        """
+        Backfill one source archive from its checkpoint
+
+        Args:
+            source: Source name (see sources())
+            max_pages: Stop after this many pages (None = until the end)
+            max_items: Stop after the chunk reaching this many items (None = no limit)
+            reset: Ignore the saved checkpoint and start at page 1
+
+        Returns:
+            Dict with the source's statistics
+        """
+        position = self._start_page(source, reset)
+        processed = position['processed']
+        stats = {
+            'source': source, 'pages': 0, 'items': 0, 'duplicates': 0, 'scored': 0,
+            'saved': 0, 'discarded': 0, 'failed': 0, 'chunks': 0,
+            'last_page': position['page'] - 1, 'complete': False, 'errors': []
+        }
+        start_time = time.time()
+
+        logger.info(f"📚 Backfilling {source} from page {position['page']}")
+
+        pages = self.extractor.iter_archive(source, start_page=position['page'], max_pages=max_pages)
+        try:
+            for last_page, chunk in self._chunks(pages):
+                self._process_chunk(chunk, stats)
+                stats['chunks'] += 1
+                stats['items'] += len(chunk)
+                stats['pages'] += last_page - stats['last_page']
+                stats['last_page'] = last_page
+                processed += len(chunk)
+                self.db.save_job_checkpoint(JOB_PREFIX + source, last_page, self.version, processed)
+
+                logger.info(
+                    f"✓ {source} up to page {last_page}: {stats['items']} items, "
+                    f"{stats['saved']} saved, {stats['discarded']} discarded, "
+                    f"{stats['duplicates']} duplicates"
+                )
+                if max_items is not None and stats['items'] >= max_items:
+                    break
+            else:
+                stats['complete'] = max_pages is None
+        except Exception as e:
+            # The checkpoint is at the last finished chunk; the next run resumes there
+            logger.error(f"Error walking {source} archive after page {stats['last_page']}: {e}")
+            stats['errors'].append(f"{source}: {e}")
+        finally:
+            pages.close()
+
+        stats['duration'] = time.time() - start_time
+        return stats
+
+    def run(self, sources: List[str] = None, **kwargs) -> List[Dict]:
+        """
+        Backfill several source archives one after the other
+
+        Args:
+            sources: Source names (None = every source with an archive)
+            **kwargs: Passed to run_source()
+
+        Returns:
+            List with each source's statistics
+        """
+        return [self.run_source(source, **kwargs) for source in (sources or self.sources())]
+
+
+def main():
+    """Main entry point"""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Backfill the database from source archives")
+    parser.add_argument('--source', action='append', help='Source to backfill (repeatable; default: all)')
+    parser.add_argument('--chunk-size', type=int, default=int(os.getenv("BACKFILL_CHUNK_SIZE", "50")))
+    parser.add_argument(
+        '--rpm', type=float, default=float(os.getenv("BACKFILL_RPM", "20")),
+        help='Scoring requests per minute for this job (0 = unlimited)'
+    )
+    parser.add_argument(
+        '--page-delay', type=float, default=float(os.getenv("BACKFILL_PAGE_DELAY", "2")),
+        help='Seconds between archive page fetches'
+    )
+    parser.add_argument('--max-pages', type=int, default=None, help='Pages per source')
+    parser.add_argument('--max-items', type=int, default=None, help='Items per source')
+    parser.add_argument('--reset', action='store_true', help='Ignore the saved checkpoints')
+    args = parser.parse_args()
+
+    project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
+    use_mock = os.getenv("USE_MOCK_ADK", "false").lower() == "true"
+    use_fake_llm = os.getenv("USE_FAKE_LLM", "false").lower() == "true"
+    if not use_mock and not use_fake_llm and not project_id:
+        logger.error("GOOGLE_CLOUD_PROJECT environment variable required")
+        sys.exit(1)
+
+    db = build_database(os.getenv("USE_SUPABASE", "false").lower() == "true")
+    label_sink = (
+        db.save_scoring_label
+        if os.getenv("RECORD_SCORING_LABELS", "true").lower() == "true" else None
+    )
+    job = BackfillJob(
+        db=db,
+        scorer=with_gazetteer(with_local_classifier(build_scorer(project_id, use_mock, label_sink))),
+        extractor=load_backend('extractor', 'hybrid')(),
+        chunk_size=args.chunk_size,
+        requests_per_minute=args.rpm or None,
+        page_delay=args.page_delay,
+        incidents=build_incident_index(db)
+    )
+
+    unknown = set(args.source or []) - set(job.sources())
+    if unknown:
+        logger.error(f"Unknown sources: {', '.join(sorted(unknown))} (available: {', '.join(job.sources())})")
+        sys.exit(1)
+
+    try:
+        results = job.run(args.source, max_pages=args.max_pages, max_items=args.max_items, reset=args.reset)
+    except KeyboardInterrupt:
+        logger.info("Backfill interrupted; progress is checkpointed")
+        sys.exit(0)
+
+    print("\n" + "="*60)
+    print("BACKFILL SUMMARY")
+    print("="*60)
+    for stats in results:
+        state = "complete" if stats['complete'] else f"up to page {stats['last_page']}"
+        print(f"{stats['source']} ({state}, {stats['duration']:.2f}s)")
+        print(f"  Pages:        {stats['pages']} ({stats['items']} items)")
+        print(f"  Saved:        {stats['saved']} ({stats['discarded']} discarded, "
+              f"{stats['duplicates']} duplicates)")
+        print(f"  Failed:       {stats['failed']}")
+        for error in stats['errors'][:5]:
+            print(f"  - {error}")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Offline benchmark of the whole ADKScorerV3 scoring path
+Uses fake_llm.FakeRunner, so it needs no network or credentials and is
+reproducible for a given seed
+
+Usage:
+    python benchmark_scoring.py --items 200 --throttle-rate 0.05 --mode both
+"""
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from adk_scorer_v3 import ADKScorerV3
+from fake_llm import FakeRunner
+from latency_tracker import percentile
+from rate_limiter import RetryPolicy, ScoringError
+
+_MOBILITY_TITLES = [
+    "Cierre de la Autopista Sur por obras nocturnas",
+    "Suspensión del servicio en la Línea A del Metro",
+    "Accidente en la Avenida Las Vegas genera trancón",
+    "Bloqueo en la Regional por manifestación de transportadores",
+    "Nuevo horario del tranvía de Ayacucho",
+    "Pico y placa cambia desde el lunes en Medellín",
+]
+_OTHER_TITLES = [
+    "Festival gastronómico llega al Parque Explora",
+    "Alcaldía presenta informe de gestión cultural",
+    "Selección Antioquia gana el torneo juvenil",
+    "Nueva biblioteca abre sus puertas en Belén",
+]
+_FILLER = (
+    "La información fue entregada por las autoridades locales. "
+    "Se recomienda a la ciudadanía estar atenta a los canales oficiales. "
+)
+
+
+def generate_items(count: int, seed: int, relevant_ratio: float = 0.3) -> List[Dict]:
+    """Generate reproducible synthetic news items"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        relevant = rng.random() < relevant_ratio
+        title = rng.choice(_MOBILITY_TITLES if relevant else _OTHER_TITLES)
+        items.append({
+            'source': 'Benchmark',
+            'url': f"https://benchmark.local/news/{seed}/{i}",
+            'title': f"{title} ({i})",
+            'body': f"{title}. " + _FILLER * rng.randint(1, 6),
+            'published_at': '2025-01-01T00:00:00'
+        })
+    return items
+
+
+def build_scorer(args) -> ADKScorerV3:
+    runner = FakeRunner(
+        seed=args.seed,
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        tail_rate=args.tail_rate,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        malformed_rate=args.malformed_rate,
+        time_scale=args.time_scale
+    )
+    return ADKScorerV3(
+        project_id="offline",
+        model_name="fake-llm",
+        requests_per_minute=args.rpm or None,
+        tokens_per_minute=args.tpm or None,
+        max_concurrency=args.concurrency,
+        retry_policy=RetryPolicy(max_attempts=args.max_attempts, base_delay=args.backoff),
+        runner=runner,
+        streaming=args.streaming,
+        call_timeout=args.timeout or None,
+        hedge=args.hedge,
+        hedge_max_ratio=args.hedge_max_ratio,
+        # Scaled like the fake latencies, so hedging still fires when they shrink
+        hedge_min_delay=args.hedge_min_delay * args.time_scale
+    )
+
+
+def run_sequential(scorer: ADKScorerV3, items: List[Dict]) -> Dict:
+    latencies = []
+    failed = 0
+    start = time.monotonic()
+    for item in items:
+        t0 = time.monotonic()
+        try:
+            scorer.score(item)
+        except ScoringError:
+            failed += 1
+        latencies.append(time.monotonic() - t0)
+    return {'wall': time.monotonic() - start, 'latencies': latencies}
+
+
+def run_batch(scorer: ADKScorerV3, items: List[Dict]) -> Dict:
+    start = time.monotonic()
+    scorer.score_batch(items)
+    return {'wall': time.monotonic() - start, 'latencies': []}
+
+
+def report(mode: str, scorer: ADKScorerV3, items: List[Dict], result: Dict):
+    stats = scorer.get_run_stats()
+    backend = scorer.runner.stats
+    latencies = result['latencies']
+    metered = stats['metered_calls'] or 1
+
+    print(f"\n--- {mode} ---")
+    print(f"Items:          {len(items)} in {result['wall']:.2f}s "
+          f"({len(items) / result['wall'] if result['wall'] else 0:.1f} items/s)")
+    if latencies:
+        print(f"Latency:        p50 {percentile(latencies, 50):.3f}s | "
+              f"p95 {percentile(latencies, 95):.3f}s | p99 {percentile(latencies, 99):.3f}s")
+    print(f"Outcomes:       {stats['kept']} kept, {stats['discarded']} discarded, "
+          f"{stats['failed']} failed")
+    print(f"Retries:        {stats['retried']} ({stats['throttled']} throttled, "
+          f"{stats['timeouts']} timed out)")
+    if scorer.hedge:
+        print(f"Hedged:         {stats['hedged']} requests ({stats['hedge_wins']} answered first)")
+    print(f"Model latency:  p50 {stats['latency']['p50']:.3f}s | p95 {stats['latency']['p95']:.3f}s | "
+          f"p99 {stats['latency']['p99']:.3f}s (last {stats['latency']['count']} calls)")
+    print(f"Backend calls:  {backend['calls']} (errors {backend['errors']}, "
+          f"429 {backend['throttled']}, malformed {backend['malformed']})")
+    print(f"Tokens/item:    {(stats['input_tokens'] + stats['output_tokens']) / metered:.0f}")
+    print(f"Concurrency:    final limit {scorer.concurrency.current_limit}")
+    if stats['early_exits']:
+        print(f"Early discards: {stats['early_exits']} "
+              f"(~{stats['saved_output_tokens']} output tokens saved, "
+              f"{stats['early_exit_seconds'] / stats['early_exits']:.3f}s per discard)")
+    if stats['full_discards']:
+        print(f"Full discards:  {stats['full_discards']} "
+              f"({stats['full_discard_seconds'] / stats['full_discards']:.3f}s per discard)")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Offline scoring benchmark")
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--mode', choices=['sequential', 'batch', 'both'], default='both')
+    parser.add_argument('--latency', choices=['fixed', 'uniform', 'lognormal'], default='lognormal')
+    parser.add_argument('--latency-ms', type=float, default=800)
+    parser.add_argument('--tail-rate', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--malformed-rate', type=float, default=0.0)
+    parser.add_argument('--time-scale', type=float, default=1.0,
+                        help='Multiplier for fake latencies (0.1 = 10x faster)')
+    parser.add_argument('--rpm', type=float, default=0, help='Requests/min limit (0 = none)')
+    parser.add_argument('--tpm', type=float, default=0, help='Tokens/min limit (0 = none)')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--max-attempts', type=int, default=4)
+    parser.add_argument('--backoff', type=float, default=0.2, help='Base backoff (seconds)')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Stream responses and cancel discards early')
+    parser.add_argument('--timeout', type=float, default=60, help='Per-call deadline (0 = none)')
+    parser.add_argument('--hedge', action='store_true',
+                        help='Duplicate calls slower than the observed p95')
+    parser.add_argument('--hedge-max-ratio', type=float, default=0.1,
+                        help='Max hedged requests as a fraction of calls')
+    parser.add_argument('--hedge-min-delay', type=float, default=0.5,
+                        help='Minimum hedge delay in seconds (multiplied by --time-scale)')
+    args = parser.parse_args()
+
+    items = generate_items(args.items, args.seed)
+    modes = ['sequential', 'batch'] if args.mode == 'both' else [args.mode]
+
+    print("="*60)
+    print(f"SCORING BENCHMARK (seed {args.seed}, {args.latency} {args.latency_ms:.0f}ms)")
+    print("="*60)
+    for mode in modes:
+        scorer = build_scorer(args)
+        run_mode = run_sequential if mode == 'sequential' else run_batch
+        report(mode, scorer, items, run_mode(scorer, items))
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
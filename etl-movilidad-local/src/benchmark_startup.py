@@ -0,0 +1,143 @@
+"""
+Cold-start benchmark for the pipeline
+Starts a fresh interpreter per configuration (python -X importtime), times
+importing main and building the ETLPipeline, and lists which backend SDKs
+got imported. Exits with status 1 if the mock/SQLite startup exceeds the
+budget.
+
+Usage:
+    python benchmark_startup.py --repeat 5 --budget-ms 500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Heavy SDKs that should only load when their backend is configured
+SDK_MODULES = ['google.adk', 'google.genai', 'vertexai', 'apify_client', 'supabase', 'numpy']
+
+CONFIGS = {
+    'mock-sqlite': {
+        'USE_MOCK_ADK': 'true',
+        'USE_FAKE_LLM': 'false',
+        'USE_SUPABASE': 'false',
+        'USE_LOCAL_CLASSIFIER': 'false',
+        'APIFY_API_TOKEN': '',
+    },
+    'production': {
+        'USE_MOCK_ADK': 'false',
+        'USE_FAKE_LLM': 'false',
+        'GOOGLE_CLOUD_PROJECT': os.getenv('GOOGLE_CLOUD_PROJECT') or 'startup-benchmark',
+        'APIFY_API_TOKEN': os.getenv('APIFY_API_TOKEN') or 'startup-benchmark',
+    },
+}
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+error = None
+try:
+    main.pipeline_from_env().close()
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+built = time.perf_counter()
+print(json.dumps({
+    'import': imported - start,
+    'build': built - imported,
+    'error': error,
+    'sdks': [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def parse_importtime(stderr: str, top: int = 5) -> List[Dict]:
+    """
+    Slowest top-level imports from python -X importtime output
+
+    Returns:
+        Up to `top` dicts with module and cumulative seconds
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        # Top-level imports are not indented
+        if not name.startswith(' '):
+            imports.append({'module': name.strip(), 'seconds': int(cumulative) / 1e6})
+    return sorted(imports, key=lambda i: i['seconds'], reverse=True)[:top]
+
+
+def measure(config: Dict[str, str], workdir: str) -> Dict:
+    """Start one interpreter with the given environment and collect its timings"""
+    env = {**os.environ, **config, 'PYTHONPATH': SRC_DIR, 'METRICS_PORT': '0'}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD % SDK_MODULES],
+        cwd=workdir, env=env, capture_output=True, text=True, timeout=300
+    )
+    lines = [line for line in result.stdout.splitlines() if line.startswith('{')]
+    if not lines:
+        raise RuntimeError(f"Startup probe failed:\n{result.stderr[-2000:]}")
+    report = json.loads(lines[-1])
+    report['slowest'] = parse_importtime(result.stderr)
+    return report
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Measure pipeline cold-start time")
+    parser.add_argument('--config', choices=sorted(CONFIGS), nargs='+', default=sorted(CONFIGS))
+    parser.add_argument('--repeat', type=int, default=3, help='Interpreters per configuration (median)')
+    parser.add_argument('--budget-ms', type=float,
+                        default=float(os.getenv('STARTUP_BUDGET_MS', '500')),
+                        help='Maximum import+build time for mock-sqlite (0 = no check)')
+    args = parser.parse_args()
+
+    results = {}
+    # Scratch directory: the pipeline creates logs/ and data/ in its cwd
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in args.config:
+            runs = [measure(CONFIGS[name], workdir) for _ in range(max(1, args.repeat))]
+            results[name] = {
+                'import': statistics.median(r['import'] for r in runs),
+                'build': statistics.median(r['build'] for r in runs),
+                'error': runs[-1]['error'],
+                'sdks': runs[-1]['sdks'],
+                'slowest': runs[-1]['slowest'],
+            }
+
+    print("\n" + "="*78)
+    print(f"STARTUP BENCHMARK (median of {args.repeat} fresh interpreters)")
+    print("="*78)
+    print(f"{'Config':<14} {'Import':>8} {'Build':>8} {'Total':>8}  SDKs imported")
+    for name, r in results.items():
+        total = r['import'] + r['build']
+        print(f"{name:<14} {r['import']:>7.2f}s {r['build']:>7.2f}s {total:>7.2f}s  "
+              f"{', '.join(r['sdks']) or '-'}")
+    for name, r in results.items():
+        print(f"\n{name} - slowest imports:")
+        for entry in r['slowest']:
+            print(f"  {entry['seconds']:>6.3f}s  {entry['module']}")
+        if r['error']:
+            print(f"  (pipeline build failed: {r['error']})")
+    print("="*78 + "\n")
+
+    mock = results.get('mock-sqlite')
+    if mock and args.budget_ms:
+        total_ms = (mock['import'] + mock['build']) * 1000
+        if total_ms > args.budget_ms:
+            print(f"✗ mock-sqlite startup {total_ms:.0f}ms exceeds the {args.budget_ms:.0f}ms budget")
+            sys.exit(1)
+        print(f"✓ mock-sqlite startup {total_ms:.0f}ms within the {args.budget_ms:.0f}ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Throughput benchmark of the multi-process worker mode
+Runs ETLPipeline.run_workers() over the same synthetic items with 1, 2, 4
+and 8 worker processes against the fake LLM backend (no network or
+credentials), each in a fresh scratch directory, and reports items/sec
+
+Usage:
+    python benchmark_workers.py --items 400 --workers 1 2 4 8 --latency-ms 200
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmark_scoring import generate_items
+from main import pipeline_from_env
+
+
+def benchmark(workers: int, items: List[Dict], workdir: str) -> Dict:
+    """Run one worker-mode execution in workdir and time it"""
+    os.chdir(workdir)
+    pipeline = pipeline_from_env()
+    # The coordinator "extracts" the synthetic items as a single source
+    pipeline.extractor.source_tasks = lambda: [('Benchmark', lambda: list(items))]
+    try:
+        started = time.perf_counter()
+        stats = pipeline.run_workers(workers)
+        elapsed = time.perf_counter() - started
+    finally:
+        pipeline.close()
+
+    processed = stats['scored'] + stats['failed']
+    busy = [w['busy_seconds'] for w in stats['workers']]
+    return {
+        'workers': workers,
+        'processed': processed,
+        'seconds': elapsed,
+        'drain_seconds': stats['timings']['stages'].get('workers', elapsed),
+        'per_worker': [w['items'] for w in stats['workers']],
+        'utilization': sum(busy) / (len(busy) * elapsed) if busy else 0,
+        'errors': len(stats['errors'])
+    }
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Worker-mode throughput benchmark")
+    parser.add_argument('--items', type=int, default=400)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--batch-size', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=200, help='Fake model latency')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    # Fake model, no limits: throughput is bounded by the workers alone
+    os.environ.update({
+        'USE_FAKE_LLM': 'true',
+        'USE_MOCK_ADK': 'false',
+        'USE_SUPABASE': 'false',
+        'USE_LOCAL_CLASSIFIER': 'false',
+        'ENABLE_EMAIL_ALERTS': 'false',
+        'FAKE_LLM_SEED': str(args.seed),
+        'FAKE_LLM_LATENCY': 'fixed',
+        'FAKE_LLM_LATENCY_MS': str(args.latency_ms),
+        'VERTEX_RPM_LIMIT': '1000000',
+        'VERTEX_TPM_LIMIT': '1000000000',
+        'WORKER_BATCH_SIZE': str(args.batch_size),
+        'METRICS_TEXTFILE': '',
+    })
+    logging.getLogger().setLevel(logging.WARNING)
+
+    items = generate_items(args.items, args.seed)
+    cwd = os.getcwd()
+    results = []
+    try:
+        for workers in args.workers:
+            with tempfile.TemporaryDirectory() as workdir:
+                results.append(benchmark(workers, items, workdir))
+                os.chdir(cwd)
+    finally:
+        os.chdir(cwd)
+
+    baseline = results[0]['processed'] / results[0]['seconds']
+    print("\n" + "="*72)
+    print(f"WORKER BENCHMARK ({args.items} items, fake LLM {args.latency_ms:.0f}ms, "
+          f"batches of {args.batch_size}, {os.cpu_count()} CPUs)")
+    print("="*72)
+    print(f"{'Workers':>7} {'Items':>6} {'Total':>8} {'Drain':>8} {'Items/s':>8} "
+          f"{'Speedup':>8} {'Busy':>6}  Items per worker")
+    for r in results:
+        rate = r['processed'] / r['seconds']
+        print(f"{r['workers']:>7} {r['processed']:>6} {r['seconds']:>7.2f}s "
+              f"{r['drain_seconds']:>7.2f}s {rate:>8.1f} {rate / baseline:>7.2f}x "
+              f"{r['utilization']:>5.0%}  {r['per_worker']}"
+              + (f"  ({r['errors']} errors)" if r['errors'] else ""))
+    print("="*72 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Cascade Scorer - cheap model first, strong model only for uncertain items
+Both tiers are ADKScorerV3 instances sharing the ScoringResponse schema
+"""
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from adk_scorer_v3 import ADKScorerV3
+from latency_tracker import percentile
+from prompts.system_prompt import prompt_hash
+from rate_limiter import ScoringError
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class CascadeScorer:
+    """
+    Two-tier scorer
+
+    Every item is scored by the fast tier. It is escalated to the strong
+    tier when its relevance_score falls inside the uncertainty band or when
+    the fast tier flags it as high/critical (alerts must be confirmed).
+    The strong verdict is final; if the strong tier fails the fast verdict
+    is used. With a streaming fast tier, early-exit discards carry no
+    relevance_score and are final.
+
+    Exposes the same interface as ADKScorerV3 (score, score_batch,
+    get_run_stats, reset_run_stats, get_stats).
+    """
+
+    def __init__(
+        self,
+        fast_scorer: ADKScorerV3,
+        strong_scorer: ADKScorerV3,
+        uncertainty_band: Tuple[float, float] = (0.35, 0.65),
+        escalate_severities: Tuple[str, ...] = ('high', 'critical')
+    ):
+        """
+        Initialize Cascade Scorer
+
+        Args:
+            fast_scorer: Cheap, fast model tier
+            strong_scorer: Stronger model used for confirmation
+            uncertainty_band: (low, high) relevance_score range that escalates
+            escalate_severities: Fast-tier severities that always escalate
+        """
+        self.fast = fast_scorer
+        self.strong = strong_scorer
+        self.uncertainty_band = uncertainty_band
+        self.escalate_severities = set(escalate_severities)
+        self.scorer_version = (
+            f"cascade:{fast_scorer.model_name}+{strong_scorer.model_name}"
+            f"@{prompt_hash(strong_scorer.body_token_budget)}"
+        )
+        self.reset_run_stats()
+
+        logger.info(
+            f"✅ Cascade scorer: {fast_scorer.model_name} → {strong_scorer.model_name} "
+            f"(band {uncertainty_band[0]:.2f}-{uncertainty_band[1]:.2f}, "
+            f"always confirm {', '.join(sorted(self.escalate_severities))})"
+        )
+
+    def needs_escalation(self, result: Dict) -> bool:
+        """Whether a fast-tier verdict must be confirmed by the strong tier"""
+        low, high = self.uncertainty_band
+        score = result.get('relevance_score') or 0.0
+        if low <= score <= high:
+            return True
+        return bool(result.get('keep')) and result.get('severity') in self.escalate_severities
+
+    def _timed_evaluate(self, scorer: ADKScorerV3, tier: str, news_item: Dict) -> Dict:
+        start = time.monotonic()
+        try:
+            return scorer.evaluate(news_item)
+        finally:
+            self.latencies[tier].append(time.monotonic() - start)
+
+    def score(self, news_item: Dict) -> Optional[Dict]:
+        """
+        Score a news item through the cascade
+
+        Args:
+            news_item: Dict with keys: source, title, body, published_at, url
+
+        Returns:
+            Enriched news item, or None if not relevant
+
+        Raises:
+            ScoringError: If the fast tier could not score the item
+        """
+        enriched = self.strong.merge_result(news_item, self.evaluate(news_item))
+        if enriched:
+            enriched['scorer_version'] = self.scorer_version
+        return enriched
+
+    def evaluate(self, news_item: Dict) -> Dict:
+        """
+        Get the final cascade verdict for a news item, kept or not
+
+        Raises:
+            ScoringError: If the fast tier could not score the item
+        """
+        try:
+            fast_result = self._timed_evaluate(self.fast, 'fast', news_item)
+        except ScoringError:
+            self.cascade_stats['failed'] += 1
+            raise
+
+        final = fast_result
+        if self.needs_escalation(fast_result):
+            self.cascade_stats['escalated'] += 1
+            try:
+                strong_result = self._timed_evaluate(self.strong, 'strong', news_item)
+                self._record_agreement(fast_result, strong_result)
+                final = strong_result
+            except ScoringError as e:
+                self.cascade_stats['strong_failures'] += 1
+                logger.warning(
+                    f"Strong tier failed, keeping fast verdict for "
+                    f"'{news_item.get('title', 'Unknown')[:50]}': {e}"
+                )
+
+        self.cascade_stats['kept' if final.get('keep') else 'discarded'] += 1
+        return final
+
+    def _record_agreement(self, fast_result: Dict, strong_result: Dict):
+        keep_match = bool(fast_result.get('keep')) == bool(strong_result.get('keep'))
+        self.cascade_stats['keep_agreements'] += keep_match
+        if keep_match and strong_result.get('keep'):
+            self.cascade_stats['severity_comparisons'] += 1
+            self.cascade_stats['severity_agreements'] += (
+                fast_result.get('severity') == strong_result.get('severity')
+            )
+
+    def score_batch(self, news_items: List[Dict]) -> List[Dict]:
+        """
+        Score multiple news items through the cascade
+
+        Args:
+            news_items: List of news items to score
+
+        Returns:
+            List of enriched news items (only items with keep=true)
+        """
+        enriched_items = []
+        for item in news_items:
+            try:
+                result = self.score(item)
+            except ScoringError as e:
+                logger.error(f"Error scoring '{item.get('title', 'Unknown')[:50]}': {e}")
+                continue
+            if result:
+                enriched_items.append(result)
+        return enriched_items
+
+    def reset_run_stats(self):
+        """Reset run counters on both tiers"""
+        self.fast.reset_run_stats()
+        self.strong.reset_run_stats()
+        self.latencies = {'fast': [], 'strong': []}
+        self.cascade_stats = {
+            'kept': 0, 'discarded': 0, 'failed': 0, 'escalated': 0,
+            'strong_failures': 0, 'keep_agreements': 0,
+            'severity_comparisons': 0, 'severity_agreements': 0
+        }
+
+    def get_run_stats(self) -> Dict:
+        """
+        Get cascade counters since the last reset
+
+        Returns:
+            Dict with the ADKScorerV3 run counters (kept/discarded/failed at
+            cascade level, throttling and tokens summed over both tiers) plus
+            escalation rate, per-tier latency and tier agreement
+        """
+        fast_stats = self.fast.get_run_stats()
+        strong_stats = self.strong.get_run_stats()
+        cs = self.cascade_stats
+        scored = len(self.latencies['fast'])
+        confirmed = cs['escalated'] - cs['strong_failures']
+
+        stats = {
+            'kept': cs['kept'],
+            'discarded': cs['discarded'],
+            'failed': cs['failed'],
+        }
+        for key in ('throttled', 'retried', 'input_tokens', 'output_tokens', 'metered_calls',
+                    'early_exits', 'saved_output_tokens', 'early_exit_seconds',
+                    'full_discards', 'full_discard_seconds',
+                    'timeouts', 'hedged', 'hedge_wins'):
+            stats[key] = fast_stats.get(key, 0) + strong_stats.get(key, 0)
+
+        stats['cascade'] = {
+            'escalated': cs['escalated'],
+            'escalation_rate': cs['escalated'] / scored if scored else 0.0,
+            'strong_failures': cs['strong_failures'],
+            'keep_agreement': cs['keep_agreements'] / confirmed if confirmed > 0 else None,
+            'severity_agreement': (
+                cs['severity_agreements'] / cs['severity_comparisons']
+                if cs['severity_comparisons'] else None
+            ),
+            'latency': {
+                tier: {
+                    'count': len(values),
+                    'avg': sum(values) / len(values) if values else 0.0,
+                    'p50': percentile(values, 50),
+                    'p95': percentile(values, 95),
+                    'p99': percentile(values, 99)
+                }
+                for tier, values in self.latencies.items()
+            },
+            'model_latency': {
+                'fast': fast_stats.get('latency'),
+                'strong': strong_stats.get('latency')
+            },
+            'tokens': {
+                'fast': fast_stats.get('input_tokens', 0) + fast_stats.get('output_tokens', 0),
+                'strong': strong_stats.get('input_tokens', 0) + strong_stats.get('output_tokens', 0)
+            }
+        }
+        return stats
+
+    def close(self):
+        """Stop both tiers' event-loop threads"""
+        self.fast.close()
+        self.strong.close()
+
+    def get_stats(self) -> Dict:
+        """Get scorer configuration for both tiers"""
+        return {
+            'mode': 'cascade',
+            'scorer_version': self.scorer_version,
+            'fast': self.fast.get_stats(),
+            'strong': self.strong.get_stats(),
+            'uncertainty_band': list(self.uncertainty_band),
+            'escalate_severities': sorted(self.escalate_severities),
+            'run_stats': self.get_run_stats()
+        }
@@ -0,0 +1,270 @@
+"""
+Long-running ETL daemon
+Builds the ETLPipeline once (GenAI client, ADK runner, database and
+extractor clients stay warm), runs it on a schedule, never overlaps runs,
+shuts down gracefully on SIGTERM/SIGINT and serves a health endpoint
+
+Usage:
+    python daemon.py --interval 15 --port 8080
+"""
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+import schedule
+from dotenv import load_dotenv
+
+from main import pipeline_from_env
+from metrics import METRICS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class PipelineDaemon:
+    """
+    Scheduler loop around a single, long-lived ETLPipeline
+
+    Runs execute in a worker thread so the scheduler keeps answering
+    signals and health checks. A run that is due while the previous one is
+    still going is skipped, not queued.
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        interval_minutes: float = 15,
+        mode: str = 'batch',
+        health_port: Optional[int] = 8080,
+        shutdown_timeout: float = 300
+    ):
+        """
+        Initialize daemon
+
+        Args:
+            pipeline: ETLPipeline built once and reused for every run
+            interval_minutes: Minutes between scheduled runs
+            mode: batch (run()), streaming (run_streaming()) or workers (run_workers())
+            health_port: Port for the health/status endpoint (None = disabled)
+            shutdown_timeout: Seconds to wait for a running run on shutdown
+        """
+        self.pipeline = pipeline
+        self.interval_minutes = interval_minutes
+        self.mode = mode
+        self.health_port = health_port
+        self.shutdown_timeout = shutdown_timeout
+
+        self.scheduler = schedule.Scheduler()
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+
+        self.started_at = datetime.now()
+        self.status = {
+            'state': 'starting',
+            'runs': 0,
+            'failures': 0,
+            'skipped_overlaps': 0,
+            'last_run_started': None,
+            'last_run_finished': None,
+            'last_success': None,
+            'last_error': None,
+            'last_duration': None,
+            'last_stats': None
+        }
+
+    def trigger(self) -> bool:
+        """
+        Start a run in the background unless one is already running
+
+        Returns:
+            True if a run was started
+        """
+        if self._stop.is_set():
+            return False
+        if not self._run_lock.acquire(blocking=False):
+            self.status['skipped_overlaps'] += 1
+            logger.warning("Previous run still in progress; skipping this one")
+            return False
+        self._worker = threading.Thread(target=self._run_once, name="etl-run", daemon=True)
+        self._worker.start()
+        return True
+
+    def _run_once(self):
+        started = time.time()
+        self.status['state'] = 'running'
+        self.status['last_run_started'] = datetime.now().isoformat()
+        try:
+            if self.mode == 'streaming':
+                stats = self.pipeline.run_streaming()
+            elif self.mode == 'workers':
+                stats = self.pipeline.run_workers()
+            else:
+                stats = self.pipeline.run()
+            self.status['last_success'] = datetime.now().isoformat()
+            self.status['last_error'] = None
+            self.status['last_stats'] = {
+                key: value for key, value in stats.items() if key != 'errors'
+            }
+        except Exception as e:
+            logger.error(f"Scheduled run failed: {e}")
+            self.status['failures'] += 1
+            self.status['last_error'] = str(e)
+        finally:
+            self.status['runs'] += 1
+            self.status['last_duration'] = time.time() - started
+            self.status['last_run_finished'] = datetime.now().isoformat()
+            self.status['state'] = 'stopping' if self._stop.is_set() else 'idle'
+            self._run_lock.release()
+
+    def is_healthy(self) -> bool:
+        """
+        Healthy unless stopping or no run succeeded within three intervals
+        (the first interval after startup is a grace period)
+        """
+        if self._stop.is_set():
+            return False
+        last_success = self.status['last_success']
+        reference = (
+            datetime.fromisoformat(last_success) if last_success else self.started_at
+        )
+        allowed = self.interval_minutes * 60 * (3 if last_success else 1) + self.shutdown_timeout
+        return (datetime.now() - reference).total_seconds() <= allowed
+
+    def get_status(self) -> Dict:
+        """Daemon status served by /status"""
+        next_run = self.scheduler.next_run
+        return {
+            **self.status,
+            'healthy': self.is_healthy(),
+            'started_at': self.started_at.isoformat(),
+            'interval_minutes': self.interval_minutes,
+            'mode': self.mode,
+            'next_run': next_run.isoformat() if next_run else None
+        }
+
+    def _start_health_server(self):
+        daemon = self
+
+        class HealthHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    payload = METRICS.render_prometheus().encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                    self.send_header('Content-Length', str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+                if self.path == '/health':
+                    healthy = daemon.is_healthy()
+                    body = {'status': 'ok' if healthy else 'unhealthy', 'state': daemon.status['state']}
+                    code = 200 if healthy else 503
+                elif self.path == '/status':
+                    body = daemon.get_status()
+                    code = 200
+                else:
+                    body = {'error': 'not found'}
+                    code = 404
+                payload = json.dumps(body, default=str).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                logger.debug(f"health: {format % args}")
+
+        self._server = ThreadingHTTPServer(('0.0.0.0', self.health_port), HealthHandler)
+        threading.Thread(target=self._server.serve_forever, name="etl-health", daemon=True).start()
+        logger.info(f"✓ Health endpoint on :{self.health_port} (/health, /status, /metrics)")
+
+    def stop(self, *_):
+        """Request a graceful shutdown (signal handler compatible)"""
+        if not self._stop.is_set():
+            logger.info("Shutdown requested; finishing the current run...")
+            self._stop.set()
+
+    def serve_forever(self):
+        """Run immediately, then on schedule until stop() is called"""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        if self.health_port:
+            self._start_health_server()
+
+        self.scheduler.every(self.interval_minutes).minutes.do(self.trigger)
+        self.status['state'] = 'idle'
+        logger.info(
+            f"🕒 ETL daemon started: every {self.interval_minutes} min "
+            f"({self.mode} mode)"
+        )
+        self.trigger()
+
+        while not self._stop.is_set():
+            self.scheduler.run_pending()
+            self._stop.wait(1)
+
+        self._shutdown()
+
+    def _shutdown(self):
+        self.status['state'] = 'stopping'
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            worker.join(timeout=self.shutdown_timeout)
+            if worker.is_alive():
+                logger.warning(f"Run still in progress after {self.shutdown_timeout:.0f}s; exiting anyway")
+        if self._server is not None:
+            self._server.shutdown()
+        self.pipeline.close()
+        self.status['state'] = 'stopped'
+        logger.info("ETL daemon stopped")
+
+
+def main():
+    """Main entry point"""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Run the ETL pipeline as a scheduled daemon")
+    parser.add_argument('--interval', type=float,
+                        default=float(os.getenv("DAEMON_INTERVAL_MINUTES", "15")),
+                        help='Minutes between runs')
+    parser.add_argument('--port', type=int, default=int(os.getenv("DAEMON_HEALTH_PORT", "8080")),
+                        help='Health endpoint port (0 = disabled)')
+    parser.add_argument('--mode', choices=['batch', 'streaming', 'workers'],
+                        default=os.getenv("PIPELINE_MODE", "batch").lower(),
+                        help='Run mode')
+    args = parser.parse_args()
+
+    startup = time.time()
+    try:
+        pipeline = pipeline_from_env()
+    except Exception as e:
+        logger.error(f"Fatal error: {e}")
+        sys.exit(1)
+    logger.info(f"✓ Pipeline initialized in {time.time() - startup:.2f}s (once for all runs)")
+
+    # Without an explicit RUN_TIME_BUDGET_SECONDS a batch run must fit its slot
+    if not pipeline.run_budget:
+        pipeline.run_budget = args.interval * 60
+
+    PipelineDaemon(
+        pipeline,
+        interval_minutes=args.interval,
+        mode=args.mode,
+        health_port=args.port or None
+    ).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ import sqlite3
 import hashlib
 import json
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict
 from pathlib import Path
 
 
@@ -18,11 +18,25 @@ class NewsDatabase:
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         self.init_database()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection that waits on locks instead of failing"""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def _ensure_column(cursor: sqlite3.Cursor, table: str, column: str, definition: str):
+        """Add a column to an existing table if it is missing (schema migration)"""
+        cursor.execute(f'PRAGMA table_info({table})')
+        if column not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
     def init_database(self):
         """Initialize database schema"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
 
+        # WAL lets background jobs write while the pipeline reads
+        cursor.execute('PRAGMA journal_mode=WAL')
+
         # Main news table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS news_item (
@@ -42,6 +56,9 @@ class NewsDatabase:
                 summary TEXT,
                 relevance_score REAL,
 
+                -- Prompt hash + model that produced the enrichment
+                scorer_version TEXT,
+
                 -- Status and metadata
                 status TEXT DEFAULT 'active',
                 alerted INTEGER DEFAULT 0,
@@ -62,15 +79,146 @@ class NewsDatabase:
                 news_discarded INTEGER DEFAULT 0,
                 errors TEXT,
                 duration_seconds REAL,
+                timings TEXT,  -- JSON: stage/source seconds, call and DB percentiles
+                news_deferred INTEGER DEFAULT 0,
+                oldest_deferred_seconds REAL DEFAULT 0,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP
             )
         ''')
 
+        # Job checkpoints (resumable background jobs)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_checkpoint (
+                job_name TEXT PRIMARY KEY,
+                last_id INTEGER DEFAULT 0,
+                scorer_version TEXT,
+                processed INTEGER DEFAULT 0,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Every LLM verdict, kept or discarded (training data for the
+        # local classifier; discards are not stored in news_item)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS scoring_label (
+                hash_url TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                body TEXT NOT NULL,
+                keep INTEGER NOT NULL,
+                severity TEXT,
+                relevance_score REAL,
+                scorer_version TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Per-item progress of pipeline runs: each item is written here as
+        # soon as it passes a stage, so a crashed run can be resumed without
+        # re-scoring. payload is the news item (enriched once scored).
+        # stage: extracted → scored → saved → done, or discarded, or failed
+        # (scoring failed; retried through the dead_letter table)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS pipeline_item (
+                hash_url TEXT PRIMARY KEY,
+                stage TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                news_id INTEGER,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Items that could not be scored, retried with backoff on later runs
+        # status: pending (retry at next_attempt_at) or failed (gave up)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS dead_letter (
+                hash_url TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                error_class TEXT,
+                error TEXT,
+                attempts INTEGER DEFAULT 0,
+                status TEXT DEFAULT 'pending',
+                next_attempt_at TEXT,
+                first_failed_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Alerts to deliver, one row per news item and channel, written in the
+        # same transaction as the news item; the dispatcher leases due rows
+        # (status sending until lease_until) and news_item.alerted is set once
+        # every channel row is delivered.
+        # status: pending → sending → delivered, or failed (gave up); rows
+        # folded into an alert digest wait as held until the digest is
+        # delivered (→ delivered) or fails (→ pending)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS alert_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                news_id INTEGER NOT NULL,
+                channel TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                next_attempt_at TEXT,
+                lease_until TEXT,
+                last_error TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                delivered_at TEXT,
+                UNIQUE (news_id, channel)
+            )
+        ''')
+
+        # Reports of the same real-world event (see incidents.py); tags,
+        # entities and signature (MinHash of the text) are JSON arrays, times
+        # naive UTC ISO. incident_key indexes incidents by area and text
+        # bands so matching reads only recent incidents sharing a key.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS incident (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                area TEXT,
+                area_key TEXT,
+                title TEXT,
+                severity TEXT,
+                tags TEXT,
+                entities TEXT,
+                signature TEXT,
+                item_count INTEGER DEFAULT 1,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS incident_key (
+                key TEXT NOT NULL,
+                incident_id INTEGER NOT NULL,
+                last_seen TEXT NOT NULL,
+                PRIMARY KEY (key, incident_id)
+            )
+        ''')
+
+        # Migrations for databases created by older versions
+        self._ensure_column(cursor, 'news_item', 'scorer_version', 'TEXT')
+        self._ensure_column(cursor, 'news_item', 'incident_id', 'INTEGER')
+        self._ensure_column(cursor, 'execution_log', 'timings', 'TEXT')
+        self._ensure_column(cursor, 'execution_log', 'news_deferred', 'INTEGER DEFAULT 0')
+        self._ensure_column(cursor, 'execution_log', 'oldest_deferred_seconds', 'REAL DEFAULT 0')
+
         # Create indexes
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_hash_url ON news_item(hash_url)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_published_at ON news_item(published_at)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_severity ON news_item(severity)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_source ON news_item(source)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_area ON news_item(area, published_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_pipeline_stage ON pipeline_item(stage)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_dead_letter_due ON dead_letter(status, next_attempt_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_alert_outbox_due ON alert_outbox(status, next_attempt_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_incident ON news_item(incident_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_incident_key_recent ON incident_key(key, last_seen)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_incident_key_incident ON incident_key(incident_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_incident_last_seen ON incident(last_seen)')
 
         conn.commit()
         conn.close()
@@ -82,7 +230,7 @@ class NewsDatabase:
     def is_duplicate(self, url: str) -> bool:
         """Check if URL already exists in database"""
         hash_url = self.compute_hash(url)
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
 
         cursor.execute('SELECT id FROM news_item WHERE hash_url = ?', (hash_url,))
@@ -91,23 +239,34 @@ class NewsDatabase:
 
         return result is not None
 
-    def insert_news(self, news_item: Dict) -> Optional[int]:
-        """Insert news item into database"""
+    def insert_news(self, news_item: Dict, alert_channels: Optional[List[str]] = None) -> Optional[int]:
+        """
+        Insert news item into database
+
+        Args:
+            news_item: News item (enriched)
+            alert_channels: Channels to alert on; their outbox rows are
+                written in the same transaction as the item
+
+        Returns:
+            Inserted item ID or None if duplicate
+        """
         hash_url = self.compute_hash(news_item['url'])
 
         # Check for duplicates
         if self.is_duplicate(news_item['url']):
             return None
 
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
 
         try:
             cursor.execute('''
                 INSERT INTO news_item (
                     source, url, hash_url, title, body, published_at,
-                    severity, tags, area, entities, summary, relevance_score
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    severity, tags, area, entities, summary, relevance_score,
+                    scorer_version, incident_id
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 news_item['source'],
                 news_item['url'],
@@ -120,28 +279,287 @@ class NewsDatabase:
                 news_item.get('area'),
                 json.dumps(news_item.get('entities', [])),
                 news_item.get('summary'),
-                news_item.get('relevance_score')
+                news_item.get('relevance_score'),
+                news_item.get('scorer_version'),
+                news_item.get('incident_id')
             ))
+            news_id = cursor.lastrowid
+
+            if alert_channels:
+                self._insert_outbox_rows(cursor, news_id, alert_channels, news_item)
 
             conn.commit()
-            news_id = cursor.lastrowid
             conn.close()
             return news_id
         except sqlite3.IntegrityError:
             conn.close()
             return None
 
-    def mark_as_alerted(self, news_id: int):
-        """Mark news item as alerted"""
-        conn = sqlite3.connect(self.db_path)
+    @staticmethod
+    def _insert_outbox_rows(cursor: sqlite3.Cursor, news_id: int, channels: List[str], news_item: Dict):
+        payload = json.dumps(news_item, default=str)
+        now = datetime.now().isoformat()
+        cursor.executemany('''
+            INSERT OR IGNORE INTO alert_outbox (news_id, channel, payload, next_attempt_at)
+            VALUES (?, ?, ?, ?)
+        ''', [(news_id, channel, payload, now) for channel in channels])
+
+    def enqueue_alerts(self, news_id: int, channels: List[str], news_item: Dict):
+        """Add outbox rows for a stored item (channels already queued are left alone)"""
+        conn = self._connect()
+        self._insert_outbox_rows(conn.cursor(), news_id, channels, news_item)
+        conn.commit()
+        conn.close()
+
+    def claim_alerts(self, now: str, lease_until: str, news_id: Optional[int] = None,
+                     limit: int = 100) -> List[Dict]:
+        """
+        Lease the outbox rows that are due (pending and past next_attempt_at,
+        sending with an expired lease, or held past next_attempt_at because
+        their digest never reported back), atomically
+
+        Args:
+            now: Current time (ISO format)
+            lease_until: Lease expiry for the claimed rows (ISO format)
+            news_id: Only rows of this news item (None = any)
+            limit: Maximum number of rows
+
+        Returns:
+            List of dicts with id, news_id, channel, attempts and news (payload)
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        conn.isolation_level = None
+        conn.execute('BEGIN IMMEDIATE')
+        rows = conn.execute(f'''
+            SELECT id, news_id, channel, attempts, payload FROM alert_outbox
+            WHERE ((status IN ('pending', 'held') AND next_attempt_at <= ?)
+                   OR (status = 'sending' AND lease_until < ?))
+              {'AND news_id = ?' if news_id is not None else ''}
+            ORDER BY id
+            LIMIT ?
+        ''', (now, now) + ((news_id,) if news_id is not None else ()) + (limit,)).fetchall()
+        conn.executemany(
+            "UPDATE alert_outbox SET status = 'sending', lease_until = ? WHERE id = ?",
+            [(lease_until, row['id']) for row in rows]
+        )
+        conn.execute('COMMIT')
+        conn.close()
+
+        return [
+            {'id': row['id'], 'news_id': row['news_id'], 'channel': row['channel'],
+             'attempts': row['attempts'], 'news': json.loads(row['payload'])}
+            for row in rows
+        ]
+
+    def update_alert_delivery(
+        self,
+        outbox_id: int,
+        status: str,
+        attempts: int,
+        next_attempt_at: Optional[str] = None,
+        error: Optional[str] = None
+    ):
+        """
+        Record the outcome of a delivery attempt
+
+        Args:
+            outbox_id: alert_outbox row
+            status: 'delivered', 'pending' (retry at next_attempt_at),
+                'held' (waiting for its digest until next_attempt_at) or 'failed'
+            attempts: Attempts so far
+            next_attempt_at: ISO time of the next attempt (pending/held only)
+            error: Error of a failed attempt
+        """
+        conn = self._connect()
+        conn.execute('''
+            UPDATE alert_outbox SET
+                status = ?, attempts = ?, next_attempt_at = ?, last_error = ?,
+                lease_until = NULL,
+                delivered_at = CASE WHEN ? = 'delivered' THEN CURRENT_TIMESTAMP END
+            WHERE id = ?
+        ''', (status, attempts, next_attempt_at, error, status, outbox_id))
+        conn.commit()
+        conn.close()
+
+    def mark_alerted_if_delivered(self, news_id: int) -> bool:
+        """
+        Set news_item.alerted once every outbox row of the item is delivered
+
+        Returns:
+            True if this call set the flag
+        """
+        conn = self._connect()
         cursor = conn.cursor()
-        cursor.execute('UPDATE news_item SET alerted = 1 WHERE id = ?', (news_id,))
+        cursor.execute('''
+            UPDATE news_item SET alerted = 1
+            WHERE id = ? AND alerted = 0
+              AND NOT EXISTS (
+                  SELECT 1 FROM alert_outbox WHERE news_id = ? AND status != 'delivered'
+              )
+        ''', (news_id, news_id))
+        marked = cursor.rowcount == 1
+        conn.commit()
+        conn.close()
+        return marked
+
+    def get_outbox_counts(self) -> Dict[str, int]:
+        """Outbox rows per status"""
+        conn = self._connect()
+        rows = conn.execute('SELECT status, COUNT(*) FROM alert_outbox GROUP BY status').fetchall()
+        conn.close()
+        return {status: count for status, count in rows}
+
+    def assign_incident(
+        self,
+        keys: List[str],
+        since: str,
+        decide: Callable[[List[Dict]], Dict],
+        limit: int = 50
+    ) -> int:
+        """
+        Match an item to an incident inside one write transaction, so
+        concurrent processes never open two incidents for the same event
+
+        Args:
+            keys: The item's index keys
+            since: Only incidents with a key seen at or after this time (ISO)
+            decide: Called with the candidate incidents (most recent first,
+                JSON fields decoded); returns a dict with id (None = open a
+                new incident), incident (the fields to store) and keys
+            limit: Maximum number of candidates
+
+        Returns:
+            ID of the incident the item was assigned to
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        conn.isolation_level = None
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(f'''
+                SELECT * FROM incident WHERE id IN (
+                    SELECT incident_id FROM incident_key
+                    WHERE key IN ({','.join('?' * len(keys))}) AND last_seen >= ?
+                )
+                ORDER BY last_seen DESC
+                LIMIT ?
+            ''', (*keys, since, limit)).fetchall() if keys else []
+            candidates = [
+                {**dict(row), **{field: json.loads(row[field] or '[]')
+                                 for field in ('tags', 'entities', 'signature')}}
+                for row in rows
+            ]
+
+            decision = decide(candidates)
+            incident = decision['incident']
+            values = (
+                incident['area'], incident['area_key'], incident['title'], incident['severity'],
+                json.dumps(incident['tags']), json.dumps(incident['entities']),
+                json.dumps(incident['signature']), incident['item_count'],
+                incident['first_seen'], incident['last_seen']
+            )
+            incident_id = decision['id']
+            if incident_id is None:
+                incident_id = conn.execute('''
+                    INSERT INTO incident (
+                        area, area_key, title, severity, tags, entities, signature,
+                        item_count, first_seen, last_seen
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', values).lastrowid
+            else:
+                conn.execute('''
+                    UPDATE incident SET
+                        area = ?, area_key = ?, title = ?, severity = ?, tags = ?,
+                        entities = ?, signature = ?, item_count = ?, first_seen = ?,
+                        last_seen = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', values + (incident_id,))
+
+            conn.executemany(
+                'INSERT OR IGNORE INTO incident_key (key, incident_id, last_seen) VALUES (?, ?, ?)',
+                [(key, incident_id, incident['last_seen']) for key in set(decision['keys'])]
+            )
+            conn.execute(
+                'UPDATE incident_key SET last_seen = ? WHERE incident_id = ?',
+                (incident['last_seen'], incident_id)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return incident_id
+
+    def get_recent_incidents(self, limit: int = 20, min_severity_rank: int = 0) -> List[Dict]:
+        """
+        Get the most recently updated incidents with their report counts
+
+        Args:
+            limit: Maximum number of incidents
+            min_severity_rank: Only incidents at least this severe
+                (0 low, 1 medium, 2 high, 3 critical)
+
+        Returns:
+            List of incident dicts (tags and entities decoded, no signature)
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute('''
+            SELECT id, area, title, severity, tags, entities, item_count,
+                   first_seen, last_seen
+            FROM incident
+            WHERE CASE severity
+                WHEN 'critical' THEN 3 WHEN 'high' THEN 2 WHEN 'medium' THEN 1 ELSE 0
+            END >= ?
+            ORDER BY last_seen DESC
+            LIMIT ?
+        ''', (min_severity_rank, limit)).fetchall()
+        conn.close()
+        return [
+            {**dict(row), 'tags': json.loads(row['tags'] or '[]'),
+             'entities': json.loads(row['entities'] or '[]')}
+            for row in rows
+        ]
+
+    def get_incident_news(self, incident_id: int) -> List[Dict]:
+        """Get the news items of an incident, oldest first"""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(
+            'SELECT * FROM news_item WHERE incident_id = ? ORDER BY published_at',
+            (incident_id,)
+        ).fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+
+    def mark_as_alerted(self, news_id: int) -> bool:
+        """
+        Mark news item as alerted, atomically (compare-and-set)
+
+        Returns:
+            True if this call marked it, False if it was alerted already
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('UPDATE news_item SET alerted = 1 WHERE id = ? AND alerted = 0', (news_id,))
+        marked = cursor.rowcount == 1
+        conn.commit()
+        conn.close()
+        return marked
+
+    def clear_alerted(self, news_id: int):
+        """Undo mark_as_alerted when the alert could not be sent"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('UPDATE news_item SET alerted = 0 WHERE id = ?', (news_id,))
         conn.commit()
         conn.close()
 
     def get_recent_news(self, limit: int = 50) -> List[Dict]:
         """Get recent news items"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -158,13 +576,13 @@ class NewsDatabase:
 
     def get_high_severity_news(self, limit: int = 20) -> List[Dict]:
         """Get high and critical severity news"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
         cursor.execute('''
             SELECT * FROM news_item
-            WHERE severity IN ('high', 'critical')
+            WHERE severity IN ('high', 'critical') AND status = 'active'
             ORDER BY published_at DESC
             LIMIT ?
         ''', (limit,))
@@ -174,17 +592,412 @@ class NewsDatabase:
 
         return [dict(row) for row in rows]
 
+    def get_news_by_area(self, area: str, limit: int = 50) -> List[Dict]:
+        """
+        Get news items of one area, newest first
+
+        Args:
+            area: Canonical area code as stored (see gazetteer.py), e.g.
+                Linea_A_Metro or Envigado; an exact match, so it uses idx_area
+            limit: Maximum number of items
+
+        Returns:
+            List of news dictionaries
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT * FROM news_item
+            WHERE area = ?
+            ORDER BY published_at DESC
+            LIMIT ?
+        ''', (area, limit))
+
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [dict(row) for row in rows]
+
+    def get_rows_to_rescore(
+        self,
+        current_version: str,
+        after_id: int = 0,
+        limit: int = 50
+    ) -> List[Dict]:
+        """
+        Get the next rows scored by another scorer version (keyset order)
+
+        Args:
+            current_version: Version of the current scorer
+            after_id: Last processed id
+            limit: Batch size
+
+        Returns:
+            List of news dictionaries ordered by id
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT id, source, url, title, body, published_at, scorer_version
+            FROM news_item
+            WHERE id > ? AND (scorer_version IS NULL OR scorer_version != ?)
+            ORDER BY id
+            LIMIT ?
+        ''', (after_id, current_version, limit))
+
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [dict(row) for row in rows]
+
+    def update_scoring_batch(self, updates: List[Dict]) -> int:
+        """
+        Write re-scoring results in a single transaction
+
+        Args:
+            updates: Dicts with id, keep and the ScoringResponse fields plus
+                scorer_version. keep=false rows keep their enrichment and
+                are marked status='discarded'.
+
+        Returns:
+            Number of updated rows
+        """
+        if not updates:
+            return 0
+
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.executemany('''
+            UPDATE news_item SET
+                severity = COALESCE(?, severity),
+                tags = COALESCE(?, tags),
+                area = COALESCE(?, area),
+                entities = COALESCE(?, entities),
+                summary = COALESCE(?, summary),
+                relevance_score = COALESCE(?, relevance_score),
+                scorer_version = ?,
+                status = ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', [
+            (
+                u.get('severity') if u.get('keep') else None,
+                json.dumps(u.get('tags', [])) if u.get('keep') else None,
+                u.get('area') if u.get('keep') else None,
+                json.dumps(u.get('entities', [])) if u.get('keep') else None,
+                u.get('summary') if u.get('keep') else None,
+                u.get('relevance_score'),
+                u['scorer_version'],
+                'active' if u.get('keep') else 'discarded',
+                u['id']
+            )
+            for u in updates
+        ])
+        conn.commit()
+        updated = cursor.rowcount
+        conn.close()
+        return updated
+
+    def get_job_checkpoint(self, job_name: str) -> Optional[Dict]:
+        """Get the saved progress of a background job"""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM job_checkpoint WHERE job_name = ?', (job_name,))
+        row = cursor.fetchone()
+        conn.close()
+        return dict(row) if row else None
+
+    def save_job_checkpoint(self, job_name: str, last_id: int, scorer_version: str, processed: int):
+        """Save the progress of a background job"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO job_checkpoint (job_name, last_id, scorer_version, processed, updated_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(job_name) DO UPDATE SET
+                last_id = excluded.last_id,
+                scorer_version = excluded.scorer_version,
+                processed = excluded.processed,
+                updated_at = excluded.updated_at
+        ''', (job_name, last_id, scorer_version, processed))
+        conn.commit()
+        conn.close()
+
+    def save_scoring_label(self, news_item: Dict, verdict: Dict, scorer_version: str):
+        """
+        Store an LLM verdict as a training label (latest verdict per URL wins)
+
+        Args:
+            news_item: Scored news item
+            verdict: ScoringResponse dict (kept or discarded)
+            scorer_version: Version of the scorer that produced the verdict
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO scoring_label (
+                hash_url, title, body, keep, severity, relevance_score, scorer_version
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            self.compute_hash(news_item['url']),
+            news_item.get('title', ''),
+            news_item.get('body', ''),
+            1 if verdict.get('keep') else 0,
+            verdict.get('severity') if verdict.get('keep') else None,
+            verdict.get('relevance_score'),
+            scorer_version
+        ))
+        conn.commit()
+        conn.close()
+
+    def get_training_labels(self) -> List[Dict]:
+        """
+        Get labelled items for training the local classifier
+
+        Stored news without a scoring_label row (scored before labels were
+        recorded) are included as keep=true, or keep=false if a re-scoring
+        discarded them.
+
+        Returns:
+            List of dicts with title, body, keep and severity
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT title, body, keep, severity FROM scoring_label
+            UNION ALL
+            SELECT title, body, CASE WHEN status = 'discarded' THEN 0 ELSE 1 END, severity
+            FROM news_item
+            WHERE hash_url NOT IN (SELECT hash_url FROM scoring_label)
+        ''')
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [dict(row) for row in rows]
+
+    def stage_items(self, news_items: List[Dict]) -> List[Dict]:
+        """
+        Record extracted items in the staging table
+
+        Items already past scoring (scored, saved, done, discarded, or
+        failed and left to the dead-letter queue) are left untouched;
+        scored and saved ones are finished by resume.
+
+        Returns:
+            The items that still need scoring (new, staged but never scored,
+            or deferred by an earlier run), in input order
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        to_score = []
+        for news in news_items:
+            hash_url = self.compute_hash(news['url'])
+            cursor.execute('''
+                INSERT OR IGNORE INTO pipeline_item (hash_url, stage, payload)
+                VALUES (?, 'extracted', ?)
+            ''', (hash_url, json.dumps(news, default=str)))
+            if not cursor.rowcount:
+                cursor.execute('SELECT stage FROM pipeline_item WHERE hash_url = ?', (hash_url,))
+                if cursor.fetchone()[0] not in ('extracted', 'deferred'):
+                    continue
+            to_score.append(news)
+        conn.commit()
+        conn.close()
+        return to_score
+
+    def update_stage(
+        self,
+        url: str,
+        stage: str,
+        payload: Optional[Dict] = None,
+        news_id: Optional[int] = None
+    ):
+        """
+        Move a staged item to its next stage
+
+        Args:
+            url: News URL
+            stage: New stage (scored, discarded, saved, done or deferred)
+            payload: Enriched news item (kept as is when None)
+            news_id: news_item id once saved
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE pipeline_item SET
+                stage = ?,
+                payload = COALESCE(?, payload),
+                news_id = COALESCE(?, news_id),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE hash_url = ?
+        ''', (
+            stage,
+            json.dumps(payload, default=str) if payload is not None else None,
+            news_id,
+            self.compute_hash(url)
+        ))
+        conn.commit()
+        conn.close()
+
+    def get_unfinished_items(self) -> List[Dict]:
+        """
+        Get staged items whose run stopped before they were done
+
+        Returns:
+            List of dicts with stage, news_id and news (the stored payload)
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT stage, payload, news_id FROM pipeline_item
+            WHERE stage IN ('extracted', 'scored', 'saved')
+            ORDER BY created_at
+        ''')
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [
+            {'stage': row['stage'], 'news_id': row['news_id'], 'news': json.loads(row['payload'])}
+            for row in rows
+        ]
+
+    def get_deferred_items(self) -> List[Dict]:
+        """
+        Get the items earlier runs deferred for lack of time
+
+        Returns:
+            List of dicts with news (the stored payload) and staged_at (UTC),
+            oldest first
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT payload, created_at FROM pipeline_item
+            WHERE stage = 'deferred'
+            ORDER BY created_at
+        ''')
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [
+            {'news': json.loads(row['payload']), 'staged_at': row['created_at']}
+            for row in rows
+        ]
+
+    def get_dead_letter(self, url: str) -> Optional[Dict]:
+        """Get the dead-letter entry of a news item, if any"""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM dead_letter WHERE hash_url = ?', (self.compute_hash(url),))
+        row = cursor.fetchone()
+        conn.close()
+        return dict(row) if row else None
+
+    def save_dead_letter(
+        self,
+        news_item: Dict,
+        error_class: str,
+        error: str,
+        attempts: int,
+        status: str,
+        next_attempt_at: Optional[str]
+    ):
+        """
+        Create or update the dead-letter entry of a news item
+
+        Args:
+            news_item: News item that could not be scored
+            error_class: ScoringError class of the last failure
+            error: Last error message
+            attempts: Failed attempts so far
+            status: 'pending' (will be retried) or 'failed' (given up)
+            next_attempt_at: ISO time of the next retry (None when failed)
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO dead_letter (
+                hash_url, url, payload, error_class, error, attempts, status, next_attempt_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(hash_url) DO UPDATE SET
+                error_class = excluded.error_class,
+                error = excluded.error,
+                attempts = excluded.attempts,
+                status = excluded.status,
+                next_attempt_at = excluded.next_attempt_at,
+                updated_at = CURRENT_TIMESTAMP
+        ''', (
+            self.compute_hash(news_item['url']),
+            news_item['url'],
+            json.dumps(news_item, default=str),
+            error_class,
+            error,
+            attempts,
+            status,
+            next_attempt_at
+        ))
+        conn.commit()
+        conn.close()
+
+    def get_due_dead_letters(self, now: str, limit: int) -> List[Dict]:
+        """
+        Get pending dead-letter items whose retry time has passed
+
+        Args:
+            now: Current time (ISO format)
+            limit: Maximum number of items
+
+        Returns:
+            List of dicts with news (the stored item), attempts and error_class,
+            longest overdue first
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT payload, attempts, error_class FROM dead_letter
+            WHERE status = 'pending' AND next_attempt_at <= ?
+            ORDER BY next_attempt_at
+            LIMIT ?
+        ''', (now, limit))
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [
+            {'news': json.loads(row['payload']), 'attempts': row['attempts'],
+             'error_class': row['error_class']}
+            for row in rows
+        ]
+
+    def delete_dead_letter(self, url: str):
+        """Remove a news item from the dead-letter table"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM dead_letter WHERE hash_url = ?', (self.compute_hash(url),))
+        conn.commit()
+        conn.close()
+
     def log_execution(self, stats: Dict):
         """Log pipeline execution statistics"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
 
         cursor.execute('''
             INSERT INTO execution_log (
                 execution_time, news_extracted, news_deduplicated,
                 news_scored, news_kept, news_discarded,
-                errors, duration_seconds
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                errors, duration_seconds, timings,
+                news_deferred, oldest_deferred_seconds
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             datetime.now().isoformat(),
             stats.get('extracted', 0),
@@ -193,7 +1006,10 @@ class NewsDatabase:
             stats.get('kept', 0),
             stats.get('discarded', 0),
             json.dumps(stats.get('errors', [])),
-            stats.get('duration', 0)
+            stats.get('duration', 0),
+            json.dumps(stats.get('timings', {})),
+            stats.get('deferred', 0),
+            stats.get('oldest_deferred_age', 0)
         ))
 
         conn.commit()
@@ -201,7 +1017,7 @@ class NewsDatabase:
 
     def get_stats(self) -> Dict:
         """Get database statistics"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
 
         # Total news
@@ -224,6 +1040,10 @@ class NewsDatabase:
         ''')
         by_source = {row[0]: row[1] for row in cursor.fetchall()}
 
+        # Incidents (reports of the same event count once)
+        cursor.execute('SELECT COUNT(*) FROM incident')
+        incidents = cursor.fetchone()[0]
+
         # Recent executions
         cursor.execute('''
             SELECT * FROM execution_log
@@ -238,5 +1058,6 @@ class NewsDatabase:
             'total_news': total,
             'by_severity': by_severity,
             'by_source': by_source,
+            'incidents': incidents,
             'recent_executions': len(recent_executions)
         }
@@ -3,10 +3,10 @@ Database module for ETL Movilidad Medellín - Supabase implementation
 Handles news storage, deduplication, and queries using Supabase PostgreSQL
 """
 import hashlib
+import json
 import os
 from datetime import datetime
-from typing import Optional, List, Dict
-from dotenv import load_dotenv
+from typing import Callable, Optional, List, Dict
 
 try:
     from supabase import create_client, Client
@@ -15,11 +15,105 @@ except ImportError:
         "supabase package not found. Install it with: pip install supabase"
     )
 
-load_dotenv()
-
 
 class SupabaseNewsDatabase:
-    """Supabase database manager for news items"""
+    """
+    Supabase database manager for news items
+
+    Expected schema additions over the base news_item/execution_log tables:
+
+        ALTER TABLE news_item ADD COLUMN scorer_version TEXT;
+        ALTER TABLE execution_log ADD COLUMN timings JSONB;
+        ALTER TABLE execution_log ADD COLUMN news_deferred INTEGER DEFAULT 0;
+        ALTER TABLE execution_log ADD COLUMN oldest_deferred_seconds REAL DEFAULT 0;
+        CREATE TABLE job_checkpoint (
+            job_name TEXT PRIMARY KEY,
+            last_id BIGINT DEFAULT 0,
+            scorer_version TEXT,
+            processed INTEGER DEFAULT 0,
+            updated_at TIMESTAMPTZ DEFAULT now()
+        );
+        CREATE TABLE scoring_label (
+            hash_url TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            body TEXT NOT NULL,
+            keep BOOLEAN NOT NULL,
+            severity TEXT,
+            relevance_score REAL,
+            scorer_version TEXT,
+            created_at TIMESTAMPTZ DEFAULT now()
+        );
+        CREATE TABLE pipeline_item (
+            hash_url TEXT PRIMARY KEY,
+            stage TEXT NOT NULL,
+            payload JSONB NOT NULL,
+            news_id BIGINT,
+            created_at TIMESTAMPTZ DEFAULT now(),
+            updated_at TIMESTAMPTZ DEFAULT now()
+        );
+        CREATE INDEX idx_pipeline_stage ON pipeline_item(stage);
+        CREATE TABLE dead_letter (
+            hash_url TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            payload JSONB NOT NULL,
+            error_class TEXT,
+            error TEXT,
+            attempts INTEGER DEFAULT 0,
+            status TEXT DEFAULT 'pending',
+            next_attempt_at TIMESTAMPTZ,
+            first_failed_at TIMESTAMPTZ DEFAULT now(),
+            updated_at TIMESTAMPTZ DEFAULT now()
+        );
+        CREATE INDEX idx_dead_letter_due ON dead_letter(status, next_attempt_at);
+        CREATE TABLE alert_outbox (
+            id BIGSERIAL PRIMARY KEY,
+            news_id BIGINT NOT NULL,
+            channel TEXT NOT NULL,
+            payload JSONB NOT NULL,
+            status TEXT DEFAULT 'pending',
+            attempts INTEGER DEFAULT 0,
+            next_attempt_at TIMESTAMPTZ,
+            lease_until TIMESTAMPTZ,
+            last_error TEXT,
+            created_at TIMESTAMPTZ DEFAULT now(),
+            delivered_at TIMESTAMPTZ,
+            UNIQUE (news_id, channel)
+        );
+        CREATE INDEX idx_alert_outbox_due ON alert_outbox(status, next_attempt_at);
+        CREATE TABLE incident (
+            id BIGSERIAL PRIMARY KEY,
+            area TEXT,
+            area_key TEXT,
+            title TEXT,
+            severity TEXT,
+            tags JSONB,
+            entities JSONB,
+            signature JSONB,
+            item_count INTEGER DEFAULT 1,
+            first_seen TIMESTAMP NOT NULL,
+            last_seen TIMESTAMP NOT NULL,
+            created_at TIMESTAMPTZ DEFAULT now(),
+            updated_at TIMESTAMPTZ DEFAULT now()
+        );
+        CREATE INDEX idx_incident_last_seen ON incident(last_seen);
+        CREATE TABLE incident_key (
+            key TEXT NOT NULL,
+            incident_id BIGINT NOT NULL,
+            last_seen TIMESTAMP NOT NULL,
+            PRIMARY KEY (key, incident_id)
+        );
+        CREATE INDEX idx_incident_key_recent ON incident_key(key, last_seen);
+        CREATE INDEX idx_incident_key_incident ON incident_key(incident_id);
+        ALTER TABLE news_item ADD COLUMN incident_id BIGINT;
+        CREATE INDEX idx_news_incident ON news_item(incident_id);
+        CREATE INDEX idx_area ON news_item(area, published_at);
+
+    The REST client has no multi-statement transactions: outbox rows are
+    written right after their news item, and the pipeline re-queues them
+    (enqueue_alerts is idempotent) before dispatching. Incident matching is
+    not serialised either, so concurrent processes may rarely open two
+    incidents for one event.
+    """
 
     def __init__(
         self,
@@ -63,12 +157,13 @@ class SupabaseNewsDatabase:
             print(f"Error checking duplicate: {e}")
             return False
 
-    def insert_news(self, news_item: Dict) -> Optional[int]:
+    def insert_news(self, news_item: Dict, alert_channels: Optional[List[str]] = None) -> Optional[int]:
         """
         Insert news item into database
 
         Args:
             news_item: Dictionary with news data
+            alert_channels: Channels to alert on (outbox rows written after the item)
 
         Returns:
             Inserted item ID or None if duplicate/error
@@ -93,28 +188,255 @@ class SupabaseNewsDatabase:
                 'area': news_item.get('area'),
                 'entities': news_item.get('entities', []),
                 'summary': news_item.get('summary'),
-                'relevance_score': news_item.get('relevance_score')
+                'relevance_score': news_item.get('relevance_score'),
+                'scorer_version': news_item.get('scorer_version'),
+                'incident_id': news_item.get('incident_id')
             }
 
             # Insert into Supabase
             response = self.client.table('news_item').insert(data).execute()
 
             if response.data and len(response.data) > 0:
-                return response.data[0]['id']
+                news_id = response.data[0]['id']
+                if alert_channels:
+                    self.enqueue_alerts(news_id, alert_channels, news_item)
+                return news_id
             return None
 
         except Exception as e:
             print(f"Error inserting news: {e}")
             return None
 
-    def mark_as_alerted(self, news_id: int):
-        """Mark news item as alerted"""
+    def enqueue_alerts(self, news_id: int, channels: List[str], news_item: Dict):
+        """Add outbox rows for a stored item (channels already queued are left alone)"""
+        payload = json.loads(json.dumps(news_item, default=str))
+        now = datetime.now().isoformat()
         try:
-            self.client.table('news_item').update(
+            self.client.table('alert_outbox').upsert(
+                [{'news_id': news_id, 'channel': channel, 'payload': payload, 'next_attempt_at': now}
+                 for channel in channels],
+                on_conflict='news_id,channel', ignore_duplicates=True
+            ).execute()
+        except Exception as e:
+            print(f"Error queueing alerts: {e}")
+
+    def claim_alerts(self, now: str, lease_until: str, news_id: Optional[int] = None,
+                     limit: int = 100) -> List[Dict]:
+        """
+        Lease the outbox rows that are due (pending and past next_attempt_at,
+        sending with an expired lease, or held past next_attempt_at because
+        their digest never reported back)
+
+        Each row is claimed with a conditional update on its current status
+        and lease, so concurrent dispatchers never both get it.
+
+        Returns:
+            List of dicts with id, news_id, channel, attempts and news (payload)
+        """
+        try:
+            query = self.client.table('alert_outbox').select(
+                'id, news_id, channel, attempts, payload, status, lease_until'
+            ).or_(
+                f'and(status.eq.pending,next_attempt_at.lte.{now}),'
+                f'and(status.eq.held,next_attempt_at.lte.{now}),'
+                f'and(status.eq.sending,lease_until.lt.{now})'
+            )
+            if news_id is not None:
+                query = query.eq('news_id', news_id)
+            rows = query.order('id').limit(limit).execute().data or []
+        except Exception as e:
+            print(f"Error reading alert outbox: {e}")
+            return []
+
+        claimed = []
+        for row in rows:
+            try:
+                update = self.client.table('alert_outbox').update(
+                    {'status': 'sending', 'lease_until': lease_until}
+                ).eq('id', row['id']).eq('status', row['status'])
+                if row['lease_until'] is None:
+                    update = update.is_('lease_until', 'null')
+                else:
+                    update = update.eq('lease_until', row['lease_until'])
+                if update.execute().data:
+                    claimed.append({
+                        'id': row['id'], 'news_id': row['news_id'], 'channel': row['channel'],
+                        'attempts': row['attempts'], 'news': row['payload']
+                    })
+            except Exception as e:
+                print(f"Error claiming alert: {e}")
+        return claimed
+
+    def update_alert_delivery(
+        self,
+        outbox_id: int,
+        status: str,
+        attempts: int,
+        next_attempt_at: Optional[str] = None,
+        error: Optional[str] = None
+    ):
+        """
+        Record the outcome of a delivery attempt
+
+        Args:
+            outbox_id: alert_outbox row
+            status: 'delivered', 'pending' (retry at next_attempt_at),
+                'held' (waiting for its digest until next_attempt_at) or 'failed'
+            attempts: Attempts so far
+            next_attempt_at: ISO time of the next attempt (pending/held only)
+            error: Error of a failed attempt
+        """
+        try:
+            self.client.table('alert_outbox').update({
+                'status': status,
+                'attempts': attempts,
+                'next_attempt_at': next_attempt_at,
+                'last_error': error,
+                'lease_until': None,
+                'delivered_at': datetime.now().isoformat() if status == 'delivered' else None
+            }).eq('id', outbox_id).execute()
+        except Exception as e:
+            print(f"Error updating alert delivery: {e}")
+
+    def mark_alerted_if_delivered(self, news_id: int) -> bool:
+        """
+        Set news_item.alerted once every outbox row of the item is delivered
+
+        Returns:
+            True if this call set the flag
+        """
+        try:
+            response = self.client.table('alert_outbox').select('id').eq(
+                'news_id', news_id
+            ).neq('status', 'delivered').limit(1).execute()
+            if response.data:
+                return False
+        except Exception as e:
+            print(f"Error checking alert outbox: {e}")
+            return False
+        return self.mark_as_alerted(news_id)
+
+    def get_outbox_counts(self) -> Dict[str, int]:
+        """Outbox rows per status"""
+        counts = {}
+        for row in self._select_all('alert_outbox', 'status', order='id'):
+            counts[row['status']] = counts.get(row['status'], 0) + 1
+        return counts
+
+    def assign_incident(
+        self,
+        keys: List[str],
+        since: str,
+        decide: Callable[[List[Dict]], Dict],
+        limit: int = 50
+    ) -> int:
+        """
+        Match an item to an incident (see the class note on concurrency)
+
+        Args:
+            keys: The item's index keys
+            since: Only incidents with a key seen at or after this time (ISO)
+            decide: Called with the candidate incidents (most recent first);
+                returns a dict with id (None = open a new incident),
+                incident (the fields to store) and keys
+            limit: Maximum number of candidates
+
+        Returns:
+            ID of the incident the item was assigned to
+        """
+        candidates = []
+        if keys:
+            key_rows = self.client.table('incident_key').select('incident_id').in_(
+                'key', keys
+            ).gte('last_seen', since).execute().data or []
+            ids = list({row['incident_id'] for row in key_rows})
+            if ids:
+                candidates = self.client.table('incident').select('*').in_(
+                    'id', ids
+                ).order('last_seen', desc=True).limit(limit).execute().data or []
+
+        decision = decide(candidates)
+        incident = decision['incident']
+        incident_id = decision['id']
+        if incident_id is None:
+            incident_id = self.client.table('incident').insert(incident).execute().data[0]['id']
+        else:
+            self.client.table('incident').update(
+                {**incident, 'updated_at': datetime.now().isoformat()}
+            ).eq('id', incident_id).execute()
+
+        self.client.table('incident_key').upsert(
+            [{'key': key, 'incident_id': incident_id, 'last_seen': incident['last_seen']}
+             for key in set(decision['keys'])],
+            on_conflict='key,incident_id', ignore_duplicates=True
+        ).execute()
+        self.client.table('incident_key').update(
+            {'last_seen': incident['last_seen']}
+        ).eq('incident_id', incident_id).execute()
+        return incident_id
+
+    def get_recent_incidents(self, limit: int = 20, min_severity_rank: int = 0) -> List[Dict]:
+        """
+        Get the most recently updated incidents with their report counts
+
+        Args:
+            limit: Maximum number of incidents
+            min_severity_rank: Only incidents at least this severe
+                (0 low, 1 medium, 2 high, 3 critical)
+
+        Returns:
+            List of incident dicts (no signature)
+        """
+        severities = ['low', 'medium', 'high', 'critical'][min_severity_rank:]
+        try:
+            query = self.client.table('incident').select(
+                'id, area, title, severity, tags, entities, item_count, first_seen, last_seen'
+            )
+            if min_severity_rank:
+                query = query.in_('severity', severities)
+            response = query.order('last_seen', desc=True).limit(limit).execute()
+            return response.data or []
+        except Exception as e:
+            print(f"Error getting incidents: {e}")
+            return []
+
+    def get_incident_news(self, incident_id: int) -> List[Dict]:
+        """Get the news items of an incident, oldest first"""
+        try:
+            response = self.client.table('news_item').select('*').eq(
+                'incident_id', incident_id
+            ).order('published_at').execute()
+            return response.data or []
+        except Exception as e:
+            print(f"Error getting incident news: {e}")
+            return []
+
+    def mark_as_alerted(self, news_id: int) -> bool:
+        """
+        Mark news item as alerted, atomically (compare-and-set)
+
+        Returns:
+            True if this call marked it, False if it was alerted already
+        """
+        try:
+            # UPDATE ... WHERE alerted = false returns only the rows it changed
+            response = self.client.table('news_item').update(
                 {'alerted': True}
-            ).eq('id', news_id).execute()
+            ).eq('id', news_id).eq('alerted', False).execute()
+            return bool(response.data)
         except Exception as e:
             print(f"Error marking as alerted: {e}")
+            # Alerting twice beats not alerting
+            return True
+
+    def clear_alerted(self, news_id: int):
+        """Undo mark_as_alerted when the alert could not be sent"""
+        try:
+            self.client.table('news_item').update(
+                {'alerted': False}
+            ).eq('id', news_id).execute()
+        except Exception as e:
+            print(f"Error clearing alerted flag: {e}")
 
     def get_recent_news(self, limit: int = 50) -> List[Dict]:
         """
@@ -149,7 +471,7 @@ class SupabaseNewsDatabase:
         try:
             response = self.client.table('news_item').select(
                 '*'
-            ).in_('severity', ['high', 'critical']).order(
+            ).in_('severity', ['high', 'critical']).eq('status', 'active').order(
                 'published_at', desc=True
             ).limit(limit).execute()
 
@@ -204,6 +526,29 @@ class SupabaseNewsDatabase:
             print(f"Error getting news by severity: {e}")
             return []
 
+    def get_news_by_area(self, area: str, limit: int = 50) -> List[Dict]:
+        """
+        Get news items of one area, newest first
+
+        Args:
+            area: Canonical area code as stored (see gazetteer.py)
+            limit: Maximum number of items
+
+        Returns:
+            List of news dictionaries
+        """
+        try:
+            response = self.client.table('news_item').select(
+                '*'
+            ).eq('area', area).order(
+                'published_at', desc=True
+            ).limit(limit).execute()
+
+            return response.data if response.data else []
+        except Exception as e:
+            print(f"Error getting news by area: {e}")
+            return []
+
     def search_news(
         self,
         query: str,
@@ -232,6 +577,349 @@ class SupabaseNewsDatabase:
             print(f"Error searching news: {e}")
             return []
 
+    def get_rows_to_rescore(
+        self,
+        current_version: str,
+        after_id: int = 0,
+        limit: int = 50
+    ) -> List[Dict]:
+        """
+        Get the next rows scored by another scorer version (keyset order)
+
+        Args:
+            current_version: Version of the current scorer
+            after_id: Last processed id
+            limit: Batch size
+
+        Returns:
+            List of news dictionaries ordered by id
+        """
+        try:
+            response = self.client.table('news_item').select(
+                'id, source, url, title, body, published_at, scorer_version'
+            ).gt('id', after_id).or_(
+                f'scorer_version.is.null,scorer_version.neq."{current_version}"'
+            ).order('id').limit(limit).execute()
+
+            return response.data if response.data else []
+        except Exception as e:
+            print(f"Error getting rows to rescore: {e}")
+            return []
+
+    def update_scoring_batch(self, updates: List[Dict]) -> int:
+        """
+        Write re-scoring results
+
+        PostgREST has no multi-row UPDATE with different values, so rows are
+        updated one by one; a failed row keeps its old version and is picked
+        up again by the next pass.
+
+        Args:
+            updates: Dicts with id, keep and the ScoringResponse fields plus
+                scorer_version. keep=false rows keep their enrichment and
+                are marked status='discarded'.
+
+        Returns:
+            Number of updated rows
+        """
+        updated = 0
+        for u in updates:
+            data = {
+                'scorer_version': u['scorer_version'],
+                'status': 'active' if u.get('keep') else 'discarded',
+                'updated_at': datetime.now().isoformat()
+            }
+            if u.get('keep'):
+                data.update({
+                    'severity': u.get('severity'),
+                    'tags': u.get('tags', []),
+                    'area': u.get('area'),
+                    'entities': u.get('entities', []),
+                    'summary': u.get('summary')
+                })
+            if u.get('relevance_score') is not None:
+                data['relevance_score'] = u['relevance_score']
+
+            try:
+                self.client.table('news_item').update(data).eq('id', u['id']).execute()
+                updated += 1
+            except Exception as e:
+                print(f"Error updating rescored news {u['id']}: {e}")
+        return updated
+
+    def get_job_checkpoint(self, job_name: str) -> Optional[Dict]:
+        """Get the saved progress of a background job"""
+        try:
+            response = self.client.table('job_checkpoint').select('*').eq(
+                'job_name', job_name
+            ).limit(1).execute()
+            return response.data[0] if response.data else None
+        except Exception as e:
+            print(f"Error getting job checkpoint: {e}")
+            return None
+
+    def save_job_checkpoint(self, job_name: str, last_id: int, scorer_version: str, processed: int):
+        """Save the progress of a background job"""
+        try:
+            self.client.table('job_checkpoint').upsert({
+                'job_name': job_name,
+                'last_id': last_id,
+                'scorer_version': scorer_version,
+                'processed': processed,
+                'updated_at': datetime.now().isoformat()
+            }).execute()
+        except Exception as e:
+            print(f"Error saving job checkpoint: {e}")
+
+    def save_scoring_label(self, news_item: Dict, verdict: Dict, scorer_version: str):
+        """
+        Store an LLM verdict as a training label (latest verdict per URL wins)
+
+        Args:
+            news_item: Scored news item
+            verdict: ScoringResponse dict (kept or discarded)
+            scorer_version: Version of the scorer that produced the verdict
+        """
+        try:
+            self.client.table('scoring_label').upsert({
+                'hash_url': self.compute_hash(news_item['url']),
+                'title': news_item.get('title', ''),
+                'body': news_item.get('body', ''),
+                'keep': bool(verdict.get('keep')),
+                'severity': verdict.get('severity') if verdict.get('keep') else None,
+                'relevance_score': verdict.get('relevance_score'),
+                'scorer_version': scorer_version,
+                'created_at': datetime.now().isoformat()
+            }).execute()
+        except Exception as e:
+            print(f"Error saving scoring label: {e}")
+
+    def _select_all(self, table: str, columns: str, page_size: int = 1000,
+                    order: str = 'hash_url') -> List[Dict]:
+        """Read every row of a table in pages (PostgREST caps each response)"""
+        rows = []
+        start = 0
+        while True:
+            response = self.client.table(table).select(columns).order(order).range(
+                start, start + page_size - 1
+            ).execute()
+            rows.extend(response.data or [])
+            if not response.data or len(response.data) < page_size:
+                return rows
+            start += page_size
+
+    def get_training_labels(self) -> List[Dict]:
+        """
+        Get labelled items for training the local classifier
+
+        Stored news without a scoring_label row (scored before labels were
+        recorded) are included as keep=true, or keep=false if a re-scoring
+        discarded them.
+
+        Returns:
+            List of dicts with title, body, keep and severity
+        """
+        try:
+            labels = self._select_all('scoring_label', 'hash_url, title, body, keep, severity')
+            labelled = {row['hash_url'] for row in labels}
+            for row in self._select_all('news_item', 'hash_url, title, body, severity, status'):
+                if row['hash_url'] not in labelled:
+                    labels.append({
+                        'hash_url': row['hash_url'],
+                        'title': row['title'],
+                        'body': row['body'],
+                        'keep': row.get('status') != 'discarded',
+                        'severity': row['severity']
+                    })
+            return labels
+        except Exception as e:
+            print(f"Error getting training labels: {e}")
+            return []
+
+    def stage_items(self, news_items: List[Dict]) -> List[Dict]:
+        """
+        Record extracted items in the staging table
+
+        Items already past scoring (scored, saved, done, discarded, or
+        failed and left to the dead-letter queue) are left untouched;
+        scored and saved ones are finished by resume.
+
+        Returns:
+            The items that still need scoring (new, staged but never scored,
+            or deferred by an earlier run), in input order
+        """
+        if not news_items:
+            return []
+        by_hash = {self.compute_hash(news['url']): news for news in news_items}
+        try:
+            # ignore_duplicates → ON CONFLICT DO NOTHING
+            self.client.table('pipeline_item').upsert(
+                [
+                    {'hash_url': hash_url, 'stage': 'extracted',
+                     'payload': json.loads(json.dumps(news, default=str))}
+                    for hash_url, news in by_hash.items()
+                ],
+                ignore_duplicates=True
+            ).execute()
+            response = self.client.table('pipeline_item').select('hash_url').in_(
+                'hash_url', list(by_hash)
+            ).in_('stage', ['extracted', 'deferred']).execute()
+            pending = {row['hash_url'] for row in response.data or []}
+            return [news for hash_url, news in by_hash.items() if hash_url in pending]
+        except Exception as e:
+            print(f"Error staging items: {e}")
+            # Without staging the run still works, it just cannot be resumed
+            return list(by_hash.values())
+
+    def update_stage(
+        self,
+        url: str,
+        stage: str,
+        payload: Optional[Dict] = None,
+        news_id: Optional[int] = None
+    ):
+        """
+        Move a staged item to its next stage
+
+        Args:
+            url: News URL
+            stage: New stage (scored, discarded, saved, done or deferred)
+            payload: Enriched news item (kept as is when None)
+            news_id: news_item id once saved
+        """
+        data = {'stage': stage, 'updated_at': datetime.now().isoformat()}
+        if payload is not None:
+            data['payload'] = json.loads(json.dumps(payload, default=str))
+        if news_id is not None:
+            data['news_id'] = news_id
+        try:
+            self.client.table('pipeline_item').update(data).eq(
+                'hash_url', self.compute_hash(url)
+            ).execute()
+        except Exception as e:
+            print(f"Error updating item stage: {e}")
+
+    def get_unfinished_items(self) -> List[Dict]:
+        """
+        Get staged items whose run stopped before they were done
+
+        Returns:
+            List of dicts with stage, news_id and news (the stored payload)
+        """
+        try:
+            response = self.client.table('pipeline_item').select(
+                'stage, payload, news_id'
+            ).in_('stage', ['extracted', 'scored', 'saved']).order('created_at').execute()
+            return [
+                {'stage': row['stage'], 'news_id': row['news_id'], 'news': row['payload']}
+                for row in response.data or []
+            ]
+        except Exception as e:
+            print(f"Error getting unfinished items: {e}")
+            return []
+
+    def get_deferred_items(self) -> List[Dict]:
+        """
+        Get the items earlier runs deferred for lack of time
+
+        Returns:
+            List of dicts with news (the stored payload) and staged_at (UTC),
+            oldest first
+        """
+        try:
+            response = self.client.table('pipeline_item').select(
+                'payload, created_at'
+            ).eq('stage', 'deferred').order('created_at').execute()
+            return [
+                {'news': row['payload'], 'staged_at': row['created_at']}
+                for row in response.data or []
+            ]
+        except Exception as e:
+            print(f"Error getting deferred items: {e}")
+            return []
+
+    def get_dead_letter(self, url: str) -> Optional[Dict]:
+        """Get the dead-letter entry of a news item, if any"""
+        try:
+            response = self.client.table('dead_letter').select('*').eq(
+                'hash_url', self.compute_hash(url)
+            ).limit(1).execute()
+            return response.data[0] if response.data else None
+        except Exception as e:
+            print(f"Error getting dead letter: {e}")
+            return None
+
+    def save_dead_letter(
+        self,
+        news_item: Dict,
+        error_class: str,
+        error: str,
+        attempts: int,
+        status: str,
+        next_attempt_at: Optional[str]
+    ):
+        """
+        Create or update the dead-letter entry of a news item
+
+        Args:
+            news_item: News item that could not be scored
+            error_class: ScoringError class of the last failure
+            error: Last error message
+            attempts: Failed attempts so far
+            status: 'pending' (will be retried) or 'failed' (given up)
+            next_attempt_at: ISO time of the next retry (None when failed)
+        """
+        try:
+            self.client.table('dead_letter').upsert({
+                'hash_url': self.compute_hash(news_item['url']),
+                'url': news_item['url'],
+                'payload': json.loads(json.dumps(news_item, default=str)),
+                'error_class': error_class,
+                'error': error,
+                'attempts': attempts,
+                'status': status,
+                'next_attempt_at': next_attempt_at,
+                'updated_at': datetime.now().isoformat()
+            }).execute()
+        except Exception as e:
+            print(f"Error saving dead letter: {e}")
+
+    def get_due_dead_letters(self, now: str, limit: int) -> List[Dict]:
+        """
+        Get pending dead-letter items whose retry time has passed
+
+        Args:
+            now: Current time (ISO format)
+            limit: Maximum number of items
+
+        Returns:
+            List of dicts with news (the stored item), attempts and error_class,
+            longest overdue first
+        """
+        try:
+            response = self.client.table('dead_letter').select(
+                'payload, attempts, error_class'
+            ).eq('status', 'pending').lte('next_attempt_at', now).order(
+                'next_attempt_at'
+            ).limit(limit).execute()
+            return [
+                {'news': row['payload'], 'attempts': row['attempts'],
+                 'error_class': row['error_class']}
+                for row in response.data or []
+            ]
+        except Exception as e:
+            print(f"Error getting due dead letters: {e}")
+            return []
+
+    def delete_dead_letter(self, url: str):
+        """Remove a news item from the dead-letter table"""
+        try:
+            self.client.table('dead_letter').delete().eq(
+                'hash_url', self.compute_hash(url)
+            ).execute()
+        except Exception as e:
+            print(f"Error deleting dead letter: {e}")
+
     def log_execution(self, stats: Dict):
         """
         Log pipeline execution statistics
@@ -248,7 +936,10 @@ class SupabaseNewsDatabase:
                 'news_kept': stats.get('kept', 0),
                 'news_discarded': stats.get('discarded', 0),
                 'errors': stats.get('errors', []),
-                'duration_seconds': stats.get('duration', 0)
+                'duration_seconds': stats.get('duration', 0),
+                'timings': stats.get('timings', {}),
+                'news_deferred': stats.get('deferred', 0),
+                'oldest_deferred_seconds': stats.get('oldest_deferred_age', 0)
             }
 
             self.client.table('execution_log').insert(data).execute()
@@ -311,10 +1002,17 @@ class SupabaseNewsDatabase:
                 exec_response, 'count'
             ) else 0
 
+            # Incidents (reports of the same event count once)
+            incident_response = self.client.table('incident').select(
+                'id', count='exact'
+            ).limit(1).execute()
+            incidents = incident_response.count if hasattr(incident_response, 'count') else 0
+
             return {
                 'total_news': total,
                 'by_severity': by_severity,
                 'by_source': by_source,
+                'incidents': incidents,
                 'recent_executions': recent_executions
             }
         except Exception as e:
@@ -323,6 +1021,7 @@ class SupabaseNewsDatabase:
                 'total_news': 0,
                 'by_severity': {},
                 'by_source': {},
+                'incidents': 0,
                 'recent_executions': 0
             }
 
@@ -0,0 +1,118 @@
+"""
+Dead-letter queue for items the scorer could not score
+Failed items are stored with their error class and attempt count and
+retried on later runs with exponential backoff, until they succeed or
+reach the attempt limit (status 'failed', kept for inspection)
+"""
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class DeadLetterQueue:
+    """
+    Retry scheduling on top of the database's dead_letter table
+
+    Retries are spread out rather than piled onto the next run: each
+    failure pushes the item's next attempt back exponentially (with
+    jitter, so items that failed together do not come back together) and
+    a run takes at most max_retries_per_run due items, oldest due first.
+    """
+
+    def __init__(
+        self,
+        db,
+        max_attempts: int = 5,
+        base_delay_minutes: float = 15,
+        max_delay_minutes: float = 24 * 60,
+        max_retries_per_run: int = 20
+    ):
+        """
+        Initialize dead-letter queue
+
+        Args:
+            db: NewsDatabase or SupabaseNewsDatabase instance
+            max_attempts: Failed scoring attempts before an item is given up
+            base_delay_minutes: Delay before the first retry
+            max_delay_minutes: Upper bound for a single delay
+            max_retries_per_run: Due items handed to one run
+        """
+        self.db = db
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay_minutes
+        self.max_delay = max_delay_minutes
+        self.max_retries_per_run = max_retries_per_run
+        # URLs handed out by due_items() that have not succeeded yet
+        self._retrying = set()
+
+    def next_attempt_at(self, attempts: int, now: datetime = None) -> Optional[datetime]:
+        """
+        When to retry an item that has failed `attempts` times
+
+        Returns:
+            Retry time, or None once max_attempts is reached
+        """
+        if attempts >= self.max_attempts:
+            return None
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        # Equal jitter: at least half the backoff, so retries never bunch at zero
+        delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+        return (now or datetime.now()) + timedelta(minutes=delay)
+
+    def record_failure(self, news_item: Dict, error_class: str, error: str) -> str:
+        """
+        Store a failed scoring attempt and schedule its retry
+
+        Args:
+            news_item: News item that could not be scored
+            error_class: ScoringError class (throttled, transient, ...)
+            error: Error message
+
+        Returns:
+            'pending' if the item will be retried, 'failed' if given up
+        """
+        url = news_item['url']
+        previous = self.db.get_dead_letter(url)
+        attempts = (previous['attempts'] if previous else 0) + 1
+        retry_at = self.next_attempt_at(attempts)
+        status = 'pending' if retry_at else 'failed'
+
+        self.db.save_dead_letter(
+            news_item, error_class, error, attempts, status,
+            retry_at.isoformat() if retry_at else None
+        )
+        # Keeps normal runs from scoring it again; the queue decides when
+        self.db.update_stage(url, 'failed')
+        self._retrying.discard(url)
+
+        if status == 'failed':
+            logger.warning(f"☠️ Giving up on {url} after {attempts} attempts: [{error_class}] {error}")
+        else:
+            logger.info(f"Dead-lettered {url} (attempt {attempts}, retry at {retry_at:%Y-%m-%d %H:%M})")
+        return status
+
+    def due_items(self) -> List[Dict]:
+        """
+        Take the items whose retry time has come (at most max_retries_per_run)
+
+        Returns:
+            News items to score again
+        """
+        if not self.max_retries_per_run:
+            return []
+        rows = self.db.get_due_dead_letters(datetime.now().isoformat(), self.max_retries_per_run)
+        items = [row['news'] for row in rows]
+        self._retrying.update(item['url'] for item in items)
+        if items:
+            logger.info(f"🔁 Retrying {len(items)} dead-lettered items")
+        return items
+
+    def resolve(self, url: str):
+        """Drop an item from the queue once it has a verdict"""
+        if url in self._retrying:
+            self._retrying.discard(url)
+            self.db.delete_dead_letter(url)
@@ -0,0 +1,240 @@
+"""
+Pooled SMTP delivery for email alerts
+SMTPTransport keeps one authenticated session open and reuses it for every
+message; EmailSender queues messages and sends them from a background
+thread over that session, so SMTP latency never stalls the pipeline.
+"""
+import logging
+import smtplib
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from email.message import Message
+from typing import Dict, Optional
+
+from metrics import METRICS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SMTPTransport:
+    """
+    One SMTP session (connect + STARTTLS + login) reused across messages
+
+    The session is opened on the first send and reopened after a failure;
+    a session idle for longer than idle_timeout is closed and reopened,
+    since servers drop idle clients anyway.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 587,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = True,
+        timeout: float = 30,
+        idle_timeout: float = 120
+    ):
+        """
+        Initialize SMTP transport
+
+        Args:
+            host: SMTP server host
+            port: SMTP server port
+            user: SMTP username (None = no login)
+            password: SMTP password
+            starttls: Upgrade the session with STARTTLS
+            timeout: Socket timeout in seconds
+            idle_timeout: Seconds a session may stay unused before it is reopened
+        """
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self._server = None
+        self._last_used = 0.0
+        self.connects = 0
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.user:
+                server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self.connects += 1
+        METRICS.inc('etl_smtp_connects_total')
+        logger.debug(f"SMTP session opened to {self.host}:{self.port}")
+
+    def send(self, msg: Message):
+        """
+        Send one message over the open session (opening it if needed)
+
+        Raises:
+            smtplib.SMTPException, OSError: If sending failed; the session
+                is closed so the next send reconnects
+        """
+        if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self.close()
+        if self._server is None:
+            self._connect()
+        try:
+            self._server.send_message(msg)
+        except Exception:
+            self.reset()
+            raise
+        self._last_used = time.monotonic()
+
+    def reset(self):
+        """Drop the session without the QUIT handshake (after an error)"""
+        if self._server is not None:
+            try:
+                self._server.close()
+            finally:
+                self._server = None
+
+    def close(self):
+        """Close the session politely"""
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            finally:
+                self.reset()
+
+
+class EmailSender:
+    """
+    Background delivery of email messages over one SMTPTransport
+
+    Messages queued while the thread is busy are sent back to back over the
+    same session. A message that fails is retried with a fresh connection
+    (linear backoff) up to max_attempts before it is given up and logged.
+    """
+
+    def __init__(self, transport: SMTPTransport, max_attempts: int = 3, retry_delay: float = 2.0):
+        """
+        Initialize email sender
+
+        Args:
+            transport: Session used for every message
+            max_attempts: Sending attempts per message
+            retry_delay: Seconds before the first retry (grows linearly)
+        """
+        self.transport = transport
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._closed = False
+        self._thread = None
+        self.stats = {'sent': 0, 'failed': 0, 'retried': 0, 'batches': 0}
+
+    def submit(self, msg: Message) -> Future:
+        """
+        Queue a message; returns immediately
+
+        Returns:
+            Future resolved (True) once the message is sent, or failed with
+            the last error once it is given up. Cancelling it while the
+            message is still queued drops the message.
+        """
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("EmailSender is closed")
+            if self._thread is None:
+                # Started on first use: processes that never email run no thread
+                self._thread = threading.Thread(target=self._run, name='email-sender', daemon=True)
+                self._thread.start()
+            self._queue.append((msg, future))
+            self._pending += 1
+            self._condition.notify_all()
+        return future
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    # Wake up at the idle timeout to close an unused session
+                    if not self._condition.wait(timeout=self.transport.idle_timeout):
+                        self.transport.close()
+                if not self._queue:
+                    break
+                batch = list(self._queue)
+                self._queue.clear()
+
+            self.stats['batches'] += 1
+            for msg, future in batch:
+                self._deliver(msg, future)
+                with self._condition:
+                    self._pending -= 1
+                    self._condition.notify_all()
+
+        self.transport.close()
+
+    def _deliver(self, msg: Message, future: Future):
+        # A caller that gave up waiting cancels the future; once running it
+        # can no longer be cancelled, so set_result/set_exception are safe
+        if not future.set_running_or_notify_cancel():
+            logger.debug(f"Email cancelled before sending: {msg['Subject']}")
+            return
+        for attempt in range(1, self.max_attempts + 1):
+            started = time.monotonic()
+            try:
+                self.transport.send(msg)
+                METRICS.observe('etl_email_send_seconds', time.monotonic() - started)
+                METRICS.inc('etl_emails_total', outcome='sent')
+                self.stats['sent'] += 1
+                logger.info(f"Email alert sent: {msg['Subject']}")
+                future.set_result(True)
+                return
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    METRICS.inc('etl_emails_total', outcome='failed')
+                    self.stats['failed'] += 1
+                    logger.error(f"Error sending email alert after {attempt} attempts: {e}")
+                    future.set_exception(e)
+                    return
+                self.stats['retried'] += 1
+                logger.warning(f"Email send failed ({e}); reconnecting, attempt {attempt + 1}")
+                time.sleep(self.retry_delay * attempt)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued message was sent or given up
+
+        Returns:
+            True if the queue drained within timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout: float = 30) -> Dict:
+        """
+        Send what is queued, stop the thread and close the session
+
+        Returns:
+            Delivery counters (sent, failed, retried, batches)
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning(f"{self._pending} email alerts still queued at shutdown")
+        return dict(self.stats)
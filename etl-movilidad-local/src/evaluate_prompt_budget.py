@@ -0,0 +1,133 @@
+"""
+Evaluate prompt token budgets against labelled news items
+Reports average tokens per item and scoring accuracy for each budget, so
+prompt compression savings can be checked against quality
+
+Usage:
+    python evaluate_prompt_budget.py labelled.jsonl --budgets 150 300 full
+
+Each line of the labelled file is a news item (source, title, body,
+published_at, url) plus the expected `keep` and, for kept items, `severity`.
+"""
+import argparse
+import os
+import sys
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from adk_scorer_v3 import ADKScorerV3
+from local_classifier import load_labelled_items
+from rate_limiter import ScoringError
+
+
+def evaluate_budget(scorer: ADKScorerV3, items: List[Dict], budget: Optional[int]) -> Dict:
+    """
+    Score all items with a given body token budget
+
+    Args:
+        scorer: Configured scorer (its budget is overridden)
+        items: Labelled news items
+        budget: Body token budget (None = full body)
+
+    Returns:
+        Dict with token averages, accuracy and per-item predictions
+    """
+    scorer.body_token_budget = budget
+    scorer.reset_run_stats()
+
+    predictions = []
+    keep_correct = 0
+    severity_total = 0
+    severity_correct = 0
+    failed = 0
+
+    for item in items:
+        try:
+            result = scorer.score(item)
+        except ScoringError:
+            failed += 1
+            predictions.append(None)
+            continue
+
+        predicted_keep = result is not None
+        predicted_severity = result.get('severity') if result else None
+        predictions.append((predicted_keep, predicted_severity))
+
+        if predicted_keep == bool(item.get('keep')):
+            keep_correct += 1
+        if item.get('keep') and predicted_keep:
+            severity_total += 1
+            if predicted_severity == item.get('severity'):
+                severity_correct += 1
+
+    run_stats = scorer.get_run_stats()
+    metered = run_stats['metered_calls'] or 1
+    scored = len(items) - failed
+
+    return {
+        'budget': budget,
+        'items': len(items),
+        'failed': failed,
+        'avg_input_tokens': run_stats['input_tokens'] / metered,
+        'avg_output_tokens': run_stats['output_tokens'] / metered,
+        'keep_accuracy': keep_correct / scored if scored else 0.0,
+        'severity_accuracy': severity_correct / severity_total if severity_total else 0.0,
+        'predictions': predictions
+    }
+
+
+def agreement(a: List, b: List) -> float:
+    """Fraction of items where two runs gave the same keep/severity verdict"""
+    pairs = [(x, y) for x, y in zip(a, b) if x is not None and y is not None]
+    if not pairs:
+        return 0.0
+    return sum(1 for x, y in pairs if x == y) / len(pairs)
+
+
+def main():
+    """Main entry point"""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('labelled_file', help='JSONL file with labelled news items')
+    parser.add_argument(
+        '--budgets', nargs='+', default=['150', '300', 'full'],
+        help='Body token budgets to compare ("full" = no budget)'
+    )
+    args = parser.parse_args()
+
+    project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
+    if not project_id:
+        print("GOOGLE_CLOUD_PROJECT environment variable required")
+        sys.exit(1)
+
+    items = load_labelled_items(args.labelled_file)
+    scorer = ADKScorerV3(
+        project_id=project_id,
+        location=os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
+        model_name=os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+    )
+
+    budgets = [None if b == 'full' else int(b) for b in args.budgets]
+    reports = [evaluate_budget(scorer, items, budget) for budget in budgets]
+    reference = reports[-1]['predictions']
+
+    print("\n" + "="*78)
+    print(f"PROMPT BUDGET EVALUATION ({len(items)} items, model {scorer.model_name})")
+    print("="*78)
+    print(f"{'Budget':>8} {'In tok':>8} {'Out tok':>8} {'Keep acc':>9} "
+          f"{'Sev acc':>8} {'Agree*':>7} {'Failed':>7}")
+    for report in reports:
+        label = 'full' if report['budget'] is None else str(report['budget'])
+        print(
+            f"{label:>8} {report['avg_input_tokens']:>8.0f} {report['avg_output_tokens']:>8.0f} "
+            f"{report['keep_accuracy']:>9.1%} {report['severity_accuracy']:>8.1%} "
+            f"{agreement(report['predictions'], reference):>7.1%} {report['failed']:>7}"
+        )
+    print(f"* agreement with the last budget ({args.budgets[-1]})")
+    print("="*78 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,29 @@ import feedparser
 from bs4 import BeautifulSoup
 from datetime import datetime
 from dateutil import parser as date_parser
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 import logging
 
+from metrics import extract_timed
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bodies are kept whole up to this size; the scorer fits them into its
+# prompt token budget (see prompts/token_budget.py)
+MAX_BODY_CHARS = 8000
+
+# Paginated archive listings used by the backfill job ({page} starts at 1);
+# adjust to the actual website structure
+ARCHIVE_PAGES = {
+    'Metro RSS': "https://www.metrodemedellin.gov.co/al-dia/noticias?page={page}",
+    'Alcaldía': (
+        "https://www.medellin.gov.co/es/sala-de-prensa/noticias/"
+        "?_sft_category=secretaria-de-movilidad&sf_paged={page}"
+    ),
+    'AMVA': "https://www.metropol.gov.co/Paginas/Noticias.aspx?page={page}",
+}
+
 
 class NewsExtractor:
     """Multi-source news extractor for Medellín mobility news"""
@@ -23,33 +40,26 @@ class NewsExtractor:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
 
+    def source_tasks(self) -> List[Tuple[str, Callable[[], List[Dict]]]]:
+        """One (source name, extract function) pair per source"""
+        return [
+            ('Metro RSS', self.extract_metro_rss),
+            ('Alcaldía', self.extract_alcaldia_web),
+            # AMVA (Área Metropolitana del Valle de Aburrá)
+            ('AMVA', self.extract_amva_web),
+        ]
+
     def extract_all(self) -> List[Dict]:
         """Extract from all sources"""
         all_news = []
 
-        # Source 1: Metro de Medellín RSS
-        try:
-            metro_news = self.extract_metro_rss()
-            all_news.extend(metro_news)
-            logger.info(f"Extracted {len(metro_news)} news from Metro RSS")
-        except Exception as e:
-            logger.error(f"Error extracting Metro RSS: {e}")
-
-        # Source 2: Alcaldía de Medellín
-        try:
-            alcaldia_news = self.extract_alcaldia_web()
-            all_news.extend(alcaldia_news)
-            logger.info(f"Extracted {len(alcaldia_news)} news from Alcaldía")
-        except Exception as e:
-            logger.error(f"Error extracting Alcaldía: {e}")
-
-        # Source 3: AMVA (Área Metropolitana del Valle de Aburrá)
-        try:
-            amva_news = self.extract_amva_web()
-            all_news.extend(amva_news)
-            logger.info(f"Extracted {len(amva_news)} news from AMVA")
-        except Exception as e:
-            logger.error(f"Error extracting AMVA: {e}")
+        for name, extract in self.source_tasks():
+            try:
+                news = extract_timed(name, extract)
+                all_news.extend(news)
+                logger.info(f"Extracted {len(news)} news from {name}")
+            except Exception as e:
+                logger.error(f"Error extracting {name}: {e}")
 
         return all_news
 
@@ -60,69 +70,19 @@ class NewsExtractor:
         try:
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
-
-            feed = feedparser.parse(response.content)
-            news_items = []
-
-            for entry in feed.entries[:20]:  # Limit to 20 most recent
-                try:
-                    news_items.append(self._normalize_news({
-                        'source': 'Metro de Medellín',
-                        'url': entry.link,
-                        'title': entry.title,
-                        'body': self._clean_html(entry.get('summary', entry.get('description', ''))),
-                        'published_at': self._parse_date(entry.get('published', entry.get('updated')))
-                    }))
-                except Exception as e:
-                    logger.warning(f"Error parsing Metro entry: {e}")
-                    continue
-
-            return news_items
+            return self._parse_metro_feed(response.content, limit=20)  # 20 most recent
         except Exception as e:
             logger.error(f"Error fetching Metro RSS: {e}")
             return []
 
     def extract_alcaldia_web(self) -> List[Dict]:
         """Extract news from Alcaldía de Medellín website"""
-        # Note: This is a simplified version. Adjust selectors based on actual website structure
         url = "https://www.medellin.gov.co/es/sala-de-prensa/noticias/?_sft_category=secretaria-de-movilidad"
 
         try:
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-            news_items = []
-
-            # Example selectors - adjust to actual website structure
-            articles = soup.select('article.noticia, div.news-item')[:15]
-
-            for article in articles:
-                try:
-                    title_elem = article.select_one('h2, h3, .title')
-                    link_elem = article.select_one('a')
-                    summary_elem = article.select_one('.summary, .excerpt, p')
-                    date_elem = article.select_one('.date, time')
-
-                    if not title_elem or not link_elem:
-                        continue
-
-                    url_full = link_elem.get('href', '')
-                    if not url_full.startswith('http'):
-                        url_full = f"https://www.medellin.gov.co{url_full}"
-
-                    news_items.append(self._normalize_news({
-                        'source': 'Alcaldía de Medellín',
-                        'url': url_full,
-                        'title': title_elem.get_text(strip=True),
-                        'body': summary_elem.get_text(strip=True) if summary_elem else '',
-                        'published_at': self._parse_date(date_elem.get_text() if date_elem else None)
-                    }))
-                except Exception as e:
-                    logger.warning(f"Error parsing Alcaldía article: {e}")
-                    continue
-
-            return news_items
+            return self._parse_alcaldia_page(response.content, limit=15)
         except Exception as e:
             logger.error(f"Error fetching Alcaldía website: {e}")
             return []
@@ -134,50 +94,169 @@ class NewsExtractor:
         try:
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-            news_items = []
-
-            # Example selectors - adjust to actual website structure
-            articles = soup.select('div.noticia, article')[:15]
-
-            for article in articles:
-                try:
-                    title_elem = article.select_one('h2, h3, .titulo')
-                    link_elem = article.select_one('a')
-                    summary_elem = article.select_one('.resumen, p')
-                    date_elem = article.select_one('.fecha, time')
-
-                    if not title_elem or not link_elem:
-                        continue
-
-                    url_full = link_elem.get('href', '')
-                    if not url_full.startswith('http'):
-                        url_full = f"https://www.metropol.gov.co{url_full}"
-
-                    news_items.append(self._normalize_news({
-                        'source': 'AMVA',
-                        'url': url_full,
-                        'title': title_elem.get_text(strip=True),
-                        'body': summary_elem.get_text(strip=True) if summary_elem else '',
-                        'published_at': self._parse_date(date_elem.get_text() if date_elem else None)
-                    }))
-                except Exception as e:
-                    logger.warning(f"Error parsing AMVA article: {e}")
-                    continue
-
-            return news_items
+            return self._parse_amva_page(response.content, limit=15)
         except Exception as e:
             logger.error(f"Error fetching AMVA website: {e}")
             return []
 
+    def archive_tasks(self) -> List[Tuple[str, Callable[[int], List[Dict]]]]:
+        """One (source name, fetch page function) pair per source archive"""
+        return [
+            ('Metro RSS', lambda page: self._fetch_archive_page(
+                ARCHIVE_PAGES['Metro RSS'], page, self._parse_metro_feed)),
+            ('Alcaldía', lambda page: self._fetch_archive_page(
+                ARCHIVE_PAGES['Alcaldía'], page, self._parse_alcaldia_page)),
+            ('AMVA', lambda page: self._fetch_archive_page(
+                ARCHIVE_PAGES['AMVA'], page, self._parse_amva_page)),
+        ]
+
+    def iter_archive(
+        self,
+        name: str,
+        start_page: int = 1,
+        max_pages: Optional[int] = None
+    ) -> Iterator[Tuple[int, List[Dict]]]:
+        """
+        Walk a source archive one page at a time, newest first
+
+        Only the current page is held in memory. The walk ends at the first
+        empty page, or at a page repeating the previous one (sites that
+        serve their last page for any page number past the end).
+
+        Args:
+            name: Source name, as in archive_tasks()
+            start_page: First page to fetch (1 = newest)
+            max_pages: Stop after this many pages (None = until the end)
+
+        Yields:
+            (page number, news items of that page)
+
+        Raises:
+            requests.RequestException: If a page cannot be fetched
+        """
+        fetch_page = dict(self.archive_tasks())[name]
+        previous_urls = None
+        page = start_page
+        while max_pages is None or page < start_page + max_pages:
+            items = fetch_page(page)
+            urls = {news['url'] for news in items}
+            if not urls or urls == previous_urls:
+                return
+            yield page, items
+            previous_urls = urls
+            page += 1
+
+    def _fetch_archive_page(
+        self,
+        url_template: str,
+        page: int,
+        parse: Callable[..., List[Dict]]
+    ) -> List[Dict]:
+        """Fetch and parse one archive page (a missing page is an empty one)"""
+        response = self.session.get(url_template.format(page=page), timeout=20)
+        if response.status_code == 404:
+            return []
+        response.raise_for_status()
+        return parse(response.content)
+
+    def _parse_metro_feed(self, content: bytes, limit: Optional[int] = None) -> List[Dict]:
+        """Parse the entries of a Metro RSS document"""
+        feed = feedparser.parse(content)
+        news_items = []
+
+        for entry in feed.entries[:limit]:
+            try:
+                news_items.append(self._normalize_news({
+                    'source': 'Metro de Medellín',
+                    'url': entry.link,
+                    'title': entry.title,
+                    'body': self._clean_html(entry.get('summary', entry.get('description', ''))),
+                    'published_at': self._parse_date(entry.get('published', entry.get('updated')))
+                }))
+            except Exception as e:
+                logger.warning(f"Error parsing Metro entry: {e}")
+                continue
+
+        return news_items
+
+    def _parse_alcaldia_page(self, content: bytes, limit: Optional[int] = None) -> List[Dict]:
+        """Parse the articles of an Alcaldía news listing"""
+        # Note: This is a simplified version. Adjust selectors based on actual website structure
+        soup = BeautifulSoup(content, 'html.parser')
+        news_items = []
+
+        # Example selectors - adjust to actual website structure
+        articles = soup.select('article.noticia, div.news-item')[:limit]
+
+        for article in articles:
+            try:
+                title_elem = article.select_one('h2, h3, .title')
+                link_elem = article.select_one('a')
+                summary_elem = article.select_one('.summary, .excerpt, p')
+                date_elem = article.select_one('.date, time')
+
+                if not title_elem or not link_elem:
+                    continue
+
+                url_full = link_elem.get('href', '')
+                if not url_full.startswith('http'):
+                    url_full = f"https://www.medellin.gov.co{url_full}"
+
+                news_items.append(self._normalize_news({
+                    'source': 'Alcaldía de Medellín',
+                    'url': url_full,
+                    'title': title_elem.get_text(strip=True),
+                    'body': summary_elem.get_text(strip=True) if summary_elem else '',
+                    'published_at': self._parse_date(date_elem.get_text() if date_elem else None)
+                }))
+            except Exception as e:
+                logger.warning(f"Error parsing Alcaldía article: {e}")
+                continue
+
+        return news_items
+
+    def _parse_amva_page(self, content: bytes, limit: Optional[int] = None) -> List[Dict]:
+        """Parse the articles of an AMVA news listing"""
+        soup = BeautifulSoup(content, 'html.parser')
+        news_items = []
+
+        # Example selectors - adjust to actual website structure
+        articles = soup.select('div.noticia, article')[:limit]
+
+        for article in articles:
+            try:
+                title_elem = article.select_one('h2, h3, .titulo')
+                link_elem = article.select_one('a')
+                summary_elem = article.select_one('.resumen, p')
+                date_elem = article.select_one('.fecha, time')
+
+                if not title_elem or not link_elem:
+                    continue
+
+                url_full = link_elem.get('href', '')
+                if not url_full.startswith('http'):
+                    url_full = f"https://www.metropol.gov.co{url_full}"
+
+                news_items.append(self._normalize_news({
+                    'source': 'AMVA',
+                    'url': url_full,
+                    'title': title_elem.get_text(strip=True),
+                    'body': summary_elem.get_text(strip=True) if summary_elem else '',
+                    'published_at': self._parse_date(date_elem.get_text() if date_elem else None)
+                }))
+            except Exception as e:
+                logger.warning(f"Error parsing AMVA article: {e}")
+                continue
+
+        return news_items
+
     def _normalize_news(self, news: Dict) -> Dict:
         """Normalize news item structure"""
         return {
             'source': news['source'],
             'url': news['url'],
             'title': news['title'][:500],  # Limit title length
-            'body': news['body'][:2000],   # Limit body length
+            'body': news['body'][:MAX_BODY_CHARS],
             'published_at': news['published_at']
         }
 
@@ -185,7 +264,7 @@ class NewsExtractor:
         """Remove HTML tags and clean text"""
         soup = BeautifulSoup(html_text, 'html.parser')
         text = soup.get_text(separator=' ', strip=True)
-        return text[:2000]  # Limit length
+        return text[:MAX_BODY_CHARS]
 
     def _parse_date(self, date_str: Optional[str]) -> str:
         """Parse date string to ISO format"""
@@ -4,15 +4,69 @@ More reliable than Web Scraper with custom pageFunction
 """
 import os
 import logging
-from typing import List, Dict, Optional
+from functools import partial
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 from datetime import datetime
-from apify_client import ApifyClient
 from dateutil import parser as date_parser
 import re
 
+from metrics import extract_timed
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bodies are kept whole up to this size; the scorer fits them into its
+# prompt token budget (see prompts/token_budget.py)
+MAX_BODY_CHARS = 8000
+
+# Sources crawled with the Website Content Crawler
+APIFY_SOURCES = [
+    {
+        "name": "Metro de Medellín",
+        "url": "https://www.metrodemedellin.gov.co/al-dia/noticias",
+        "selectors": {
+            "article": "article, .noticia, .news-item",
+            "title": "h2, h3, .title",
+            "link": "a",
+            "summary": "p, .summary",
+            "date": "time, .date"
+        }
+    },
+    {
+        "name": "Alcaldía de Medellín",
+        "url": "https://www.medellin.gov.co/es/sala-de-prensa/noticias/",
+        "selectors": {
+            "article": "article, .news-item",
+            "title": "h2, h3",
+            "link": "a",
+            "summary": "p",
+            "date": "time, .date"
+        }
+    },
+    {
+        "name": "El Colombiano - Movilidad",
+        "url": "https://www.elcolombiano.com/antioquia/movilidad",
+        "selectors": {
+            "article": "article, .article",
+            "title": "h2, h3, .headline",
+            "link": "a",
+            "summary": "p, .description",
+            "date": "time, .date"
+        }
+    },
+    {
+        "name": "Minuto30 - Medellín",
+        "url": "https://www.minuto30.com/categoria/medellin/",
+        "selectors": {
+            "article": "article, .post",
+            "title": "h2, h3, .entry-title",
+            "link": "a",
+            "summary": "p, .excerpt",
+            "date": "time, .published"
+        }
+    }
+]
+
 
 class SimpleApifyExtractor:
     """
@@ -27,67 +81,29 @@ class SimpleApifyExtractor:
         if not self.api_token:
             raise ValueError("APIFY_API_TOKEN not found")
 
+        # Imported here so direct scraping never loads the Apify SDK
+        from apify_client import ApifyClient
         self.client = ApifyClient(self.api_token)
         logger.info("✓ Apify client initialized")
 
+    def source_tasks(self) -> List[Tuple[str, Callable[[], List[Dict]]]]:
+        """One (source name, extract function) pair per source"""
+        return [
+            (source_config['name'], partial(self.extract_source, source_config))
+            for source_config in APIFY_SOURCES
+        ]
+
     def extract_all(self) -> List[Dict]:
         """Extract from all sources"""
         all_news = []
 
-        sources = [
-            {
-                "name": "Metro de Medellín",
-                "url": "https://www.metrodemedellin.gov.co/al-dia/noticias",
-                "selectors": {
-                    "article": "article, .noticia, .news-item",
-                    "title": "h2, h3, .title",
-                    "link": "a",
-                    "summary": "p, .summary",
-                    "date": "time, .date"
-                }
-            },
-            {
-                "name": "Alcaldía de Medellín",
-                "url": "https://www.medellin.gov.co/es/sala-de-prensa/noticias/",
-                "selectors": {
-                    "article": "article, .news-item",
-                    "title": "h2, h3",
-                    "link": "a",
-                    "summary": "p",
-                    "date": "time, .date"
-                }
-            },
-            {
-                "name": "El Colombiano - Movilidad",
-                "url": "https://www.elcolombiano.com/antioquia/movilidad",
-                "selectors": {
-                    "article": "article, .article",
-                    "title": "h2, h3, .headline",
-                    "link": "a",
-                    "summary": "p, .description",
-                    "date": "time, .date"
-                }
-            },
-            {
-                "name": "Minuto30 - Medellín",
-                "url": "https://www.minuto30.com/categoria/medellin/",
-                "selectors": {
-                    "article": "article, .post",
-                    "title": "h2, h3, .entry-title",
-                    "link": "a",
-                    "summary": "p, .excerpt",
-                    "date": "time, .published"
-                }
-            }
-        ]
-
-        for source_config in sources:
+        for name, extract in self.source_tasks():
             try:
-                news = self.extract_source(source_config)
+                news = extract_timed(name, extract)
                 all_news.extend(news)
-                logger.info(f"✓ Extracted {len(news)} from {source_config['name']}")
+                logger.info(f"✓ Extracted {len(news)} from {name}")
             except Exception as e:
-                logger.error(f"✗ Error extracting {source_config['name']}: {e}")
+                logger.error(f"✗ Error extracting {name}: {e}")
 
         return all_news
 
@@ -187,7 +203,7 @@ class SimpleApifyExtractor:
                             'source': source_config['name'],
                             'url': unique_url,  # ← Ahora cada noticia tiene URL única
                             'title': current_title[:500],
-                            'body': body_text[:2000],
+                            'body': body_text[:MAX_BODY_CHARS],
                             'published_at': datetime.now().isoformat()
                         })
 
@@ -211,7 +227,7 @@ class SimpleApifyExtractor:
                 'source': source_config['name'],
                 'url': unique_url,
                 'title': current_title[:500],
-                'body': body_text[:2000],
+                'body': body_text[:MAX_BODY_CHARS],
                 'published_at': datetime.now().isoformat()
             })
 
@@ -246,6 +262,28 @@ class HybridApifyExtractor:
             from extractors import NewsExtractor
             self.fallback_extractor = NewsExtractor()
 
+    def source_tasks(self) -> List[Tuple[str, Callable[[], List[Dict]]]]:
+        """Per-source extract functions of the active extractor"""
+        if self.use_apify:
+            return self.apify_extractor.source_tasks()
+        return self.fallback_extractor.source_tasks()
+
+    def _archive_extractor(self):
+        """Direct-scraping extractor used for archives (Apify only reads live pages)"""
+        if not hasattr(self, 'fallback_extractor'):
+            from extractors import NewsExtractor
+            self.fallback_extractor = NewsExtractor()
+        return self.fallback_extractor
+
+    def archive_tasks(self) -> List[Tuple[str, Callable[[int], List[Dict]]]]:
+        """Per-source archive page functions (always direct scraping)"""
+        return self._archive_extractor().archive_tasks()
+
+    def iter_archive(self, name: str, start_page: int = 1,
+                     max_pages: Optional[int] = None) -> Iterator[Tuple[int, List[Dict]]]:
+        """Walk a source archive page by page (see NewsExtractor.iter_archive)"""
+        return self._archive_extractor().iter_archive(name, start_page, max_pages)
+
     def extract_all(self) -> List[Dict]:
         """Extract using Apify or fallback"""
         if self.use_apify:
@@ -0,0 +1,153 @@
+"""
+Component factories configured from environment variables
+Build the database, scorer (with its local classifier and gazetteer
+stages) and incident index the way the pipeline does. Unlike main.py this
+module has no import-time side effects (no logs/ directory or log file),
+so offline tools (re-scoring, backfill, training) can use it.
+"""
+import logging
+import os
+from typing import Optional
+
+from backends import load_backend
+from gazetteer import Gazetteer
+from incidents import IncidentIndex
+from rate_limiter import RetryPolicy
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def build_database(use_supabase: bool = False):
+    """
+    Create the news database backend
+
+    Args:
+        use_supabase: Use Supabase instead of SQLite
+
+    Returns:
+        SupabaseNewsDatabase or SQLite NewsDatabase instance
+    """
+    if use_supabase:
+        logger.info("Using Supabase database")
+        return load_backend('database', 'supabase')()
+
+    logger.info("Using SQLite database")
+    return load_backend('database', 'sqlite')()
+
+
+def build_incident_index(db) -> Optional[IncidentIndex]:
+    """
+    Create the incident index configured from environment variables
+
+    Returns:
+        IncidentIndex, or None when INCIDENT_CLUSTERING is false
+    """
+    if os.getenv("INCIDENT_CLUSTERING", "true").lower() != "true":
+        return None
+    return IncidentIndex(
+        db,
+        window_hours=float(os.getenv("INCIDENT_WINDOW_HOURS", "6")),
+        threshold=float(os.getenv("INCIDENT_MATCH_THRESHOLD", "0.55"))
+    )
+
+
+def build_adk_scorer(project_id: str, model_name: str, runner=None, label_sink=None):
+    """Create an ADKScorerV3 configured from environment variables"""
+    return load_backend('scorer', 'adk')(
+        project_id=project_id,
+        location=os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
+        model_name=model_name,
+        requests_per_minute=float(os.getenv("VERTEX_RPM_LIMIT", "60")),
+        tokens_per_minute=float(os.getenv("VERTEX_TPM_LIMIT", "120000")),
+        max_concurrency=int(os.getenv("SCORER_MAX_CONCURRENCY", "16")),
+        retry_policy=RetryPolicy(
+            max_attempts=int(os.getenv("SCORER_MAX_ATTEMPTS", "4"))
+        ),
+        body_token_budget=int(os.getenv("PROMPT_BODY_TOKEN_BUDGET", "300")),
+        runner=runner,
+        streaming=os.getenv("SCORER_STREAMING", "false").lower() == "true",
+        call_timeout=float(os.getenv("SCORER_CALL_TIMEOUT", "60")) or None,
+        hedge=os.getenv("SCORER_HEDGE", "false").lower() == "true",
+        hedge_max_ratio=float(os.getenv("SCORER_HEDGE_MAX_RATIO", "0.1")),
+        hedge_min_delay=float(os.getenv("SCORER_HEDGE_MIN_DELAY", "0.5")),
+        label_sink=label_sink
+    )
+
+
+def build_scorer(project_id: str = None, use_mock_adk: bool = False, label_sink=None):
+    """
+    Create the scorer selected by the environment
+
+    Args:
+        project_id: Google Cloud project ID for Vertex AI
+        use_mock_adk: Use mock ADK for testing (no API calls)
+        label_sink: Receives every LLM verdict (see ADKScorerV3)
+
+    Returns:
+        MockADKScorer, ADKScorerV3 (real or fake backend) or CascadeScorer
+    """
+    if use_mock_adk:
+        return load_backend('scorer', 'mock')()
+
+    if os.getenv("USE_FAKE_LLM", "false").lower() == "true":
+        logger.warning("Using FakeRunner LLM backend - for load testing only!")
+        return build_adk_scorer(
+            project_id or "offline", "fake-llm", runner=load_backend('llm_runner', 'fake').from_env(), label_sink=label_sink
+        )
+
+    if not project_id:
+        raise ValueError("project_id required when not using mock ADK")
+
+    default_model = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+    if os.getenv("SCORER_CASCADE", "false").lower() == "true":
+        band = os.getenv("CASCADE_UNCERTAINTY_BAND", "0.35,0.65").split(",")
+        return load_backend('scorer', 'cascade')(
+            fast_scorer=build_adk_scorer(
+                project_id, os.getenv("GEMINI_FAST_MODEL", "gemini-2.0-flash-lite"),
+                label_sink=label_sink
+            ),
+            strong_scorer=build_adk_scorer(
+                project_id, os.getenv("GEMINI_STRONG_MODEL", default_model),
+                label_sink=label_sink
+            ),
+            uncertainty_band=(float(band[0]), float(band[1]))
+        )
+    return build_adk_scorer(project_id, default_model, label_sink=label_sink)
+
+
+def with_local_classifier(scorer):
+    """
+    Put the local classifier in front of a scorer when USE_LOCAL_CLASSIFIER
+    is set and a trained model exists (see train_local_classifier.py)
+    """
+    if os.getenv("USE_LOCAL_CLASSIFIER", "false").lower() != "true":
+        return scorer
+
+    model_path = os.getenv("LOCAL_CLASSIFIER_PATH", "data/local_classifier.npz")
+    if not os.path.exists(model_path):
+        logger.warning(f"Local classifier not found at {model_path}; scoring everything with the LLM")
+        return scorer
+
+    return load_backend('scorer', 'local_first')(
+        classifier=load_backend('classifier', 'local').load(model_path),
+        llm_scorer=scorer,
+        threshold=float(os.getenv("LOCAL_CLASSIFIER_THRESHOLD", "0.9")),
+        allow_local_keep=os.getenv("LOCAL_CLASSIFIER_LOCAL_KEEPS", "false").lower() == "true"
+    )
+
+
+def with_gazetteer(scorer):
+    """
+    Put the gazetteer stage around a scorer (GAZETTEER_MODE: off by
+    default, canonicalize, hints or replace; see gazetteer_scorer.py)
+    """
+    mode = os.getenv("GAZETTEER_MODE", "off").lower()
+    if mode == "off":
+        return scorer
+
+    return load_backend('scorer', 'gazetteer')(
+        gazetteer=Gazetteer.from_prompt(),
+        scorer=scorer,
+        mode=mode
+    )
@@ -0,0 +1,265 @@
+"""
+Deterministic fake LLM backend for load and latency testing
+Drop-in replacement for the ADK Runner used by ADKScorerV3, with
+configurable latency distributions, error/429/malformed-JSON rates and
+token counts. Seedable, so benchmarks are reproducible offline.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import re
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+from prompts.system_prompt import SYSTEM_PROMPT
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FakeResourceExhausted(Exception):
+    """Mimics a Vertex AI 429 RESOURCE_EXHAUSTED error"""
+    code = 429
+
+    def __init__(self):
+        super().__init__("429 RESOURCE_EXHAUSTED. Quota exceeded (fake backend)")
+
+
+class FakeServerError(Exception):
+    """Mimics a Vertex AI 503 UNAVAILABLE error"""
+    code = 503
+
+    def __init__(self):
+        super().__init__("503 UNAVAILABLE. The service is currently unavailable (fake backend)")
+
+
+class FakeSessionService:
+    """Minimal session service compatible with ADKScorerV3"""
+
+    async def create_session(self, app_name: str, user_id: str, session_id: str):
+        return SimpleNamespace(app_name=app_name, user_id=user_id, id=session_id)
+
+    async def delete_session(self, app_name: str, user_id: str, session_id: str):
+        return None
+
+
+# Keyword → (severity, weight) used to build deterministic verdicts
+_SEVERITY_KEYWORDS = {
+    'suspensión': ('critical', 3), 'suspendida': ('critical', 3), 'bloqueo': ('critical', 3),
+    'cierre': ('high', 2), 'accidente': ('high', 2), 'desvío': ('high', 2),
+    'derrumbe': ('high', 2), 'manifestación': ('high', 2),
+    'metro': ('medium', 1), 'tranvía': ('medium', 1), 'vía': ('medium', 1),
+    'tráfico': ('medium', 1), 'movilidad': ('medium', 1), 'pico y placa': ('medium', 1),
+    'obra': ('low', 1), 'bus': ('low', 1), 'encicla': ('low', 1),
+}
+_SEVERITY_ORDER = ['low', 'medium', 'high', 'critical']
+
+# Only the news fields of the user prompt are used for the verdict
+_NEWS_FIELDS_RE = re.compile(r'\*\*Título:\*\*(.*?)\*\*Fecha de publicación', re.DOTALL)
+
+
+class FakeRunner:
+    """
+    Fake ADK Runner
+
+    run_async() accepts the same arguments as google.adk.runners.Runner and
+    yields event objects with `content.parts[0].text`, `partial` and
+    `usage_metadata`, like the real runner.
+
+    Randomness is drawn per request from (seed, prompt, attempt number), so a
+    given item sees the same latency and failures regardless of how calls
+    are interleaved.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        latency: str = "lognormal",
+        latency_ms: float = 800.0,
+        latency_spread: float = 0.5,
+        tail_rate: float = 0.0,
+        tail_multiplier: float = 8.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        tokens_per_char: float = 0.25,
+        output_tokens: Optional[int] = None,
+        stream_chunk_chars: int = 40,
+        time_scale: float = 1.0
+    ):
+        """
+        Initialize fake runner
+
+        Args:
+            seed: Seed for reproducible runs
+            latency: Distribution: "fixed", "uniform" or "lognormal"
+            latency_ms: Fixed value, uniform mean or lognormal median (ms)
+            latency_spread: Uniform half-width fraction or lognormal sigma
+            tail_rate: Probability of a slow outlier call
+            tail_multiplier: Latency multiplier for outlier calls
+            error_rate: Probability of a 503 UNAVAILABLE error
+            throttle_rate: Probability of a 429 RESOURCE_EXHAUSTED error
+            malformed_rate: Probability of a truncated (invalid) JSON response
+            tokens_per_char: Prompt token accounting ratio (the agent
+                instruction, SYSTEM_PROMPT, is billed as part of the prompt)
+            output_tokens: Fixed output token count (None = from JSON length)
+            stream_chunk_chars: Characters per partial event in streaming mode
+            time_scale: Multiplier applied to every sleep (0 = no waiting)
+        """
+        if latency not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {latency}")
+
+        self.seed = seed
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.latency_spread = latency_spread
+        self.tail_rate = tail_rate
+        self.tail_multiplier = tail_multiplier
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.malformed_rate = malformed_rate
+        self.tokens_per_char = tokens_per_char
+        self.output_tokens = output_tokens
+        self.stream_chunk_chars = max(1, stream_chunk_chars)
+        self.time_scale = time_scale
+
+        self.session_service = FakeSessionService()
+        self._attempts: Dict[str, int] = {}
+        self.stats = {'calls': 0, 'ok': 0, 'errors': 0, 'throttled': 0, 'malformed': 0}
+
+    @classmethod
+    def from_env(cls) -> "FakeRunner":
+        """Create a fake runner configured from FAKE_LLM_* environment variables"""
+        return cls(
+            seed=int(os.getenv("FAKE_LLM_SEED", "0")),
+            latency=os.getenv("FAKE_LLM_LATENCY", "lognormal"),
+            latency_ms=float(os.getenv("FAKE_LLM_LATENCY_MS", "800")),
+            latency_spread=float(os.getenv("FAKE_LLM_LATENCY_SPREAD", "0.5")),
+            tail_rate=float(os.getenv("FAKE_LLM_TAIL_RATE", "0")),
+            error_rate=float(os.getenv("FAKE_LLM_ERROR_RATE", "0")),
+            throttle_rate=float(os.getenv("FAKE_LLM_THROTTLE_RATE", "0")),
+            malformed_rate=float(os.getenv("FAKE_LLM_MALFORMED_RATE", "0")),
+            time_scale=float(os.getenv("FAKE_LLM_TIME_SCALE", "1.0"))
+        )
+
+    def _rng_for(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]
+        attempt = self._attempts.get(digest, 0)
+        self._attempts[digest] = attempt + 1
+        return random.Random(f"{self.seed}:{digest}:{attempt}")
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Draw one call latency in seconds"""
+        if self.latency == "fixed":
+            ms = self.latency_ms
+        elif self.latency == "uniform":
+            half = self.latency_ms * self.latency_spread
+            ms = rng.uniform(self.latency_ms - half, self.latency_ms + half)
+        else:
+            ms = self.latency_ms * math.exp(rng.gauss(0, self.latency_spread))
+
+        if self.tail_rate and rng.random() < self.tail_rate:
+            ms *= self.tail_multiplier
+        return max(0.0, ms) / 1000.0
+
+    @staticmethod
+    def build_verdict(prompt: str) -> Dict:
+        """Deterministic ScoringResponse-shaped verdict from prompt keywords"""
+        match = _NEWS_FIELDS_RE.search(prompt)
+        text = (match.group(1) if match else prompt).lower()
+        hits = [(kw, sev, w) for kw, (sev, w) in _SEVERITY_KEYWORDS.items() if kw in text]
+
+        if not hits:
+            return {
+                'keep': False,
+                'severity': None,
+                'tags': ['no_movilidad'],
+                'area': 'Desconocida',
+                'entities': [],
+                'summary': 'La noticia no describe impactos en la movilidad de Medellín.',
+                'relevance_score': 0.1,
+                'reasoning': 'No se encontraron referencias a transporte o vías (fake backend).'
+            }
+
+        severity = max((sev for _, sev, _ in hits), key=_SEVERITY_ORDER.index)
+        weight = sum(w for _, _, w in hits)
+        # Places already identified by the gazetteer stage are left out
+        preset = '**Lugares ya identificados:**' in prompt
+        return {
+            'keep': True,
+            'severity': severity,
+            'tags': sorted({kw.replace(' ', '_') for kw, _, _ in hits})[:5],
+            'area': '' if preset else 'Linea_A_Metro' if 'metro' in text else 'Valle_Aburra',
+            'entities': ['Metro de Medellín'] if 'metro' in text and not preset else [],
+            'summary': 'Noticia con impacto en la movilidad detectado por palabras clave.',
+            'relevance_score': round(min(0.95, 0.4 + 0.1 * weight), 2),
+            'reasoning': f"Coincidencias: {', '.join(kw for kw, _, _ in hits)} (fake backend)."
+        }
+
+    def _event(self, text: str, partial: bool, usage=None):
+        return SimpleNamespace(
+            content=SimpleNamespace(role='model', parts=[SimpleNamespace(text=text)]),
+            partial=partial,
+            usage_metadata=usage,
+            author='mobility_news_scorer'
+        )
+
+    async def _sleep(self, seconds: float):
+        if self.time_scale > 0 and seconds > 0:
+            await asyncio.sleep(seconds * self.time_scale)
+
+    async def run_async(self, user_id: str, session_id: str, new_message, run_config=None):
+        """
+        Yield fake agent events for one request
+
+        Streams partial events first when run_config requests streaming.
+        """
+        prompt = ''.join(part.text or '' for part in new_message.parts)
+        rng = self._rng_for(prompt)
+        self.stats['calls'] += 1
+
+        latency = self.sample_latency(rng)
+        draw = rng.random()
+
+        if draw < self.throttle_rate:
+            self.stats['throttled'] += 1
+            await self._sleep(min(latency, 0.05))
+            raise FakeResourceExhausted()
+        if draw < self.throttle_rate + self.error_rate:
+            self.stats['errors'] += 1
+            await self._sleep(latency / 2)
+            raise FakeServerError()
+
+        text = json.dumps(self.build_verdict(prompt), ensure_ascii=False)
+        if rng.random() < self.malformed_rate:
+            self.stats['malformed'] += 1
+            text = text[:rng.randint(1, max(1, len(text) - 2))]
+        else:
+            self.stats['ok'] += 1
+
+        prompt_tokens = int((len(SYSTEM_PROMPT) + len(prompt)) * self.tokens_per_char) + 1
+        output_tokens = self.output_tokens or int(len(text) * self.tokens_per_char) + 1
+        usage = SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens
+        )
+
+        streaming = run_config is not None and 'SSE' in str(getattr(run_config, 'streaming_mode', ''))
+        if streaming:
+            # Time to first token ~20% of the latency, the rest spread over chunks
+            chunks = [text[i:i + self.stream_chunk_chars]
+                      for i in range(0, len(text), self.stream_chunk_chars)]
+            await self._sleep(latency * 0.2)
+            per_chunk = latency * 0.8 / max(1, len(chunks))
+            for chunk in chunks:
+                yield self._event(chunk, partial=True)
+                await self._sleep(per_chunk)
+        else:
+            await self._sleep(latency)
+
+        yield self._event(text, partial=False, usage=usage)
@@ -0,0 +1,352 @@
+"""
+Local gazetteer of Medellín places
+Compiles the places named in SYSTEM_PROMPT (Metro lines and their terminal
+stations, main roads, key areas and municipalities) plus data files
+(prompts/gazetteer.txt and GAZETTEER_FILES) into an accent-insensitive
+token trie. One pass over a title/body finds the longest known alias at each
+position and maps it to a canonical entity name and area code, so areas and
+entities can be pre-extracted without the LLM and the LLM's own answers
+("Línea A", "linea_a_metro", "Itagui") stored under one spelling.
+
+Data file lines (# starts a comment):
+    kind | Canonical name | Area_code | alias; other alias
+An empty area means the entry is an entity without an area of its own.
+Entries loaded later replace earlier ones that share an alias.
+"""
+import hashlib
+import logging
+import os
+import re
+from typing import Dict, List, Optional
+
+from prompts.system_prompt import SYSTEM_PROMPT
+from text_utils import fold
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'prompts', 'gazetteer.txt')
+
+# Areas the prompt defines beyond places
+MULTIPLE_AREA = 'Multiple'
+UNKNOWN_AREAS = {'', 'desconocida', 'desconocido', 'unknown', 'mock area', 'n/a', 'none'}
+
+# Prefixes under which the prompt's short road names ("Regional", "80") appear
+ROAD_PREFIXES = ('avenida', 'av', 'avda', 'via', 'la')
+NUMBERED_ROAD_PREFIXES = ROAD_PREFIXES + ('carrera', 'cra', 'cr', 'kr')
+
+# Single-word aliases that are also common words only match capitalised
+COMMON_WORDS = {'centro', 'popular', 'regional', 'oriental', 'estadio', 'caldas', 'metro', 'robledo'}
+
+# Distinct areas in an item's title that make it "Multiple"
+MULTIPLE_THRESHOLD = 3
+MAX_ENTITIES = 10
+
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def _key(text: str) -> str:
+    """Alias lookup key: folded words joined by single spaces"""
+    return ' '.join(_TOKEN.findall(fold(text.replace('_', ' '))))
+
+
+def area_code(name: str) -> str:
+    """Area code of a road or line name in the prompt's style (Avenida 80 → Avenida_80)"""
+    return '_'.join(name.split())
+
+
+class Gazetteer:
+    """
+    Accent-insensitive longest-match place finder
+
+    Entries are dicts with kind, name (canonical entity), area (area code or
+    None) and aliases. The trie maps folded alias tokens to the entry index.
+    """
+
+    def __init__(self, entries: List[Dict]):
+        """
+        Compile entries into the matcher
+
+        Args:
+            entries: Place entries; later entries win shared aliases
+        """
+        self.entries: List[Dict] = []
+        self.trie: Dict = {}
+        self._by_alias: Dict[str, int] = {}
+        self._areas: Dict[str, str] = {}
+        for entry in entries:
+            self.add(entry)
+        digest = hashlib.sha256(repr(sorted(
+            (alias, self.entries[index]['name'], self.entries[index]['area'] or '')
+            for alias, index in self._by_alias.items()
+        )).encode('utf-8'))
+        self.version = digest.hexdigest()[:8]
+
+    def add(self, entry: Dict):
+        """Add one entry (aliases are matched on their folded words)"""
+        index = len(self.entries)
+        self.entries.append(entry)
+        if entry['area']:
+            self._areas[_key(entry['area'])] = entry['area']
+        for alias in [entry['name']] + list(entry['aliases']):
+            key = _key(alias)
+            if not key:
+                continue
+            self._by_alias[key] = index
+            node = self.trie
+            for word in key.split():
+                node = node.setdefault(word, {})
+            node[''] = index
+
+    @classmethod
+    def from_prompt(cls, data_files: Optional[List[str]] = None) -> "Gazetteer":
+        """
+        Build the gazetteer from SYSTEM_PROMPT and data files
+
+        Args:
+            data_files: Files loaded after the prompt's places (default:
+                prompts/gazetteer.txt plus GAZETTEER_FILES, comma-separated)
+
+        Returns:
+            Compiled Gazetteer
+        """
+        if data_files is None:
+            data_files = [DEFAULT_DATA_FILE] + [
+                path.strip() for path in os.getenv('GAZETTEER_FILES', '').split(',') if path.strip()
+            ]
+        entries = parse_prompt(SYSTEM_PROMPT)
+        for path in data_files:
+            loaded = load_entries(path)
+            entries.extend(loaded)
+            logger.debug(f"Gazetteer: {len(loaded)} entries from {path}")
+        gazetteer = cls(entries)
+        logger.info(
+            f"📍 Gazetteer {gazetteer.version}: {len(gazetteer.entries)} places, "
+            f"{len(gazetteer._by_alias)} aliases, {len(gazetteer._areas)} areas"
+        )
+        return gazetteer
+
+    def find(self, text: Optional[str]) -> List[Dict]:
+        """
+        Places mentioned in a text, in order (longest alias at each position)
+
+        Returns:
+            List of entries
+        """
+        words = list(_TOKEN.finditer(text or ''))
+        folded = [fold(word.group()) for word in words]
+        found = []
+        position = 0
+        while position < len(words):
+            node = self.trie
+            match = None
+            end = position
+            while end < len(words) and folded[end] in node:
+                node = node[folded[end]]
+                end += 1
+                if '' in node:
+                    match = (node[''], end)
+            if match is None:
+                position += 1
+                continue
+            index, end = match
+            if end - position == 1 and folded[position] in COMMON_WORDS and not words[position].group()[0].isupper():
+                position += 1
+                continue
+            found.append(self.entries[index])
+            position = end
+        return found
+
+    def extract(self, title: Optional[str], body: Optional[str] = None) -> Dict:
+        """
+        Pre-extract area and entities from a news item's text
+
+        The area comes from the title when it names a place (its first
+        place with an area), otherwise from the body's most mentioned area;
+        three or more distinct areas in the title make it Multiple.
+
+        Returns:
+            Dict with area (code or None), entities (canonical names) and
+            areas (distinct area codes, title first)
+        """
+        in_title = self.find(title)
+        in_body = self.find(body)
+        entities = []
+        for entry in in_title + in_body:
+            if entry['name'] not in entities:
+                entities.append(entry['name'])
+
+        title_areas = _distinct(entry['area'] for entry in in_title if entry['area'])
+        body_areas = [entry['area'] for entry in in_body if entry['area']]
+        areas = _distinct(title_areas + body_areas)
+
+        if len(title_areas) >= MULTIPLE_THRESHOLD:
+            area = MULTIPLE_AREA
+        elif title_areas:
+            area = title_areas[0]
+        elif body_areas:
+            area = max(_distinct(body_areas), key=body_areas.count)
+        else:
+            area = None
+        return {'area': area, 'entities': entities[:MAX_ENTITIES], 'areas': areas}
+
+    def lookup(self, value: Optional[str]) -> Optional[Dict]:
+        """Entry whose alias is exactly this text, if any"""
+        index = self._by_alias.get(_key(value or ''))
+        return self.entries[index] if index is not None else None
+
+    def canonical_area(self, value: Optional[str]) -> Optional[str]:
+        """
+        Canonical area code for an area as the LLM wrote it
+
+        Returns:
+            The known area code ("Línea A" → Linea_A_Metro), None for empty
+            or unknown-area values, or the value itself when not in the
+            gazetteer
+        """
+        key = _key(value or '')
+        if key in UNKNOWN_AREAS:
+            return None
+        if key == _key(MULTIPLE_AREA):
+            return MULTIPLE_AREA
+        if key in self._areas:
+            return self._areas[key]
+        entry = self.lookup(value)
+        if entry and entry['area']:
+            return entry['area']
+        found = [entry['area'] for entry in self.find(value) if entry['area']]
+        return found[0] if len(set(found)) == 1 else value.strip()
+
+    def canonical_entities(self, values: Optional[List[str]]) -> List[str]:
+        """Entities with known places under their canonical names (deduplicated)"""
+        entities = []
+        for value in values or []:
+            if not value:
+                continue
+            entry = self.lookup(value)
+            name = entry['name'] if entry else value.strip()
+            if _key(name) not in {_key(entity) for entity in entities}:
+                entities.append(name)
+        return entities
+
+
+def _distinct(values) -> List:
+    seen = []
+    for value in values:
+        if value not in seen:
+            seen.append(value)
+    return seen
+
+
+def _entry(kind: str, name: str, area: Optional[str], aliases) -> Dict:
+    return {'kind': kind, 'name': name, 'area': area or None, 'aliases': list(aliases)}
+
+
+def _section_line(prompt: str, label: str) -> str:
+    match = re.search(rf'^- {re.escape(label)}:(.*)$', prompt, re.MULTILINE)
+    return match.group(1).strip() if match else ''
+
+
+def parse_prompt(prompt: str) -> List[Dict]:
+    """
+    Places listed in the prompt's CONTEXTO DE MEDELLÍN section
+
+    Returns:
+        Entries for the Metro and its lines (terminal stations included),
+        the main roads, the key areas with their neighbourhoods and the
+        municipalities
+    """
+    entries = []
+    area_names = set()
+
+    # **Áreas clave:** "- Centro: La Candelaria, Villanueva, Guayaquil"
+    key_areas = prompt.split('**Áreas clave:**', 1)[-1].split('\n\n', 1)[0]
+    for names, places in re.findall(r'^- ([^:\n]+):(.*)$', key_areas, re.MULTILINE):
+        municipalities = 'Municipios' in places
+        for name in (part.strip() for part in names.split(',')):
+            # "Laureles-Estadio" is the Laureles area
+            canonical = name.split('-')[0]
+            aliases = [name, name.replace('-', ' ')] if canonical != name else []
+            entries.append(_entry('municipio' if municipalities else 'area', canonical, canonical, aliases))
+            area_names.add(_key(canonical))
+        if len(names.split(',')) == 1:
+            for place in (part.strip() for part in places.split(',')):
+                if place[:1].isupper() and place.split()[0] not in ('Zona', 'Conecta', 'Municipios'):
+                    entries.append(_entry('barrio', place, names.strip().split('-')[0], []))
+
+    # Metro de Medellín: Líneas A (Niquía-La Estrella), B (...), T (Tranvía, ...), H (Cable ...)
+    metro = _section_line(prompt, 'Metro de Medellín')
+    if metro:
+        entries.append(_entry('entidad', 'Metro de Medellín', None, ['metro de medellin', 'metro']))
+    for letter, description in re.findall(r'\b([A-Z]) \(([^)]*)\)', metro):
+        aliases = [f'linea {letter}', f'linea {letter} del metro', f'linea {letter} metro']
+        if description.startswith('Tranvía'):
+            name, area = 'Tranvía', 'Tranvia'
+            aliases += ['tranvia', 'tranvia de ayacucho']
+        elif description.startswith('Cable'):
+            route = description[len('Cable'):].strip()
+            name, area = f'Metrocable Línea {letter}', f'Linea_{letter}_Metro'
+            # "Cable Acevedo-Santo Domingo" is also called by its first station
+            for stop in {route, route.split('-')[0]}:
+                aliases += [f'cable {stop}', f'metrocable {stop}']
+            aliases += [f'metrocable linea {letter}', f'cable linea {letter}']
+        else:
+            name, area = f'Línea {letter} del Metro', f'Linea_{letter}_Metro'
+            for station in description.split('-'):
+                station = station.strip()
+                station_aliases = [f'estacion {station}']
+                if _key(station) not in area_names:
+                    station_aliases.append(station)
+                entries.append(_entry('estacion', f'Estación {station}', area, station_aliases))
+        entries.append(_entry('linea', name, area, aliases))
+
+    # Buses, EnCicla
+    if _section_line(prompt, 'EnCicla'):
+        entries.append(_entry('entidad', 'EnCicla', None, ['encicla']))
+
+    # Vías principales: Autopista Sur, Regional, Avenida Las Vegas, Oriental, 80, ...
+    for road in (part.strip() for part in _section_line(prompt, 'Vías principales').split(',')):
+        if not road:
+            continue
+        is_avenue = road.startswith('Avenida ')
+        base = road[len('Avenida '):] if is_avenue else road
+        name = road if is_avenue or road.startswith('Autopista ') else f'Avenida {road}'
+        if road.startswith('Autopista '):
+            prefixes = ('la',)
+        elif base.split()[0] in ('El', 'La', 'Las', 'Los'):
+            prefixes = ('avenida', 'av', 'avda')
+        else:
+            prefixes = NUMBERED_ROAD_PREFIXES if base.isdigit() else ROAD_PREFIXES
+        aliases = [f'{prefix} {base}' for prefix in prefixes]
+        # Bare names, except numbers, avenues ("Las Vegas") and area names ("El Poblado")
+        if not base.isdigit() and not is_avenue and _key(base) not in area_names:
+            aliases.append(base)
+        entries.append(_entry('via', name, area_code(name), aliases))
+    return entries
+
+
+def load_entries(path: str) -> List[Dict]:
+    """
+    Read entries from a data file (kind | name | area | aliases)
+
+    Returns:
+        Entries, or an empty list if the file does not exist
+
+    Raises:
+        ValueError: If a line does not have the four fields
+    """
+    if not os.path.exists(path):
+        logger.warning(f"Gazetteer file not found: {path}")
+        return []
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            fields = [field.strip() for field in line.split('|')]
+            if len(fields) != 4 or not fields[1]:
+                raise ValueError(f"{path}:{number}: expected 'kind | name | area | aliases'")
+            kind, name, area, aliases = fields
+            entries.append(_entry(kind, name, area, [alias.strip() for alias in aliases.split(';') if alias.strip()]))
+    return entries
@@ -0,0 +1,189 @@
+"""
+Gazetteer scorer stage - local area/entity extraction around a scorer
+Places found by the gazetteer canonicalise the scorer's area and entities,
+and can be sent to the LLM as a hint or in place of those fields (the model
+then leaves them empty, saving their output tokens).
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from gazetteer import MAX_ENTITIES, Gazetteer
+from prompts.system_prompt import LOCATION_HINT_TEMPLATE, LOCATION_PRESET_TEMPLATE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class GazetteerScorer:
+    """
+    Scorer stage that pre-extracts places with the gazetteer
+
+    Modes:
+        canonicalize: Only map the scorer's area/entities to canonical names
+            and fill an unknown area from the text
+        hints: Also add the places found to the LLM prompt
+        replace: When the title or body names a place, tell the LLM to leave
+            area/entities empty and use the gazetteer's
+
+    Exposes the same interface as ADKScorerV3 (score, evaluate,
+    score_batch, get_run_stats, reset_run_stats, get_stats).
+    """
+
+    MODES = ('canonicalize', 'hints', 'replace')
+
+    def __init__(self, gazetteer: Gazetteer, scorer, mode: str = 'canonicalize'):
+        """
+        Initialize gazetteer stage
+
+        Args:
+            gazetteer: Compiled Gazetteer
+            scorer: Wrapped scorer
+            mode: canonicalize, hints or replace
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown gazetteer mode '{mode}' (available: {', '.join(self.MODES)})")
+        self.gazetteer = gazetteer
+        self.scorer = scorer
+        self.mode = mode
+        # Every mode rewrites the stored area/entities (hints and replace also
+        # change the prompt), so rows say which gazetteer stage wrote them
+        self.version_suffix = f"+gaz-{mode}-{gazetteer.version}"
+        self.scorer_version = scorer.scorer_version + self.version_suffix
+        self.reset_run_stats()
+
+        logger.info(f"✅ Gazetteer stage: {mode} ({gazetteer.version}) → {type(scorer).__name__}")
+
+    def _prepare(self, news_item: Dict) -> Tuple[Dict, Dict, bool]:
+        """
+        Extract an item's places and add the prompt hint for the mode
+
+        Returns:
+            (item for the scorer, places found, whether the LLM was told to
+            leave area/entities to the gazetteer)
+        """
+        places = self.gazetteer.extract(news_item.get('title'), news_item.get('body'))
+        self.local_stats['items'] += 1
+        if self.mode == 'canonicalize' or not places['entities']:
+            return news_item, places, False
+
+        preset = self.mode == 'replace' and places['area'] is not None
+        template = LOCATION_PRESET_TEMPLATE if preset else LOCATION_HINT_TEMPLATE
+        hint = template.format(
+            places=', '.join(places['entities']),
+            area=places['area'] or 'sin determinar'
+        )
+        self.local_stats['preset' if preset else 'hinted'] += 1
+        return {**news_item, 'location_hint': hint}, places, preset
+
+    def apply(self, result: Dict, places: Dict, preset: bool) -> Dict:
+        """
+        Set a verdict's area and entities from the gazetteer
+
+        Args:
+            result: Verdict or enriched item (changed in place)
+            places: Gazetteer.extract() output for the item
+            preset: The LLM was told to leave area/entities empty
+
+        Returns:
+            The result
+        """
+        result.pop('location_hint', None)
+        if not result.get('keep'):
+            return result
+
+        if preset:
+            result['area'] = places['area']
+            result['entities'] = places['entities']
+            return result
+
+        area = self.gazetteer.canonical_area(result.get('area'))
+        if area is None and places['area']:
+            self.local_stats['filled'] += 1
+            area = places['area']
+        elif area is not None and area != result.get('area'):
+            self.local_stats['canonicalized'] += 1
+        result['area'] = area or result.get('area')
+
+        entities = self.gazetteer.canonical_entities(result.get('entities'))
+        found = [name for name in places['entities'] if name not in entities]
+        result['entities'] = entities + found[:max(0, MAX_ENTITIES - len(entities))]
+        return result
+
+    def _finish(self, enriched: Dict, places: Dict, preset: bool) -> Dict:
+        """Apply the places to an enriched item and tag its version"""
+        self.apply(enriched, places, preset)
+        # Local keeps carry the classifier's version; keep it, with the suffix
+        enriched['scorer_version'] = (
+            (enriched.get('scorer_version') or self.scorer.scorer_version) + self.version_suffix
+        )
+        return enriched
+
+    def score(self, news_item: Dict) -> Optional[Dict]:
+        """
+        Score a news item with the wrapped scorer and set its places
+
+        Returns:
+            Enriched news item, or None if not relevant
+        """
+        item, places, preset = self._prepare(news_item)
+        enriched = self.scorer.score(item)
+        if enriched is None:
+            return None
+        return self._finish(enriched, places, preset)
+
+    def evaluate(self, news_item: Dict) -> Dict:
+        """Get the verdict for a news item, kept or not"""
+        item, places, preset = self._prepare(news_item)
+        return self.apply(self.scorer.evaluate(item), places, preset)
+
+    def score_batch(self, news_items: List[Dict]) -> List[Dict]:
+        """
+        Score multiple news items with the wrapped scorer
+
+        Returns:
+            List of enriched news items (only items with keep=true)
+        """
+        prepared = [self._prepare(item) for item in news_items]
+        by_url = {item.get('url'): (places, preset) for item, places, preset in prepared}
+        return [
+            self._finish(result, *by_url[result.get('url')])
+            for result in self.scorer.score_batch([item for item, _, _ in prepared])
+        ]
+
+    def reset_run_stats(self):
+        """Reset gazetteer and wrapped scorer run counters"""
+        self.scorer.reset_run_stats()
+        self.local_stats = {'items': 0, 'hinted': 0, 'preset': 0, 'filled': 0, 'canonicalized': 0}
+
+    def get_run_stats(self) -> Dict:
+        """
+        Get run counters since the last reset
+
+        Returns:
+            The wrapped scorer's run counters plus a 'gazetteer' dict (items
+            seen, hinted, preset = area/entities left to the gazetteer,
+            filled = unknown areas filled, canonicalized = areas respelled)
+        """
+        stats = self.scorer.get_run_stats()
+        stats['gazetteer'] = dict(self.local_stats)
+        return stats
+
+    def close(self):
+        """Release the wrapped scorer's resources"""
+        self.scorer.close()
+
+    def get_stats(self) -> Dict:
+        """Get gazetteer and wrapped scorer configuration"""
+        return {
+            'mode': 'gazetteer',
+            'gazetteer': {
+                'mode': self.mode,
+                'version': self.gazetteer.version,
+                'places': len(self.gazetteer.entries)
+            },
+            'scorer': self.scorer.get_stats(),
+            'run_stats': self.get_run_stats()
+        }
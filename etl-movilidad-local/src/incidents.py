@@ -0,0 +1,240 @@
+"""
+Incident clustering of scored news
+Several outlets report the same closure or crash at different times; every
+stored item is matched to an open incident (same area, shared tags or
+entities, close in time, similar title) or opens a new one.
+
+Candidates are found through index keys (the normalised area and MinHash
+LSH bands of the title) looked up in the incident_key table by key and
+recency, so matching an item reads only the recent incidents it shares a
+key with, however long the history grows.
+"""
+import hashlib
+import logging
+import random
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
+
+from metrics import METRICS
+from text_utils import fold, normalize_area
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# MinHash signature: NUM_HASHES values, split into LSH_BANDS bands
+NUM_HASHES = 32
+LSH_BANDS = 16
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240611)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_HASHES)]
+
+SEVERITY_RANK = {'low': 0, 'medium': 1, 'high': 2, 'critical': 3}
+
+STOPWORDS = {
+    'para', 'por', 'con', 'sin', 'los', 'las', 'del', 'una', 'uno', 'unos', 'unas',
+    'que', 'como', 'este', 'esta', 'estos', 'estas', 'desde', 'hasta', 'entre',
+    'sobre', 'tras', 'ante', 'pero', 'mas', 'muy', 'fue', 'son', 'sus', 'ser',
+    'hay', 'esto', 'donde', 'cuando', 'medellin', 'hoy', 'ayer', 'manana'
+}
+
+# Tags and entities kept per incident
+MAX_TERMS = 30
+
+# An item must share at least this much (term overlap or text similarity)
+# with an incident to join it; same area and time alone are not enough
+MIN_EVIDENCE = 0.1
+
+
+def tokens(text: str) -> Set[str]:
+    """Content words of a text (accent-free, 3+ letters, no stopwords)"""
+    return {word for word in re.findall(r'[a-z0-9]{3,}', fold(text)) if word not in STOPWORDS}
+
+
+def minhash(words: Set[str]) -> List[int]:
+    """MinHash signature of a word set (stable across processes)"""
+    if not words:
+        return []
+    bases = [
+        int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), 'big')
+        for word in words
+    ]
+    return [min((a * base + b) % _PRIME for base in bases) for a, b in _PERMUTATIONS]
+
+
+def lsh_keys(signature: List[int]) -> List[str]:
+    """Index keys of a signature's bands; similar texts share at least one"""
+    if not signature:
+        return []
+    rows = NUM_HASHES // LSH_BANDS
+    return [
+        f"lsh:{band}:{hashlib.blake2b(repr(signature[band * rows:(band + 1) * rows]).encode(), digest_size=6).hexdigest()}"
+        for band in range(LSH_BANDS)
+    ]
+
+
+def text_similarity(a: List[int], b: List[int]) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures"""
+    if not a or not b:
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / NUM_HASHES
+
+
+def item_time(news: Dict) -> datetime:
+    """Naive UTC time of a news item (published_at, or now if missing or in the future)"""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    try:
+        published = datetime.fromisoformat(str(news.get('published_at')))
+    except ValueError:
+        return now
+    if published.tzinfo is not None:
+        published = published.astimezone(timezone.utc).replace(tzinfo=None)
+    return min(published, now)
+
+
+def _fold_all(values: Optional[List[str]]) -> Set[str]:
+    return {fold(value).strip() for value in values or [] if value}
+
+
+def _terms(tags: List[str], entities: List[str]) -> Set[str]:
+    """Words of tags and entities (cierre_vial and Cierre vial share 'cierre')"""
+    return tokens(' '.join((tags or []) + (entities or [])).replace('_', ' '))
+
+
+class IncidentIndex:
+    """
+    Assigns stored news items to incidents
+
+    An item joins the best-scoring recent incident it shares an index key
+    with when the score reaches the threshold; otherwise it opens a new
+    incident. Alerts are meant per incident: an item is flagged to alert
+    (incident_alert) only when it opens the incident or raises its severity.
+    """
+
+    def __init__(
+        self,
+        db,
+        window_hours: float = 6,
+        threshold: float = 0.55,
+        max_candidates: int = 50
+    ):
+        """
+        Initialize incident index
+
+        Args:
+            db: NewsDatabase or SupabaseNewsDatabase instance
+            window_hours: An incident takes items published within this many
+                hours of its last (or before its first) item
+            threshold: Minimum match score (0-1) to join an incident
+            max_candidates: Most recent candidate incidents scored per item
+        """
+        self.db = db
+        self.window = timedelta(hours=window_hours)
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self.stats = {'opened': 0, 'joined': 0, 'escalated': 0}
+
+    def score(self, news: Dict, signature: List[int], when: datetime, incident: Dict) -> float:
+        """
+        Match score of an item against an incident
+
+        Returns:
+            0 when the incident is outside the time window, in another area
+            or shares neither terms nor text with the item; otherwise a 0-1
+            mix of same area, time proximity, tag/entity overlap and text
+            similarity
+        """
+        first_seen = datetime.fromisoformat(incident['first_seen'])
+        last_seen = datetime.fromisoformat(incident['last_seen'])
+        gap = max(when - last_seen, first_seen - when, timedelta(0))
+        if gap > self.window:
+            return 0.0
+        closeness = 1 - gap / self.window
+
+        terms = _terms(news.get('tags'), news.get('entities'))
+        incident_terms = _terms(incident['tags'], incident['entities'])
+        overlap = (
+            len(terms & incident_terms) / len(terms | incident_terms) if terms and incident_terms else 0.0
+        )
+        text = text_similarity(signature, incident['signature'])
+        if max(overlap, text) < MIN_EVIDENCE:
+            return 0.0
+
+        area = normalize_area(news.get('area'))
+        if area and incident['area_key']:
+            if area != incident['area_key']:
+                return 0.0
+            return 0.35 + 0.2 * closeness + 0.25 * overlap + 0.2 * text
+        return 0.2 * closeness + 0.4 * overlap + 0.4 * text
+
+    def assign(self, news: Dict) -> int:
+        """
+        Match an item to an incident (or open one) and record it there
+
+        Sets news['incident_id'], news['incident_size'] (items so far) and
+        news['incident_alert'] (True if the item opened the incident or
+        raised its severity).
+
+        Returns:
+            Incident ID
+        """
+        with METRICS.timer('etl_incident_match_seconds'):
+            # Titles name the event; model summaries share boilerplate
+            signature = minhash(tokens(news.get('title') or ''))
+            when = item_time(news)
+            area = normalize_area(news.get('area'))
+            keys = ([f"area:{area}"] if area else []) + lsh_keys(signature)
+            outcome = {}
+
+            def decide(candidates: List[Dict]) -> Dict:
+                scored = [(self.score(news, signature, when, c), c) for c in candidates]
+                best_score, best = max(scored, key=lambda pair: pair[0], default=(0.0, None))
+                if best is None or best_score < self.threshold:
+                    outcome.update(opened=True, escalated=False, size=1)
+                    return {'id': None, 'keys': keys, 'incident': {
+                        'area': news.get('area'),
+                        'area_key': area,
+                        'title': news.get('title'),
+                        'severity': news.get('severity'),
+                        'tags': sorted(_fold_all(news.get('tags')))[:MAX_TERMS],
+                        'entities': sorted(_fold_all(news.get('entities')))[:MAX_TERMS],
+                        'signature': signature,
+                        'item_count': 1,
+                        'first_seen': when.isoformat(),
+                        'last_seen': when.isoformat()
+                    }}
+
+                severity = news.get('severity')
+                escalated = SEVERITY_RANK.get(severity, -1) > SEVERITY_RANK.get(best['severity'], -1)
+                outcome.update(opened=False, escalated=escalated, size=best['item_count'] + 1)
+                # The signature of the union of two texts is the element-wise minimum
+                merged = (
+                    [min(x, y) for x, y in zip(signature, best['signature'])]
+                    if signature and best['signature'] else signature or best['signature']
+                )
+                return {'id': best['id'], 'keys': keys + lsh_keys(merged), 'incident': {
+                    'area': best['area'] or news.get('area'),
+                    'area_key': best['area_key'] or area,
+                    'title': best['title'],
+                    'severity': severity if escalated else best['severity'],
+                    'tags': sorted(set(best['tags']) | _fold_all(news.get('tags')))[:MAX_TERMS],
+                    'entities': sorted(set(best['entities']) | _fold_all(news.get('entities')))[:MAX_TERMS],
+                    'signature': merged,
+                    'item_count': best['item_count'] + 1,
+                    'first_seen': min(best['first_seen'], when.isoformat()),
+                    'last_seen': max(best['last_seen'], when.isoformat())
+                }}
+
+            incident_id = self.db.assign_incident(
+                keys, (when - self.window).isoformat(), decide, self.max_candidates
+            )
+
+        news['incident_id'] = incident_id
+        news['incident_size'] = outcome['size']
+        news['incident_alert'] = outcome['opened'] or outcome['escalated']
+        kind = 'opened' if outcome['opened'] else 'escalated' if outcome['escalated'] else 'joined'
+        self.stats[kind] += 1
+        METRICS.inc('etl_incident_items_total', outcome=kind)
+        if not outcome['opened']:
+            logger.info(f"🔗 {news.get('url')} {kind} incident {incident_id} ({outcome['size']} reports)")
+        return incident_id
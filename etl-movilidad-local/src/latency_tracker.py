@@ -0,0 +1,71 @@
+"""
+Latency tracking for model calls
+Sliding-window percentiles per model, used to report tail latency and to
+derive the delay before a hedged request is sent
+"""
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class LatencyTracker:
+    """
+    Sliding window of recent call latencies for one model
+
+    Only the last `window` samples are kept, so percentiles follow changes
+    in the backend's latency without being dominated by old calls.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Initialize latency tracker
+
+        Args:
+            window: Number of recent samples kept
+            min_samples: Samples needed before percentiles are considered
+                reliable (see is_warm)
+        """
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """Record one call latency"""
+        with self._lock:
+            self._samples.append(seconds)
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+    @property
+    def is_warm(self) -> bool:
+        """Whether enough samples were recorded for stable percentiles"""
+        return self.count >= self.min_samples
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Percentile of the current window (None if empty)"""
+        with self._lock:
+            samples = list(self._samples)
+        return percentile(samples, pct) if samples else None
+
+    def snapshot(self) -> Dict:
+        """Count, average and p50/p95/p99 of the current window"""
+        with self._lock:
+            samples = list(self._samples)
+        return {
+            'count': len(samples),
+            'avg': sum(samples) / len(samples) if samples else 0.0,
+            'p50': percentile(samples, 50),
+            'p95': percentile(samples, 95),
+            'p99': percentile(samples, 99)
+        }
@@ -0,0 +1,308 @@
+"""
+Local relevance classifier distilled from stored LLM verdicts
+Hashed TF-IDF features and softmax regression implemented with NumPy, so
+confident items can be scored without calling the LLM
+"""
+import json
+import logging
+import re
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from prompts.token_budget import DEFAULT_BODY_TOKEN_BUDGET, compress_body
+from text_utils import fold
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEVERITIES = ['low', 'medium', 'high', 'critical']
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def item_text(news_item: Dict) -> str:
+    """Text seen by the classifier: title twice plus the budgeted body the LLM sees"""
+    title = news_item.get('title', '')
+    body = compress_body(news_item.get('body', ''), DEFAULT_BODY_TOKEN_BUDGET)
+    return f"{title} {title} {body}"
+
+
+def load_labelled_items(path: str) -> List[Dict]:
+    """Load labelled news items from a JSONL file"""
+    items = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                items.append(json.loads(line))
+    return items
+
+
+class SparseRows:
+    """Minimal CSR matrix: just the products needed for training and scoring"""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, n_features: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.n_features = n_features
+        self.n_rows = len(indptr) - 1
+        self.row_ids = np.repeat(np.arange(self.n_rows), np.diff(indptr))
+
+    def take(self, rows: Sequence[int]) -> "SparseRows":
+        """Subset of rows"""
+        indptr = [0]
+        indices = []
+        data = []
+        for row in rows:
+            start, end = self.indptr[row], self.indptr[row + 1]
+            indices.append(self.indices[start:end])
+            data.append(self.data[start:end])
+            indptr.append(indptr[-1] + end - start)
+        return SparseRows(
+            np.array(indptr, dtype=np.int64),
+            np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64),
+            np.concatenate(data) if data else np.zeros(0),
+            self.n_features
+        )
+
+    def dot(self, weights: np.ndarray) -> np.ndarray:
+        """X @ W for a (n_features, k) weight matrix"""
+        return np.stack([
+            np.bincount(self.row_ids, weights=self.data * weights[self.indices, k],
+                        minlength=self.n_rows)
+            for k in range(weights.shape[1])
+        ], axis=1)
+
+    def tdot(self, residuals: np.ndarray) -> np.ndarray:
+        """X.T @ R for a (n_rows, k) matrix"""
+        return np.stack([
+            np.bincount(self.indices, weights=self.data * residuals[self.row_ids, k],
+                        minlength=self.n_features)
+            for k in range(residuals.shape[1])
+        ], axis=1)
+
+
+class HashedTfidfVectorizer:
+    """
+    TF-IDF over hashed unigrams and bigrams
+
+    Hashing keeps the vocabulary out of the model file; only the IDF
+    weights of the hashed buckets are stored.
+    """
+
+    def __init__(self, n_features: int = 2 ** 18, min_df: int = 2):
+        self.n_features = n_features
+        self.min_df = min_df
+        self.idf: Optional[np.ndarray] = None
+
+    def _bucket_counts(self, text: str) -> Dict[int, int]:
+        tokens = _TOKEN_RE.findall(fold(text))
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        counts: Dict[int, int] = {}
+        for gram in grams:
+            bucket = zlib.crc32(gram.encode('utf-8')) % self.n_features
+            counts[bucket] = counts.get(bucket, 0) + 1
+        return counts
+
+    def fit(self, texts: List[str]) -> "HashedTfidfVectorizer":
+        """Compute smoothed IDF weights; buckets below min_df get weight 0"""
+        df = np.zeros(self.n_features)
+        for text in texts:
+            df[list(self._bucket_counts(text))] += 1
+        n = len(texts)
+        self.idf = np.where(df >= self.min_df, np.log((1 + n) / (1 + df)) + 1.0, 0.0)
+        return self
+
+    def transform(self, texts: List[str]) -> SparseRows:
+        """Sublinear TF-IDF rows, L2-normalized"""
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for text in texts:
+            row = [
+                (bucket, (1.0 + np.log(count)) * self.idf[bucket])
+                for bucket, count in self._bucket_counts(text).items()
+                if self.idf[bucket] > 0
+            ]
+            norm = np.sqrt(sum(value * value for _, value in row)) or 1.0
+            for bucket, value in sorted(row):
+                indices.append(bucket)
+                data.append(value / norm)
+            indptr.append(len(indices))
+        return SparseRows(
+            np.array(indptr, dtype=np.int64),
+            np.array(indices, dtype=np.int64),
+            np.array(data, dtype=np.float64),
+            self.n_features
+        )
+
+
+class SoftmaxRegression:
+    """Multinomial logistic regression with L2, trained by full-batch Adam"""
+
+    def __init__(self, n_classes: int, l2: float = 1e-4, learning_rate: float = 0.1, epochs: int = 200):
+        self.n_classes = n_classes
+        self.l2 = l2
+        self.learning_rate = learning_rate
+        self.epochs = epochs
+        self.weights: Optional[np.ndarray] = None
+        self.bias: Optional[np.ndarray] = None
+
+    def predict_proba(self, X: SparseRows) -> np.ndarray:
+        logits = X.dot(self.weights) + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def fit(self, X: SparseRows, y: np.ndarray) -> "SoftmaxRegression":
+        self.weights = np.zeros((X.n_features, self.n_classes))
+        self.bias = np.log(np.bincount(y, minlength=self.n_classes) + 1.0)
+        targets = np.eye(self.n_classes)[y]
+
+        # Only buckets present in the training rows are ever updated
+        active = np.unique(X.indices)
+        m_w = np.zeros((len(active), self.n_classes))
+        v_w = np.zeros_like(m_w)
+        m_b = np.zeros(self.n_classes)
+        v_b = np.zeros(self.n_classes)
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+
+        for step in range(1, self.epochs + 1):
+            residuals = (self.predict_proba(X) - targets) / X.n_rows
+            grad_w = X.tdot(residuals)[active] + self.l2 * self.weights[active]
+            grad_b = residuals.sum(axis=0)
+
+            m_w = beta1 * m_w + (1 - beta1) * grad_w
+            v_w = beta2 * v_w + (1 - beta2) * grad_w ** 2
+            m_b = beta1 * m_b + (1 - beta1) * grad_b
+            v_b = beta2 * v_b + (1 - beta2) * grad_b ** 2
+            correction1 = 1 - beta1 ** step
+            correction2 = 1 - beta2 ** step
+
+            self.weights[active] -= (
+                self.learning_rate * (m_w / correction1) / (np.sqrt(v_w / correction2) + eps)
+            )
+            self.bias -= self.learning_rate * (m_b / correction1) / (np.sqrt(v_b / correction2) + eps)
+
+        return self
+
+
+class LocalRelevanceClassifier:
+    """
+    keep/severity classifier trained on LLM verdicts
+
+    The keep model is trained on every label; the severity model only on
+    kept items with a severity.
+    """
+
+    def __init__(self, n_features: int = 2 ** 18, epochs: int = 200, l2: float = 1e-4):
+        self.vectorizer = HashedTfidfVectorizer(n_features=n_features)
+        self.keep_model = SoftmaxRegression(2, l2=l2, epochs=epochs)
+        self.severity_model: Optional[SoftmaxRegression] = None
+        self.epochs = epochs
+        self.l2 = l2
+        self.metadata: Dict = {}
+
+    def fit(self, items: List[Dict]) -> "LocalRelevanceClassifier":
+        """
+        Train on labelled items
+
+        Args:
+            items: Dicts with title, body, keep and (for kept items) severity
+        """
+        texts = [item_text(item) for item in items]
+        X = self.vectorizer.fit(texts).transform(texts)
+        keep = np.array([1 if item.get('keep') else 0 for item in items])
+        self.keep_model.fit(X, keep)
+
+        severity_rows = [
+            i for i, item in enumerate(items)
+            if item.get('keep') and item.get('severity') in SEVERITIES
+        ]
+        severity_classes = {items[i]['severity'] for i in severity_rows}
+        if len(severity_classes) >= 2:
+            self.severity_model = SoftmaxRegression(len(SEVERITIES), l2=self.l2, epochs=self.epochs)
+            self.severity_model.fit(
+                X.take(severity_rows),
+                np.array([SEVERITIES.index(items[i]['severity']) for i in severity_rows])
+            )
+        else:
+            self.severity_model = None
+
+        self.metadata = {
+            'trained_at': datetime.now().isoformat(),
+            'samples': len(items),
+            'kept': int(keep.sum()),
+            'severity_samples': len(severity_rows)
+        }
+        logger.info(
+            f"✅ Local classifier trained on {len(items)} labels "
+            f"({self.metadata['kept']} kept, {len(severity_rows)} with severity)"
+        )
+        return self
+
+    def predict(self, items: List[Dict]) -> List[Dict]:
+        """
+        Predict keep probability and severity
+
+        Returns:
+            One dict per item with keep_probability, severity and
+            severity_probability (severity is None without a severity model)
+        """
+        if not items:
+            return []
+        X = self.vectorizer.transform([item_text(item) for item in items])
+        keep_proba = self.keep_model.predict_proba(X)[:, 1]
+        severity_proba = self.severity_model.predict_proba(X) if self.severity_model else None
+
+        predictions = []
+        for i, p_keep in enumerate(keep_proba):
+            prediction = {'keep_probability': float(p_keep), 'severity': None, 'severity_probability': 0.0}
+            if severity_proba is not None:
+                best = int(severity_proba[i].argmax())
+                prediction['severity'] = SEVERITIES[best]
+                prediction['severity_probability'] = float(severity_proba[i][best])
+            predictions.append(prediction)
+        return predictions
+
+    @property
+    def model_id(self) -> str:
+        """Short identifier of the trained model (changes on every training)"""
+        stamp = self.metadata.get('trained_at', '')
+        return f"local-{zlib.crc32(stamp.encode('utf-8')):08x}"
+
+    def save(self, path: str):
+        """Save the model to a .npz file"""
+        arrays = {
+            'idf': self.vectorizer.idf,
+            'keep_weights': self.keep_model.weights,
+            'keep_bias': self.keep_model.bias,
+        }
+        if self.severity_model:
+            arrays['severity_weights'] = self.severity_model.weights
+            arrays['severity_bias'] = self.severity_model.bias
+        meta = {**self.metadata, 'n_features': self.vectorizer.n_features,
+                'min_df': self.vectorizer.min_df}
+        np.savez_compressed(path, meta=np.array(json.dumps(meta)), **arrays)
+        logger.info(f"💾 Local classifier saved to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "LocalRelevanceClassifier":
+        """Load a model saved with save()"""
+        with np.load(path) as archive:
+            meta = json.loads(str(archive['meta']))
+            model = cls(n_features=meta['n_features'])
+            model.vectorizer.min_df = meta['min_df']
+            model.vectorizer.idf = archive['idf']
+            model.keep_model.weights = archive['keep_weights']
+            model.keep_model.bias = archive['keep_bias']
+            if 'severity_weights' in archive:
+                model.severity_model = SoftmaxRegression(len(SEVERITIES))
+                model.severity_model.weights = archive['severity_weights']
+                model.severity_model.bias = archive['severity_bias']
+            model.metadata = {k: v for k, v in meta.items() if k not in ('n_features', 'min_df')}
+        return model
@@ -0,0 +1,208 @@
+"""
+Local-first scorer - distilled classifier answers confident items, the
+LLM scorer gets the rest
+"""
+import logging
+from typing import Dict, List, Optional
+
+from local_classifier import LocalRelevanceClassifier
+from prompts.token_budget import split_sentences
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class LocalFirstScorer:
+    """
+    Scorer stage in front of an LLM scorer
+
+    Items whose keep probability is at most 1 - threshold are discarded
+    locally. With allow_local_keep, items at or above the threshold whose
+    severity is low/medium with the same confidence are kept locally too;
+    high/critical items always go to the LLM, since they trigger alerts.
+    Everything else is deferred to the wrapped scorer.
+
+    Exposes the same interface as ADKScorerV3 (score, evaluate,
+    score_batch, get_run_stats, reset_run_stats, get_stats).
+    """
+
+    LOCAL_KEEP_SEVERITIES = ('low', 'medium')
+
+    def __init__(
+        self,
+        classifier: LocalRelevanceClassifier,
+        llm_scorer,
+        threshold: float = 0.9,
+        allow_local_keep: bool = False
+    ):
+        """
+        Initialize local-first scorer
+
+        Args:
+            classifier: Trained LocalRelevanceClassifier
+            llm_scorer: Scorer used when the classifier is not confident
+            threshold: Confidence required to answer locally (0.5-1.0)
+            allow_local_keep: Also answer confident low/medium keeps locally
+        """
+        self.classifier = classifier
+        self.llm = llm_scorer
+        self.threshold = threshold
+        self.allow_local_keep = allow_local_keep
+        # Rows the LLM would produce keep the LLM version; local keeps are
+        # stamped with the model id so the re-scoring job revisits them
+        self.scorer_version = llm_scorer.scorer_version
+        self.reset_run_stats()
+
+        logger.info(
+            f"✅ Local-first scorer: {classifier.model_id} "
+            f"({classifier.metadata.get('samples', '?')} labels, threshold {threshold:.2f}, "
+            f"local keeps {'on' if allow_local_keep else 'off'}) → {type(llm_scorer).__name__}"
+        )
+
+    def local_verdict(self, news_item: Dict, prediction: Dict) -> Optional[Dict]:
+        """
+        Build a verdict from a classifier prediction, or None to defer
+
+        Args:
+            news_item: News item being scored
+            prediction: One entry of LocalRelevanceClassifier.predict()
+        """
+        p_keep = prediction['keep_probability']
+
+        if p_keep <= 1 - self.threshold:
+            return {
+                'keep': False,
+                'severity': None,
+                'tags': [],
+                'area': None,
+                'entities': [],
+                'summary': None,
+                'relevance_score': round(p_keep, 3),
+                'reasoning': f"Discarded by local classifier (p_keep={p_keep:.3f})",
+                'local': True
+            }
+
+        if (
+            self.allow_local_keep
+            and p_keep >= self.threshold
+            and prediction['severity'] in self.LOCAL_KEEP_SEVERITIES
+            and prediction['severity_probability'] >= self.threshold
+        ):
+            sentences = split_sentences(news_item.get('body', ''))
+            return {
+                'keep': True,
+                'severity': prediction['severity'],
+                'tags': ['local_classifier'],
+                'area': 'Desconocida',
+                'entities': [],
+                'summary': sentences[0] if sentences else news_item.get('title', ''),
+                'relevance_score': round(p_keep, 3),
+                'reasoning': (
+                    f"Kept by local classifier (p_keep={p_keep:.3f}, "
+                    f"p_severity={prediction['severity_probability']:.3f})"
+                ),
+                'local': True
+            }
+
+        return None
+
+    def _merge_local(self, news_item: Dict, verdict: Dict) -> Optional[Dict]:
+        if not verdict['keep']:
+            self.local_stats['discarded'] += 1
+            return None
+        self.local_stats['kept'] += 1
+        return {**news_item, **verdict, 'scorer_version': self.classifier.model_id}
+
+    def score(self, news_item: Dict) -> Optional[Dict]:
+        """
+        Score a news item locally if confident, otherwise with the LLM
+
+        Returns:
+            Enriched news item, or None if not relevant
+
+        Raises:
+            ScoringError: If the item was deferred and the LLM failed
+        """
+        verdict = self.local_verdict(news_item, self.classifier.predict([news_item])[0])
+        if verdict is not None:
+            return self._merge_local(news_item, verdict)
+        self.local_stats['deferred'] += 1
+        return self.llm.score(news_item)
+
+    def evaluate(self, news_item: Dict) -> Dict:
+        """Get the verdict for a news item, kept or not"""
+        verdict = self.local_verdict(news_item, self.classifier.predict([news_item])[0])
+        if verdict is not None:
+            self.local_stats['kept' if verdict['keep'] else 'discarded'] += 1
+            if verdict['keep']:
+                verdict['scorer_version'] = self.classifier.model_id
+            return verdict
+        self.local_stats['deferred'] += 1
+        return self.llm.evaluate(news_item)
+
+    def score_batch(self, news_items: List[Dict]) -> List[Dict]:
+        """
+        Score multiple news items; deferred items go to the LLM as one batch
+
+        Returns:
+            List of enriched news items (only items with keep=true)
+        """
+        enriched_items = []
+        deferred = []
+        for item, prediction in zip(news_items, self.classifier.predict(news_items)):
+            verdict = self.local_verdict(item, prediction)
+            if verdict is None:
+                deferred.append(item)
+                continue
+            result = self._merge_local(item, verdict)
+            if result:
+                enriched_items.append(result)
+
+        self.local_stats['deferred'] += len(deferred)
+        if deferred:
+            enriched_items.extend(self.llm.score_batch(deferred))
+        return enriched_items
+
+    def reset_run_stats(self):
+        """Reset local and LLM run counters"""
+        self.llm.reset_run_stats()
+        self.local_stats = {'kept': 0, 'discarded': 0, 'deferred': 0}
+
+    def get_run_stats(self) -> Dict:
+        """
+        Get run counters since the last reset
+
+        Returns:
+            The LLM scorer's run counters with local answers added to kept and
+            discarded, plus a 'local' dict with local/deferred counts and the
+            share of items that never reached the LLM
+        """
+        stats = self.llm.get_run_stats()
+        local = self.local_stats
+        answered = local['kept'] + local['discarded']
+        total = answered + local['deferred']
+
+        stats['kept'] = stats.get('kept', 0) + local['kept']
+        stats['discarded'] = stats.get('discarded', 0) + local['discarded']
+        stats['local'] = {
+            'kept': local['kept'],
+            'discarded': local['discarded'],
+            'deferred': local['deferred'],
+            'local_rate': answered / total if total else 0.0
+        }
+        return stats
+
+    def close(self):
+        """Release the LLM scorer's resources"""
+        self.llm.close()
+
+    def get_stats(self) -> Dict:
+        """Get classifier and LLM scorer configuration"""
+        return {
+            'mode': 'local_first',
+            'classifier': {'model_id': self.classifier.model_id, **self.classifier.metadata},
+            'threshold': self.threshold,
+            'allow_local_keep': self.allow_local_keep,
+            'llm': self.llm.get_stats(),
+            'run_stats': self.get_run_stats()
+        }
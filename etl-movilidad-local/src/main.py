@@ -2,28 +2,27 @@
 Main ETL Pipeline for Movilidad Medellín
 Orchestrates extraction, scoring, storage, and alerts
 """
+import argparse
 import os
 import sys
 import time
 import logging
-from datetime import datetime
-from typing import Dict, List
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
-# Import modules
-from extractors_apify_simple import HybridApifyExtractor as NewsExtractor
-from adk_scorer_v3 import ADKScorerV3
-from adk_scorer import MockADKScorer  # Keep mock for testing
+# Import modules (scorer, extractor and database backends are imported
+# on demand through the registry; see backends.py)
+from backends import load_backend
+from factories import build_database, build_incident_index, build_scorer, with_gazetteer, with_local_classifier
+from rate_limiter import ScoringError, classify_error
 from alert_manager import AlertManager, ConsoleOnlyAlertManager
-
-# Database imports - support both SQLite and Supabase
-try:
-    from db_supabase import SupabaseNewsDatabase
-    SUPABASE_AVAILABLE = True
-except ImportError:
-    SUPABASE_AVAILABLE = False
-
-from db import NewsDatabase as SQLiteDatabase
+from alert_outbox import AlertDispatcher
+from dead_letter import DeadLetterQueue
+from urgency import urgency
+from metrics import METRICS, InstrumentedDatabase
+from streaming_run import StreamingRun
+from worker_pool import WorkerPoolRun
 
 # Create logs directory if it doesn't exist
 os.makedirs('logs', exist_ok=True)
@@ -72,33 +71,35 @@ class ETLPipeline:
         """
         logger.info("Initializing ETL Pipeline...")
 
-        # Initialize database
-        if use_supabase:
-            if not SUPABASE_AVAILABLE:
-                raise ImportError(
-                    "Supabase not available. Install with: pip install supabase"
-                )
-            logger.info("Using Supabase database")
-            self.db = SupabaseNewsDatabase()
-        else:
-            logger.info("Using SQLite database")
-            self.db = SQLiteDatabase()
+        # Every database call is timed in etl_db_seconds{op}
+        self.db = InstrumentedDatabase(build_database(use_supabase), METRICS)
 
         # Initialize extractor
-        self.extractor = NewsExtractor()
+        self.extractor = load_backend('extractor', 'hybrid')()
 
-        # Initialize ADK scorer
-        if use_mock_adk:
-            logger.warning("Using MockADKScorer - for testing only!")
-            self.scorer = MockADKScorer()
-        else:
-            if not project_id:
-                raise ValueError("project_id required when not using mock ADK")
-            self.scorer = ADKScorerV3(
-                project_id=project_id,
-                location=os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
-                model_name=os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
-            )
+        # Initialize ADK scorer (LLM verdicts are kept as training labels)
+        label_sink = (
+            self.db.save_scoring_label
+            if os.getenv("RECORD_SCORING_LABELS", "true").lower() == "true" else None
+        )
+        self.scorer = with_gazetteer(with_local_classifier(build_scorer(project_id, use_mock_adk, label_sink)))
+
+        # Reports of the same event are grouped into incidents, alerted once
+        self.incidents = build_incident_index(self.db)
+
+        # Items that fail scoring are retried on later runs with backoff
+        self.dead_letters = DeadLetterQueue(
+            self.db,
+            max_attempts=int(os.getenv("DEAD_LETTER_MAX_ATTEMPTS", "5")),
+            base_delay_minutes=float(os.getenv("DEAD_LETTER_BASE_DELAY_MINUTES", "15")),
+            max_retries_per_run=int(os.getenv("DEAD_LETTER_MAX_RETRIES_PER_RUN", "20"))
+        )
+
+        # Time budget of a batch run (0 = none); items that do not fit are
+        # deferred to the next run, most urgent scored first
+        self.run_budget = float(os.getenv("RUN_TIME_BUDGET_SECONDS", "0"))
+        # Seconds of the budget kept for saving, alerting and logging
+        self.budget_reserve = float(os.getenv("RUN_BUDGET_RESERVE_SECONDS", "30"))
 
         # Initialize alert manager
         if enable_email_alerts:
@@ -109,32 +110,451 @@ class ETLPipeline:
                 smtp_user=os.getenv("SMTP_USER"),
                 smtp_password=os.getenv("SMTP_PASSWORD"),
                 alert_recipients=os.getenv("ALERT_RECIPIENTS", "").split(","),
+                smtp_starttls=os.getenv("SMTP_STARTTLS", "true").lower() == "true",
                 console_alerts=True,
                 file_alerts=True
             )
         else:
             self.alert_manager = ConsoleOnlyAlertManager()
 
-        logger.info("ETL Pipeline initialized successfully")
+        # Alerts are written to the outbox with the news item and delivered
+        # per channel, with retries, by the dispatcher
+        self.alert_dispatcher = AlertDispatcher(
+            self.db,
+            self.alert_manager,
+            max_attempts=int(os.getenv("ALERT_OUTBOX_MAX_ATTEMPTS", "6")),
+            base_delay_seconds=float(os.getenv("ALERT_OUTBOX_BASE_DELAY_SECONDS", "30")),
+            max_delay_seconds=float(os.getenv("ALERT_OUTBOX_MAX_DELAY_SECONDS", "3600")),
+            lease_seconds=float(os.getenv("ALERT_OUTBOX_LEASE_SECONDS", "300")),
+            poll_seconds=float(os.getenv("ALERT_OUTBOX_POLL_SECONDS", "15"))
+        )
 
-    def run(self) -> Dict:
-        """
-        Run complete ETL pipeline
+        logger.info("ETL Pipeline initialized successfully")
 
-        Returns:
-            Dict with execution statistics
-        """
-        start_time = time.time()
-        stats = {
+    @staticmethod
+    def _new_stats() -> Dict:
+        """Empty execution stats (same keys for batch and streaming runs)"""
+        return {
             'extracted': 0,
             'deduplicated': 0,
             'scored': 0,
             'kept': 0,
             'discarded': 0,
+            'failed': 0,
+            'dead_lettered': 0,
+            'dead_letter_retries': 0,
+            'deferred': 0,
+            'oldest_deferred_age': 0,
+            'throttled': 0,
+            'retries': 0,
+            'timeouts': 0,
+            'hedged': 0,
+            'local_answers': 0,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'avg_tokens_per_item': 0,
             'alerted': 0,
+            'fast_alerts': 0,
             'errors': []
         }
 
+    def _record_scorer_stats(self, stats: Dict):
+        """Copy the scorer's run counters into the execution stats and log them"""
+        scorer_stats = self.scorer.get_run_stats()
+        stats['throttled'] = scorer_stats.get('throttled', 0)
+        stats['retries'] = scorer_stats.get('retried', 0)
+        stats['timeouts'] = scorer_stats.get('timeouts', 0)
+        stats['hedged'] = scorer_stats.get('hedged', 0)
+        stats['input_tokens'] = scorer_stats.get('input_tokens', 0)
+        stats['output_tokens'] = scorer_stats.get('output_tokens', 0)
+        metered = scorer_stats.get('metered_calls', 0)
+        stats['avg_tokens_per_item'] = (
+            (stats['input_tokens'] + stats['output_tokens']) / metered if metered else 0
+        )
+
+        logger.info(
+            f"✓ Scored {stats['scored']} items: "
+            f"{stats['kept']} kept, {stats['discarded']} discarded, "
+            f"{stats['failed']} failed ({stats['retries']} retries, "
+            f"{stats['throttled']} throttled)"
+        )
+        if 'cascade' in scorer_stats:
+            stats['cascade'] = scorer_stats['cascade']
+            logger.info(
+                f"  Cascade: {stats['cascade']['escalated']} escalated "
+                f"({stats['cascade']['escalation_rate']:.0%})"
+            )
+        if scorer_stats.get('early_exits'):
+            early_exits = scorer_stats['early_exits']
+            stats['early_exits'] = early_exits
+            stats['saved_output_tokens'] = scorer_stats.get('saved_output_tokens', 0)
+            stats['early_exit_latency'] = scorer_stats.get('early_exit_seconds', 0) / early_exits
+            full_discards = scorer_stats.get('full_discards', 0)
+            logger.info(
+                f"  Streaming: {early_exits} early discards "
+                f"(~{stats['saved_output_tokens']} output tokens saved, "
+                f"{stats['early_exit_latency']:.2f}s per early discard"
+                + (f" vs {scorer_stats['full_discard_seconds'] / full_discards:.2f}s full"
+                   if full_discards else "")
+                + ")"
+            )
+        if 'local' in scorer_stats:
+            local = scorer_stats['local']
+            stats['local_answers'] = local['kept'] + local['discarded']
+            logger.info(
+                f"  Local classifier: {stats['local_answers']} answered locally "
+                f"({local['local_rate']:.0%}), {local['deferred']} sent to the LLM"
+            )
+        gazetteer = scorer_stats.get('gazetteer')
+        if gazetteer and (gazetteer['hinted'] or gazetteer['preset'] or gazetteer['filled'] or gazetteer['canonicalized']):
+            stats['gazetteer_preset'] = gazetteer['preset']
+            logger.info(
+                f"  Gazetteer: {gazetteer['hinted']} hinted, {gazetteer['preset']} places set locally, "
+                f"{gazetteer['filled']} areas filled, {gazetteer['canonicalized']} respelled"
+            )
+        if stats['timeouts'] or stats['hedged']:
+            logger.info(
+                f"  Tail latency: {stats['timeouts']} calls timed out, "
+                f"{stats['hedged']} hedged ({scorer_stats.get('hedge_wins', 0)} hedges answered first)"
+            )
+        latency = scorer_stats.get('latency')
+        if latency and latency.get('count'):
+            stats['model_latency_p95'] = latency['p95']
+            logger.info(
+                f"  Model latency: p50 {latency['p50']:.2f}s | "
+                f"p95 {latency['p95']:.2f}s | p99 {latency['p99']:.2f}s"
+            )
+        if metered:
+            logger.info(
+                f"  Tokens: {stats['input_tokens']} in / {stats['output_tokens']} out "
+                f"({stats['avg_tokens_per_item']:.0f} per item)"
+            )
+
+    def _begin_run(self, mode: str):
+        """Start per-run metrics (see metrics.py)"""
+        METRICS.start_run()
+        METRICS.inc('etl_runs_total', mode=mode)
+        # Also picks up outbox rows earlier runs left undelivered
+        self.alert_dispatcher.start()
+        coalescer = self.alert_manager.coalescer
+        self._coalesced_before = coalescer.stats['coalesced'] if coalescer else 0
+
+    @staticmethod
+    def _run_timings() -> Dict:
+        """
+        Timings of the current run for execution_log
+
+        Returns:
+            Dict with stage and source seconds, and count/total/p50/p95/p99
+            of model calls, prompt bytes, database operations and time-to-alert
+        """
+        # Batch runs time whole stages; streaming runs the busy time per stage
+        stages = (
+            METRICS.run_summary('etl_stage_seconds')
+            or METRICS.run_summary('etl_stage_item_seconds')
+        )
+        return {
+            'stages': {stage: round(s['total'], 3) for stage, s in stages.items()},
+            'sources': {
+                source: round(s['total'], 3)
+                for source, s in METRICS.run_summary('etl_source_seconds').items()
+            },
+            'scoring_calls': METRICS.run_summary('etl_scoring_call_seconds'),
+            'prompt_bytes': METRICS.run_summary('etl_scoring_prompt_bytes'),
+            'db': METRICS.run_summary('etl_db_seconds'),
+            'time_to_alert': METRICS.run_summary('etl_time_to_alert_seconds').get('all', {})
+        }
+
+    def _finish(self, stats: Dict, start_time: float):
+        """Store duration, log the execution and print the summary"""
+        # Calculate duration
+        duration = time.time() - start_time
+        stats['duration'] = duration
+        # Deliveries started by this run (later retries stay in the outbox)
+        self.alert_dispatcher.wait_idle(float(os.getenv("ALERT_OUTBOX_DRAIN_SECONDS", "60")))
+        outbox = self.db.get_outbox_counts()
+        if outbox.get('pending') or outbox.get('failed'):
+            logger.warning(
+                f"  Alert outbox: {outbox.get('pending', 0)} deliveries waiting to retry, "
+                f"{outbox.get('failed', 0)} given up"
+            )
+        stats['timings'] = self._run_timings()
+        if stats['timings']['stages']:
+            logger.info("  Stage timings: " + " | ".join(
+                f"{stage} {seconds:.2f}s" for stage, seconds in stats['timings']['stages'].items()
+            ))
+
+        # Seconds from extraction to alert delivered on every channel, per item
+        time_to_alert = stats['timings']['time_to_alert']
+        if time_to_alert:
+            stats['time_to_alert'] = time_to_alert
+            logger.info(
+                f"  Time to alert: p50 {time_to_alert['p50']:.2f}s | "
+                f"p95 {time_to_alert['p95']:.2f}s over {time_to_alert['count']} alerts"
+            )
+
+        # Alerts folded into an area digest instead of sent on their own
+        coalescer = self.alert_manager.coalescer
+        if coalescer is not None:
+            stats['alerts_coalesced'] = coalescer.stats['coalesced'] - self._coalesced_before
+            if stats['alerts_coalesced']:
+                logger.info(
+                    f"  Alerts: {stats['alerted'] - stats['alerts_coalesced']} sent, "
+                    f"{stats['alerts_coalesced']} coalesced into digests"
+                )
+
+        # Log execution stats
+        self.db.log_execution(stats)
+
+        textfile = os.getenv("METRICS_TEXTFILE")
+        if textfile:
+            METRICS.write_textfile(textfile)
+
+        # Print summary
+        logger.info("="*60)
+        logger.info("ETL Pipeline execution complete")
+        logger.info(f"Duration: {duration:.2f} seconds")
+        logger.info(f"Stats: {stats}")
+        logger.info("="*60)
+
+    def _alert_channels(self, news: Dict) -> Optional[List[str]]:
+        """
+        Outbox channels to write with a news item (None below high severity,
+        and for further reports of an incident that do not raise its severity)
+        """
+        if news.get('severity') in ['high', 'critical'] and news.get('incident_alert', True):
+            return self.alert_dispatcher.channel_names()
+        return None
+
+    def _assign_incident(self, news: Dict):
+        """Match a kept item to its incident before it is stored"""
+        if self.incidents is None or self.db.is_duplicate(news['url']):
+            return
+        try:
+            self.incidents.assign(news)
+        except Exception as e:
+            # Stored without an incident; alerted on its own
+            logger.error(f"Error matching {news['url']} to an incident: {e}")
+
+    def _save_news(self, news: Dict) -> bool:
+        """
+        Insert a scored item and advance its stage (saved for high/critical
+        items still to alert, done otherwise); the item is matched to its
+        incident first, and alerting items get their alert outbox rows in
+        the same transaction
+
+        Returns:
+            True if the item was inserted (news gets its 'id')
+        """
+        self._assign_incident(news)
+        news_id = self.db.insert_news(news, alert_channels=self._alert_channels(news))
+        if news_id:
+            # Add ID for alert tracking
+            news['id'] = news_id
+            high = news.get('severity') in ['high', 'critical']
+            # The payload keeps the incident decision for resume
+            self.db.update_stage(news['url'], 'saved' if high else 'done', payload=news, news_id=news_id)
+            return True
+        if self.db.is_duplicate(news['url']):
+            # Stored before (e.g. by the run that was interrupted)
+            self.db.update_stage(news['url'], 'done')
+        return False
+
+    def _send_alert(self, news: Dict, since_extraction: Optional[float] = None) -> bool:
+        """
+        Start delivering a saved high/critical item's alert
+
+        The item's outbox rows are leased before delivery, so the fast path,
+        STEP 5, resume and other processes never deliver a channel twice;
+        the dispatcher retries failed channels and sets alerted once every
+        channel confirmed delivery.
+
+        Args:
+            news: Saved news item ('id' when it was inserted)
+            since_extraction: Seconds since the item was extracted (time-to-alert)
+
+        Returns:
+            True if the alert is in the outbox (being delivered or delivered)
+        """
+        news_id = news.get('id')
+        if news_id is None:
+            # Stored before: the outbox rows written with it carry its alert
+            logger.info(f"Alert for {news['url']} left to the outbox of the run that stored it")
+            return False
+        if not self._alert_channels(news):
+            # A further report of an incident already alerted
+            self.db.update_stage(news['url'], 'done')
+            return False
+
+        # Repairs items stored without outbox rows (older versions); rows
+        # already queued are left alone
+        self.db.enqueue_alerts(news_id, self.alert_dispatcher.channel_names(), news)
+        self.db.update_stage(news['url'], 'done')
+        started_at = time.time() - since_extraction if since_extraction is not None else None
+        if not self.alert_dispatcher.dispatch(news_id, started_at):
+            logger.debug(f"Alert for {news['url']} already delivered or in progress")
+        return True
+
+    def _score_save_alert(
+        self,
+        stats: Dict,
+        to_score: List[Dict],
+        to_save: List[Dict] = None,
+        to_alert: List[Dict] = None,
+        deadline: Optional[float] = None,
+        extracted_at: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Steps 3-5 over staged items; every item's stage is written to the
+        database as soon as it completes, so a crash loses no finished work
+
+        High/critical verdicts take a fast path: the item is saved and alerted
+        as soon as it is scored instead of after the whole batch.
+
+        Args:
+            stats: Execution stats to update
+            to_score: Items that still need scoring, in scoring order
+            to_save: Already scored (enriched) items not yet saved
+            to_alert: Saved high/critical items (with 'id') not yet alerted
+            deadline: time.time() after which no item starts scoring (None = no limit)
+            extracted_at: time.time() when extraction finished (for time-to-alert)
+
+        Returns:
+            The items left unscored because the next one would pass the deadline
+        """
+        # STEP 3: Score with ADK
+        logger.info("STEP 3: Scoring news with ADK...")
+        self.scorer.reset_run_stats()
+        scored_news = list(to_save or [])
+        high_severity = list(to_alert or [])
+        saved_count = 0
+        deferred = []
+        score_seconds = 0.0
+        with METRICS.timer('etl_stage_seconds', stage='score'):
+            for index, news in enumerate(to_score):
+                # Stop when the next item is expected to finish past the deadline
+                expected = score_seconds / index if index else 0.0
+                if deadline is not None and time.time() + expected > deadline:
+                    deferred = to_score[index:]
+                    break
+                started = time.time()
+                try:
+                    result = self.scorer.score(news)
+                    stats['scored'] += 1
+
+                    if result:
+                        self.db.update_stage(news['url'], 'scored', payload=result)
+                        stats['kept'] += 1
+                        if result.get('severity') in ['high', 'critical']:
+                            # Fast path: save and alert now; STEP 5 retries a send
+                            # that raised (False means there is nothing to send)
+                            saved_count += self._save_news(result)
+                            waited = time.time() - extracted_at if extracted_at else None
+                            try:
+                                if self._send_alert(result, waited):
+                                    stats['alerted'] += 1
+                                    stats['fast_alerts'] += 1
+                            except Exception as e:
+                                logger.error(f"Error alerting {result['url']}, retrying in STEP 5: {e}")
+                                high_severity.append(result)
+                        else:
+                            scored_news.append(result)
+                    else:
+                        self.db.update_stage(news['url'], 'discarded')
+                        stats['discarded'] += 1
+                    self.dead_letters.resolve(news['url'])
+
+                except ScoringError as e:
+                    # Not a discard: the model never gave a verdict
+                    stats['failed'] += 1
+                    stats['errors'].append(f"[{e.error_class}] {e}")
+                    self.dead_letters.record_failure(news, e.error_class, str(e))
+                    stats['dead_lettered'] += 1
+                except Exception as e:
+                    logger.error(f"Error scoring news: {e}")
+                    stats['failed'] += 1
+                    stats['errors'].append(str(e))
+                    self.dead_letters.record_failure(news, classify_error(e), str(e))
+                    stats['dead_lettered'] += 1
+                finally:
+                    score_seconds += time.time() - started
+
+        self._record_scorer_stats(stats)
+        if stats['fast_alerts']:
+            logger.info(f"✓ Sent {stats['fast_alerts']} alerts as soon as they were scored")
+
+        if len(scored_news) == 0 and not high_severity:
+            logger.info("No more news to save or alert. Pipeline complete.")
+            return deferred
+
+        # STEP 4: Save to database
+        logger.info("STEP 4: Saving to database...")
+        with METRICS.timer('etl_stage_seconds', stage='save'):
+            for news in scored_news:
+                saved_count += self._save_news(news)
+
+        logger.info(f"✓ Saved {saved_count} news items to database")
+
+        # STEP 5: Send the alerts the fast path did not
+        logger.info("STEP 5: Sending alerts for high severity news...")
+        high_severity += [
+            n for n in scored_news
+            if n.get('severity') in ['high', 'critical']
+        ]
+
+        if high_severity:
+            sent = 0
+            with METRICS.timer('etl_stage_seconds', stage='alert'):
+                for news in high_severity:
+                    waited = time.time() - extracted_at if extracted_at else None
+                    if self._send_alert(news, waited):
+                        sent += 1
+            stats['alerted'] += sent
+
+            logger.info(f"✓ Sent {sent} alerts")
+        else:
+            logger.info("✓ No high severity news to alert")
+
+        return deferred
+
+    def _defer(self, stats: Dict, deferred: List[Dict], staged_at: Dict[str, str], retry_urls: set):
+        """
+        Leave the items that did not fit the time budget for the next run
+
+        Args:
+            stats: Execution stats to update (deferred, oldest_deferred_age)
+            deferred: Unscored items
+            staged_at: URL → staging time (UTC) of items deferred by earlier runs
+            retry_urls: Dead-letter retries (the dead-letter queue offers them again)
+        """
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        oldest = 0.0
+        for news in deferred:
+            if news['url'] not in retry_urls:
+                self.db.update_stage(news['url'], 'deferred')
+            if news['url'] in staged_at:
+                since = datetime.fromisoformat(str(staged_at[news['url']]))
+                if since.tzinfo is not None:
+                    since = since.astimezone(timezone.utc).replace(tzinfo=None)
+                oldest = max(oldest, (now - since).total_seconds())
+        stats['deferred'] = len(deferred)
+        stats['oldest_deferred_age'] = oldest
+        logger.warning(
+            f"⏱️ Time budget reached: {len(deferred)} items deferred to the next run "
+            f"(oldest waiting {oldest / 60:.0f} min)"
+        )
+
+    def run(self) -> Dict:
+        """
+        Run complete ETL pipeline
+
+        Returns:
+            Dict with execution statistics
+        """
+        start_time = time.time()
+        stats = self._new_stats()
+        self._begin_run('batch')
+
         logger.info("="*60)
         logger.info("Starting ETL Pipeline execution")
         logger.info("="*60)
@@ -142,89 +562,119 @@ class ETLPipeline:
         try:
             # STEP 1: Extract
             logger.info("STEP 1: Extracting news from sources...")
-            raw_news = self.extractor.extract_all()
+            with METRICS.timer('etl_stage_seconds', stage='extract'):
+                raw_news = self.extractor.extract_all()
+            extracted_at = time.time()
             stats['extracted'] = len(raw_news)
             logger.info(f"✓ Extracted {stats['extracted']} news items")
 
-            if stats['extracted'] == 0:
+            # Dead-lettered items whose retry time has come
+            retries = self.dead_letters.due_items()
+            stats['dead_letter_retries'] = len(retries)
+
+            # Items earlier runs deferred for lack of time
+            carried = self.db.get_deferred_items()
+
+            if stats['extracted'] == 0 and not retries and not carried:
                 logger.warning("No news extracted. Pipeline complete.")
                 return stats
 
             # STEP 2: Deduplicate
             logger.info("STEP 2: Deduplicating news...")
-            unique_news = []
-            for news in raw_news:
-                if not self.db.is_duplicate(news['url']):
-                    unique_news.append(news)
-                else:
-                    stats['deduplicated'] += 1
+            with METRICS.timer('etl_stage_seconds', stage='dedup'):
+                unique_news = []
+                for news in raw_news:
+                    if not self.db.is_duplicate(news['url']):
+                        unique_news.append(news)
+                    else:
+                        stats['deduplicated'] += 1
+
+                # Stage the unique items; ones an earlier run already scored or
+                # discarded are not scored again
+                to_score = self.db.stage_items(unique_news)
+            already_staged = len(unique_news) - len(to_score)
+            stats['deduplicated'] += already_staged
 
             logger.info(
-                f"✓ Deduplicated: {stats['deduplicated']} duplicates found, "
-                f"{len(unique_news)} unique items"
+                f"✓ Deduplicated: {stats['deduplicated']} duplicates found "
+                f"({already_staged} already staged), {len(to_score)} unique items"
             )
 
-            if len(unique_news) == 0:
+            # Deferred items compete for this run's budget; each URL is scored
+            # once even if it was also extracted or is a retry
+            candidates = {}
+            for news in to_score + [item['news'] for item in carried] + retries:
+                candidates.setdefault(news['url'], news)
+            to_score = list(candidates.values())
+            if len(to_score) == 0:
                 logger.info("No new unique news. Pipeline complete.")
                 return stats
 
-            # STEP 3: Score with ADK
-            logger.info("STEP 3: Scoring news with ADK...")
-            scored_news = []
-            for news in unique_news:
-                try:
-                    result = self.scorer.score(news)
-                    stats['scored'] += 1
+            # Most urgent first, so what does not fit the budget matters least
+            now = datetime.now()
+            to_score.sort(key=lambda news: urgency(news, now), reverse=True)
+            deadline = (
+                start_time + self.run_budget - self.budget_reserve if self.run_budget else None
+            )
+            if carried:
+                logger.info(f"✓ {len(carried)} items carried over from earlier runs")
 
-                    if result:
-                        scored_news.append(result)
-                        stats['kept'] += 1
-                    else:
-                        stats['discarded'] += 1
+            deferred = self._score_save_alert(
+                stats, to_score, deadline=deadline, extracted_at=extracted_at
+            )
+            if deferred:
+                self._defer(
+                    stats, deferred,
+                    {item['news']['url']: item['staged_at'] for item in carried},
+                    {news['url'] for news in retries}
+                )
 
-                except Exception as e:
-                    logger.error(f"Error scoring news: {e}")
-                    stats['errors'].append(str(e))
+        except Exception as e:
+            logger.error(f"Pipeline error: {e}")
+            stats['errors'].append(str(e))
+            raise
 
-            logger.info(
-                f"✓ Scored {stats['scored']} items: "
-                f"{stats['kept']} kept, {stats['discarded']} discarded"
-            )
+        finally:
+            self._finish(stats, start_time)
 
-            if len(scored_news) == 0:
-                logger.info("No relevant news found. Pipeline complete.")
-                return stats
+        return stats
 
-            # STEP 4: Save to database
-            logger.info("STEP 4: Saving to database...")
-            saved_count = 0
-            for news in scored_news:
-                news_id = self.db.insert_news(news)
-                if news_id:
-                    saved_count += 1
-                    # Add ID for alert tracking
-                    news['id'] = news_id
-
-            logger.info(f"✓ Saved {saved_count} news items to database")
-
-            # STEP 5: Send alerts
-            logger.info("STEP 5: Sending alerts for high severity news...")
-            high_severity = [
-                n for n in scored_news
-                if n.get('severity') in ['high', 'critical']
-            ]
-
-            if high_severity:
-                for news in high_severity:
-                    if self.alert_manager.send_alert(news):
-                        stats['alerted'] += 1
-                        # Mark as alerted in DB
-                        if 'id' in news:
-                            self.db.mark_as_alerted(news['id'])
+    def resume(self) -> Dict:
+        """
+        Finish the items an interrupted run left in the staging table
 
-                logger.info(f"✓ Sent {stats['alerted']} alerts")
-            else:
-                logger.info("✓ No high severity news to alert")
+        Items that were never scored are scored, scored items are saved and
+        saved high/critical items are alerted; completed work is not repeated.
+
+        Returns:
+            Dict with execution statistics (plus 'resumed': items picked up)
+        """
+        start_time = time.time()
+        stats = self._new_stats()
+        self._begin_run('resume')
+
+        logger.info("="*60)
+        logger.info("Resuming unfinished pipeline items")
+        logger.info("="*60)
+
+        try:
+            by_stage = {'extracted': [], 'scored': [], 'saved': []}
+            for item in self.db.get_unfinished_items():
+                news = item['news']
+                if item['news_id'] is not None:
+                    news['id'] = item['news_id']
+                by_stage[item['stage']].append(news)
+
+            stats['resumed'] = sum(len(items) for items in by_stage.values())
+            logger.info(
+                f"✓ {stats['resumed']} unfinished items: {len(by_stage['extracted'])} to score, "
+                f"{len(by_stage['scored'])} to save, {len(by_stage['saved'])} to alert"
+            )
+
+            if stats['resumed']:
+                self._score_save_alert(
+                    stats, by_stage['extracted'], by_stage['scored'], by_stage['saved']
+                )
 
         except Exception as e:
             logger.error(f"Pipeline error: {e}")
@@ -232,22 +682,91 @@ class ETLPipeline:
             raise
 
         finally:
-            # Calculate duration
-            duration = time.time() - start_time
-            stats['duration'] = duration
+            self._finish(stats, start_time)
+
+        return stats
 
-            # Log execution stats
-            self.db.log_execution(stats)
+    def run_streaming(self) -> Dict:
+        """
+        Run the pipeline with all stages connected by bounded queues
 
-            # Print summary
-            logger.info("="*60)
-            logger.info("ETL Pipeline execution complete")
-            logger.info(f"Duration: {duration:.2f} seconds")
-            logger.info(f"Stats: {stats}")
-            logger.info("="*60)
+        Items are deduplicated, scored, saved and alerted as soon as their
+        source returns them, instead of waiting for the whole previous step.
+
+        Returns:
+            Dict with execution statistics (same keys as run(), plus
+            item_latency: end-to-end seconds per item)
+        """
+        start_time = time.time()
+        self._begin_run('streaming')
+        streaming_run = StreamingRun(
+            self,
+            queue_size=int(os.getenv("STREAM_QUEUE_SIZE", "50")),
+            score_workers=int(os.getenv("STREAM_SCORE_WORKERS", "8"))
+        )
+
+        logger.info("="*60)
+        logger.info("Starting ETL Pipeline execution (streaming)")
+        logger.info("="*60)
+
+        try:
+            stats = streaming_run.execute()
+            self._record_scorer_stats(stats)
+        except Exception as e:
+            logger.error(f"Pipeline error: {e}")
+            streaming_run.stats['errors'].append(str(e))
+            raise
+        finally:
+            self._finish(streaming_run.stats, start_time)
+
+        return stats
+
+    def run_workers(self, workers: int = None) -> Dict:
+        """
+        Run the pipeline with scoring spread over worker processes
+
+        This process extracts and enqueues items in a SQLite work queue;
+        each worker process claims batches to deduplicate, score and store.
+        Alerts and the execution log stay here (see worker_pool.py).
+
+        Args:
+            workers: Worker processes (default: WORKER_PROCESSES, 4)
+
+        Returns:
+            Dict with execution statistics (same keys as run(), plus
+            workers: per-worker item counts and busy time)
+        """
+        start_time = time.time()
+        self._begin_run('workers')
+        worker_run = WorkerPoolRun(
+            self,
+            workers=workers or int(os.getenv("WORKER_PROCESSES", "4")),
+            batch_size=int(os.getenv("WORKER_BATCH_SIZE", "10")),
+            queue_path=os.getenv("WORK_QUEUE_PATH", "data/work_queue.db"),
+            lease_seconds=float(os.getenv("WORKER_LEASE_SECONDS", "600"))
+        )
+
+        logger.info("="*60)
+        logger.info("Starting ETL Pipeline execution (workers)")
+        logger.info("="*60)
+
+        try:
+            stats = worker_run.execute()
+        except Exception as e:
+            logger.error(f"Pipeline error: {e}")
+            worker_run.stats['errors'].append(str(e))
+            raise
+        finally:
+            self._finish(worker_run.stats, start_time)
 
         return stats
 
+    def close(self):
+        """Release scorer resources (its event-loop thread) and flush pending alerts"""
+        self.scorer.close()
+        self.alert_dispatcher.close()
+        self.alert_manager.close()
+
     def get_stats(self) -> Dict:
         """Get pipeline and database statistics"""
         db_stats = self.db.get_stats()
@@ -259,24 +778,25 @@ class ETLPipeline:
         }
 
 
-def main():
-    """Main entry point"""
-    # Load environment variables
-    load_dotenv()
+def pipeline_from_env() -> "ETLPipeline":
+    """
+    Build an ETLPipeline from environment variables
 
-    # Get configuration from environment
+    Raises:
+        ValueError: If GOOGLE_CLOUD_PROJECT is missing for a real LLM backend
+    """
     project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
     use_mock = os.getenv("USE_MOCK_ADK", "false").lower() == "true"
+    use_fake_llm = os.getenv("USE_FAKE_LLM", "false").lower() == "true"
     enable_email = os.getenv("ENABLE_EMAIL_ALERTS", "false").lower() == "true"
     use_supabase = os.getenv("USE_SUPABASE", "false").lower() == "true"
 
     # Validate configuration
-    if not use_mock and not project_id:
-        logger.error(
+    if not use_mock and not use_fake_llm and not project_id:
+        raise ValueError(
             "GOOGLE_CLOUD_PROJECT environment variable required. "
             "Set USE_MOCK_ADK=true for testing without credentials."
         )
-        sys.exit(1)
 
     # Create logs directory
     os.makedirs("logs", exist_ok=True)
@@ -287,27 +807,85 @@ def main():
     else:
         logger.info("Database: SQLite (local)")
 
-    # Initialize and run pipeline
+    return ETLPipeline(
+        project_id=project_id,
+        use_mock_adk=use_mock,
+        enable_email_alerts=enable_email,
+        use_supabase=use_supabase
+    )
+
+
+def main():
+    """Main entry point"""
+    # Load environment variables
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="ETL pipeline for Movilidad Medellín news")
+    parser.add_argument('--resume', action='store_true',
+                        help='Finish the items an interrupted run left unfinished')
+    args = parser.parse_args()
+
+    mode = os.getenv("PIPELINE_MODE", "batch").lower()
+
+    metrics_port = int(os.getenv("METRICS_PORT", "0"))
+    if metrics_port:
+        METRICS.serve(metrics_port)
+
     try:
-        pipeline = ETLPipeline(
-            project_id=project_id,
-            use_mock_adk=use_mock,
-            enable_email_alerts=enable_email,
-            use_supabase=use_supabase
-        )
+        pipeline = pipeline_from_env()
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Fatal error: {e}")
+        sys.exit(1)
 
-        stats = pipeline.run()
+    # Run pipeline
+    try:
+        try:
+            if args.resume:
+                stats = pipeline.resume()
+            elif mode == "streaming":
+                stats = pipeline.run_streaming()
+            elif mode == "workers":
+                stats = pipeline.run_workers()
+            else:
+                stats = pipeline.run()
+        finally:
+            pipeline.close()
 
         # Print summary
         print("\n" + "="*60)
         print("PIPELINE EXECUTION SUMMARY")
         print("="*60)
+        if 'resumed' in stats:
+            print(f"Resumed:        {stats['resumed']}")
         print(f"Extracted:      {stats['extracted']}")
         print(f"Deduplicated:   {stats['deduplicated']}")
         print(f"Scored:         {stats['scored']}")
         print(f"Kept:           {stats['kept']}")
         print(f"Discarded:      {stats['discarded']}")
-        print(f"Alerted:        {stats['alerted']}")
+        print(f"Failed:         {stats['failed']}")
+        if stats['deferred']:
+            print(f"Deferred:       {stats['deferred']} "
+                  f"(oldest waiting {stats['oldest_deferred_age'] / 60:.0f} min)")
+        if stats['dead_lettered'] or stats['dead_letter_retries']:
+            print(f"Dead letters:   {stats['dead_lettered']} queued, "
+                  f"{stats['dead_letter_retries']} retried")
+        print(f"Retries:        {stats['retries']} ({stats['throttled']} throttled)")
+        print(f"Alerted:        {stats['alerted']}"
+              + (f" ({stats['alerts_coalesced']} in digests)" if stats.get('alerts_coalesced') else ""))
+        if stats.get('avg_tokens_per_item'):
+            print(f"Tokens/item:    {stats['avg_tokens_per_item']:.0f}")
+        if stats.get('time_to_alert'):
+            print(f"Time to alert:  p50 {stats['time_to_alert']['p50']:.2f}s | "
+                  f"p95 {stats['time_to_alert']['p95']:.2f}s")
+        if stats.get('item_latency'):
+            print(f"Item latency:   p50 {stats['item_latency']['p50']:.2f}s | "
+                  f"p95 {stats['item_latency']['p95']:.2f}s")
+        if stats.get('workers'):
+            print(f"Workers:        {len(stats['workers'])} "
+                  f"({', '.join(str(w['items']) for w in stats['workers'])} items)")
         print(f"Duration:       {stats['duration']:.2f}s")
         if stats['errors']:
             print(f"Errors:         {len(stats['errors'])}")
@@ -0,0 +1,268 @@
+"""
+Process-wide metrics for the ETL pipeline
+Timers and histograms for stages, sources, model calls and database
+operations, exported in Prometheus text format over HTTP or to a
+node_exporter textfile collector
+"""
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+from latency_tracker import percentile
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+QUANTILES = (50, 95, 99)
+
+# Per-run observations kept for the run summary; past this, a uniform
+# sample (count and total stay exact), so long jobs use constant memory
+RUN_SAMPLE_SIZE = 10000
+
+HELP = {
+    'etl_runs_total': 'Pipeline runs',
+    'etl_stage_seconds': 'Wall time of a pipeline stage in a batch run',
+    'etl_stage_item_seconds': 'Time a streaming stage spends on one item',
+    'etl_source_seconds': 'Time to extract one source',
+    'etl_source_items': 'Items returned by one source extraction',
+    'etl_scoring_call_seconds': 'Latency of one model call',
+    'etl_scoring_prompt_bytes': 'Size of the user prompt sent to the model',
+    'etl_scoring_tokens_total': 'Tokens used by model calls',
+    'etl_db_seconds': 'Latency of one database operation',
+    'etl_time_to_alert_seconds': 'Seconds from extraction to alert delivered on every channel',
+    'etl_email_send_seconds': 'Time to send one alert email over the open SMTP session',
+    'etl_emails_total': 'Alert emails by outcome (sent or failed)',
+    'etl_smtp_connects_total': 'SMTP sessions opened (connect, STARTTLS and login)',
+    'etl_alerts_total': 'Alerts by delivery (immediate or coalesced into a digest)',
+    'etl_alert_digests_total': 'Digests sent for coalesced follow-up alerts',
+    'etl_incident_items_total': 'Stored items by incident outcome (opened, joined, escalated)',
+    'etl_incident_match_seconds': 'Seconds to match an item to its incident',
+    'etl_alert_deliveries_total': 'Alert outbox delivery attempts by channel and outcome (delivered, pending retry, failed)',
+}
+
+
+class Histogram:
+    """
+    Observations of one metric/label set
+
+    Keeps cumulative count and sum, a sliding window of recent values for
+    the exported quantiles, and the count, sum and a reservoir sample of the
+    values observed since the current run started (for the per-run summary
+    stored in execution_log).
+    """
+
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.sum = 0.0
+        self.window = deque(maxlen=window)
+        self.reset_run()
+
+    def reset_run(self):
+        self.run_count = 0
+        self.run_sum = 0.0
+        self.run_values: List[float] = []
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.window.append(value)
+        self.run_count += 1
+        self.run_sum += value
+        if len(self.run_values) < RUN_SAMPLE_SIZE:
+            self.run_values.append(value)
+        else:
+            # Reservoir sampling: every observation is kept with equal probability
+            slot = random.randrange(self.run_count)
+            if slot < RUN_SAMPLE_SIZE:
+                self.run_values[slot] = value
+
+
+def summarize(values: List[float], count: int = None, total: float = None) -> Dict:
+    """
+    Count, total and p50/p95/p99 of a list of observations
+
+    count and total override the list's own when it is a sample
+    """
+    if not values:
+        return {'count': 0, 'total': 0.0}
+    summary = {
+        'count': len(values) if count is None else count,
+        'total': sum(values) if total is None else total
+    }
+    for q in QUANTILES:
+        summary[f'p{q}'] = percentile(values, q)
+    return summary
+
+
+def _label_key(labels: Dict) -> Tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: Tuple, extra: Dict = None) -> str:
+    pairs = list(key) + sorted((extra or {}).items())
+    if not pairs:
+        return ''
+    body = ','.join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return '{' + body + '}'
+
+
+class MetricsRegistry:
+    """Thread-safe registry of histograms (exported as summaries) and counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[Tuple, Histogram]] = {}
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+
+    def observe(self, name: str, value: float, **labels):
+        """Record one observation"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Increase a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the seconds spent in the with-block (also on error)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def start_run(self):
+        """Forget the per-run observations (cumulative values are kept)"""
+        with self._lock:
+            for series in self._histograms.values():
+                for histogram in series.values():
+                    histogram.reset_run()
+
+    def run_summary(self, name: str) -> Dict[str, Dict]:
+        """
+        Summarize a histogram's observations since start_run()
+
+        Returns:
+            Dict keyed by the label values (joined with '/') with count,
+            total and p50/p95/p99; label sets without observations are left out
+        """
+        with self._lock:
+            series = {
+                key: (list(histogram.run_values), histogram.run_count, histogram.run_sum)
+                for key, histogram in self._histograms.get(name, {}).items()
+                if histogram.run_values
+            }
+        return {
+            '/'.join(str(value) for _, value in key) or 'all': summarize(values, count, total)
+            for key, (values, count, total) in series.items()
+        }
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} summary")
+                for key, histogram in sorted(series.items()):
+                    window = list(histogram.window)
+                    for q in QUANTILES:
+                        value = percentile(window, q) if window else float('nan')
+                        lines.append(
+                            f"{name}{_format_labels(key, {'quantile': q / 100})} {value:g}"
+                        )
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:g}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str):
+        """Write the metrics for node_exporter's textfile collector (atomic rename)"""
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+    def serve(self, port: int) -> ThreadingHTTPServer:
+        """Serve GET /metrics on a background thread"""
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/metrics':
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                payload = registry.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                logger.debug(f"metrics: {format % args}")
+
+        server = ThreadingHTTPServer(('0.0.0.0', port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="etl-metrics", daemon=True).start()
+        logger.info(f"✓ Metrics endpoint on :{port}/metrics")
+        return server
+
+
+class InstrumentedDatabase:
+    """
+    Wraps a database backend and times every public method call in
+    etl_db_seconds{op=<method>}; everything else is passed through
+    """
+
+    def __init__(self, db, registry: MetricsRegistry):
+        self._db = db
+        self._registry = registry
+
+    def __getattr__(self, name):
+        attribute = getattr(self._db, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        def timed(*args, **kwargs):
+            with self._registry.timer('etl_db_seconds', op=name):
+                return attribute(*args, **kwargs)
+
+        return timed
+
+
+# Shared by the pipeline, scorers and extractors
+METRICS = MetricsRegistry()
+
+
+def extract_timed(name: str, extract) -> List[Dict]:
+    """Run one source extraction, timing it and counting its items"""
+    with METRICS.timer('etl_source_seconds', source=name):
+        news = extract()
+    METRICS.observe('etl_source_items', len(news), source=name)
+    return news
@@ -2,6 +2,10 @@
 System prompts for ADK Scorer (Google Gemini)
 Optimized for Medellín mobility news classification
 """
+import hashlib
+from typing import Optional
+
+from .token_budget import COMPRESSION_TABLES, DEFAULT_BODY_TOKEN_BUDGET, compress_body
 
 SYSTEM_PROMPT = """Eres un experto analista de noticias de movilidad urbana en Medellín, Colombia.
 
@@ -127,11 +131,59 @@ Responde en formato JSON según las instrucciones del sistema.
 """
 
 
-def build_user_prompt(news_item: dict) -> str:
-    """Build user prompt from news item"""
-    return USER_PROMPT_TEMPLATE.format(
+# Optional line appended to the user prompt by the gazetteer stage
+# (gazetteer_scorer.py): places found locally, as a hint or as the final
+# area/entities the model does not need to write. Not part of PROMPT_HASH;
+# that stage versions its own prompts.
+LOCATION_HINT_TEMPLATE = "**Lugares detectados:** {places} (área probable: {area})"
+LOCATION_PRESET_TEMPLATE = (
+    "**Lugares ya identificados:** {places} (área: {area}). "
+    'Responde "area": "" y "entities": [], se completan automáticamente.'
+)
+
+
+def prompt_hash(body_token_budget: Optional[int] = DEFAULT_BODY_TOKEN_BUDGET) -> str:
+    """
+    Hash of what the model is shown: instructions, prompt template, body
+    token budget and body compression tables (see token_budget.py)
+    """
+    return hashlib.sha256(
+        '\n'.join([SYSTEM_PROMPT, USER_PROMPT_TEMPLATE, str(body_token_budget), COMPRESSION_TABLES])
+        .encode('utf-8')
+    ).hexdigest()[:12]
+
+
+# Hash for the default body budget
+PROMPT_HASH = prompt_hash()
+
+
+def build_scorer_version(
+    model_name: str,
+    body_token_budget: Optional[int] = DEFAULT_BODY_TOKEN_BUDGET
+) -> str:
+    """Version tag stored with each scored row: model + prompt hash"""
+    return f"{model_name}@{prompt_hash(body_token_budget)}"
+
+
+def build_user_prompt(
+    news_item: dict,
+    body_token_budget: Optional[int] = DEFAULT_BODY_TOKEN_BUDGET
+) -> str:
+    """
+    Build user prompt from news item
+
+    Args:
+        news_item: Dict with keys: source, title, body, published_at (and
+            optionally location_hint, see LOCATION_HINT_TEMPLATE)
+        body_token_budget: Token budget for the body (None = full body
+            without boilerplate)
+    """
+    prompt = USER_PROMPT_TEMPLATE.format(
         source=news_item.get('source', 'Desconocido'),
         title=news_item.get('title', ''),
-        body=news_item.get('body', '')[:1500],  # Limit body length for API
+        body=compress_body(news_item.get('body', ''), body_token_budget),
         published_at=news_item.get('published_at', '')
     )
+    if news_item.get('location_hint'):
+        prompt += f"{news_item['location_hint']}\n"
+    return prompt
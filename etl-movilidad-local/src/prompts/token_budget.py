@@ -0,0 +1,129 @@
+"""
+Token budgeting for user prompts
+Keeps the mobility-relevant sentences of a news body and drops boilerplate
+so each item fits a configurable token budget
+"""
+import re
+from typing import List, Optional
+
+from text_utils import fold
+
+# Default body budget per item (~1200 characters of Spanish text)
+DEFAULT_BODY_TOKEN_BUDGET = 300
+
+# Sentences matching any of these are never sent to the model
+BOILERPLATE_PATTERNS = [
+    r'suscr[ií]bete', r'suscr[ií]base', r'lea tambi[eé]n', r'le puede interesar',
+    r'te puede interesar', r's[ií]guenos', r'comp[aá]rt(e|a|elo)', r'haga clic',
+    r'haz clic', r'cookies', r'pol[ií]tica de privacidad', r'todos los derechos',
+    r'copyright', r'publicidad', r'newsletter', r'whatsapp', r'descarga la app',
+    r'^foto:', r'^video:', r'^cr[eé]dito', r'^\(?ap\)?$', r'^m[aá]s noticias',
+]
+_BOILERPLATE_RE = re.compile('|'.join(BOILERPLATE_PATTERNS), re.IGNORECASE)
+
+# Accent-free keywords with their weight in the sentence score
+MOBILITY_KEYWORDS = {
+    'cierre': 3, 'cerrad': 3, 'bloqueo': 3, 'bloquead': 3, 'desvio': 3,
+    'suspension': 3, 'suspendid': 3, 'accidente': 3, 'choque': 2, 'volcamiento': 2,
+    'derrumbe': 3, 'deslizamiento': 3, 'inundacion': 3, 'hundimiento': 3,
+    'emergencia': 2, 'incendio': 2, 'represamiento': 2,
+    'manifestacion': 2, 'protesta': 2, 'paro': 2, 'trancon': 2, 'congestion': 2,
+    'restriccion': 2, 'pico y placa': 2, 'obra': 1, 'carril': 2, 'calzada': 2,
+    'via': 1, 'vias': 1, 'autopista': 2, 'avenida': 1, 'calle': 1, 'carrera': 1,
+    'regional': 1, 'las vegas': 1, 'tunel': 2, 'puente': 1, 'glorieta': 1,
+    'metro': 2, 'linea': 1, 'estacion': 1, 'tranvia': 2, 'metrocable': 2,
+    'cable': 1, 'bus': 1, 'buses': 1, 'ruta': 1, 'encicla': 1, 'ciclorruta': 1,
+    'movilidad': 2, 'transito': 2, 'trafico': 2, 'vehicul': 1, 'lluvia': 1,
+    'horario': 1, 'tarifa': 1, 'hoy': 1, 'manana': 1,
+}
+
+_KEYWORD_PATTERNS = [
+    (re.compile(r'\b' + re.escape(keyword)), weight)
+    for keyword, weight in MOBILITY_KEYWORDS.items()
+]
+
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?…])\s+|\n+')
+
+# Everything besides the budget that decides which sentences reach the
+# model; part of the prompt hash, so editing a table versions the prompt
+COMPRESSION_TABLES = repr((
+    sorted(MOBILITY_KEYWORDS.items()), BOILERPLATE_PATTERNS, _SENTENCE_SPLIT_RE.pattern
+))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate for Gemini models (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split a body into trimmed, non-empty sentences"""
+    return [s.strip() for s in _SENTENCE_SPLIT_RE.split(text or '') if s and s.strip()]
+
+
+def is_boilerplate(sentence: str) -> bool:
+    """Whether a sentence is navigation, promotion or credit boilerplate"""
+    return bool(_BOILERPLATE_RE.search(sentence.strip())) or len(sentence.strip()) < 15
+
+
+def sentence_score(sentence: str) -> int:
+    """Mobility relevance of a sentence (sum of matched keyword weights)"""
+    folded = fold(sentence)
+    return sum(weight for pattern, weight in _KEYWORD_PATTERNS if pattern.search(folded))
+
+
+def compress_body(text: str, max_tokens: Optional[int] = DEFAULT_BODY_TOKEN_BUDGET) -> str:
+    """
+    Fit a news body into a token budget
+
+    The lead sentence is always kept; the remaining budget goes to the
+    highest scoring mobility sentences, which are returned in their
+    original order. Boilerplate and exact repeats are dropped. When no
+    sentence mentions mobility, the leading sentences are kept instead so
+    the model still has enough context to discard the item.
+
+    Args:
+        text: News body
+        max_tokens: Token budget for the body (None = only drop boilerplate)
+
+    Returns:
+        Compressed body
+    """
+    sentences = []
+    seen = set()
+    for sentence in split_sentences(text):
+        key = fold(sentence)
+        if key in seen or is_boilerplate(sentence):
+            continue
+        seen.add(key)
+        sentences.append(sentence)
+
+    if not sentences:
+        return (text or '').strip()[:max_tokens * 4] if max_tokens else (text or '').strip()
+
+    if max_tokens is None:
+        return ' '.join(sentences)
+
+    budget = max_tokens
+    selected = set()
+
+    # Lead sentence carries the who/where in news writing
+    lead_cost = estimate_tokens(sentences[0])
+    if lead_cost > budget:
+        return sentences[0][:budget * 4]
+    selected.add(0)
+    budget -= lead_cost
+
+    scores = {i: sentence_score(sentences[i]) for i in range(1, len(sentences))}
+    if any(scores.values()):
+        candidates = sorted((i for i in scores if scores[i] > 0), key=lambda i: (-scores[i], i))
+    else:
+        candidates = list(scores)
+
+    for i in candidates:
+        cost = estimate_tokens(sentences[i]) + 1
+        if cost <= budget:
+            selected.add(i)
+            budget -= cost
+
+    return ' '.join(sentences[i] for i in sorted(selected))
@@ -0,0 +1,273 @@
+"""
+Client-side rate limiting for Vertex AI calls
+Token buckets for requests/min and tokens/min, AIMD adaptive concurrency
+and jittered exponential backoff for throttled or transient errors
+"""
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Error classes used to decide whether a failed call is retried
+THROTTLED = "throttled"
+TRANSIENT = "transient"
+INVALID_RESPONSE = "invalid_response"
+FATAL = "fatal"
+
+RETRYABLE_ERROR_CLASSES = (THROTTLED, TRANSIENT, INVALID_RESPONSE)
+
+# A 429 status in an error message ("429 RESOURCE_EXHAUSTED...", "status
+# 429", "'code': 429", "HTTP 429"), not any 429 in a URL, id or count
+_THROTTLED_STATUS_RE = re.compile(
+    r'^\s*429\b|\b(?:status|code|http)(?:[\s_:=\'"]|code)*429\b', re.IGNORECASE
+)
+
+
+class ScoringError(Exception):
+    """
+    Raised when a news item could not be scored (as opposed to discarded)
+
+    Attributes:
+        error_class: One of THROTTLED, TRANSIENT, INVALID_RESPONSE, FATAL
+        attempts: Number of attempts made before giving up
+    """
+
+    def __init__(self, message: str, error_class: str = FATAL, attempts: int = 1):
+        super().__init__(message)
+        self.error_class = error_class
+        self.attempts = attempts
+
+
+def classify_error(exc: BaseException) -> str:
+    """
+    Classify an exception raised by a model call
+
+    Args:
+        exc: Exception raised by the ADK runner or the GenAI client
+
+    Returns:
+        THROTTLED for quota errors (429 / RESOURCE_EXHAUSTED), TRANSIENT for
+        timeouts and 5xx errors, FATAL otherwise
+    """
+    if isinstance(exc, ScoringError):
+        return exc.error_class
+
+    code = getattr(exc, 'code', None) or getattr(exc, 'status_code', None)
+    text = str(exc)
+
+    if code == 429 or 'RESOURCE_EXHAUSTED' in text or _THROTTLED_STATUS_RE.search(text):
+        return THROTTLED
+
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return TRANSIENT
+    if code in (500, 502, 503, 504):
+        return TRANSIENT
+    if 'UNAVAILABLE' in text or 'DEADLINE_EXCEEDED' in text:
+        return TRANSIENT
+
+    return FATAL
+
+
+class TokenBucket:
+    """
+    Token bucket limiter refilled continuously at a per-minute rate
+
+    Acquiring reserves capacity immediately and returns how long the caller
+    must wait, so concurrent callers are served in arrival order.
+    A rate of 0 or None disables the bucket.
+    """
+
+    def __init__(self, rate_per_minute: Optional[float], capacity: Optional[float] = None):
+        """
+        Initialize token bucket
+
+        Args:
+            rate_per_minute: Refill rate (units per minute), None/0 = unlimited
+            capacity: Maximum burst size (default: one minute of refill)
+        """
+        self.rate_per_minute = rate_per_minute or 0
+        self.rate = self.rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else self.rate_per_minute)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def reserve(self, amount: float = 1) -> float:
+        """
+        Reserve capacity from the bucket
+
+        Args:
+            amount: Units to take (clamped to the bucket capacity)
+
+        Returns:
+            Seconds the caller must wait before using the reservation
+        """
+        if not self.enabled:
+            return 0.0
+
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    async def acquire(self, amount: float = 1):
+        """Reserve capacity and sleep until it is available"""
+        wait = self.reserve(amount)
+        if wait > 0:
+            logger.debug(f"Rate limit: waiting {wait:.2f}s for {amount} units")
+            await asyncio.sleep(wait)
+
+    def adjust(self, delta: float):
+        """
+        Correct a previous reservation once the real cost is known
+
+        Args:
+            delta: Units to give back (positive) or take (negative)
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + delta)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limiter
+
+    The limit grows additively (+increase per limit successful calls, i.e.
+    roughly one slot per round trip) and is cut multiplicatively when the
+    backend throttles. Decreases are spaced by a cooldown so a burst of 429s
+    from the same window only halves the limit once.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 2.0
+    ):
+        """
+        Initialize adaptive concurrency limiter
+
+        Args:
+            initial_limit: Starting number of concurrent calls
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            increase: Additive increase per round trip
+            decrease_factor: Multiplicative decrease on throttling
+            decrease_cooldown: Minimum seconds between two decreases
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._waiters = deque()
+
+    @property
+    def current_limit(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    async def acquire(self):
+        """Wait until a concurrency slot is free and take it"""
+        while self.in_flight >= self.current_limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                raise
+        self.in_flight += 1
+
+    def release(self, throttled: bool = False, success: bool = True):
+        """
+        Release a slot and adapt the limit
+
+        Args:
+            throttled: The call was rejected by quota (multiplicative decrease)
+            success: The call completed normally (additive increase)
+        """
+        self.in_flight = max(0, self.in_flight - 1)
+
+        if throttled:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.decrease_cooldown:
+                self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                self._last_decrease = now
+                logger.warning(f"Throttled by Vertex AI: concurrency limit → {self.current_limit}")
+        elif success:
+            self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+
+        self._wake_waiters()
+
+    def _wake_waiters(self):
+        free = self.current_limit - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter"""
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 1.0, max_delay: float = 30.0):
+        """
+        Initialize retry policy
+
+        Args:
+            max_attempts: Total attempts per item, including the first one
+            base_delay: Backoff for the first retry (seconds)
+            max_delay: Upper bound for a single backoff (seconds)
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, error_class: str, attempt: int) -> bool:
+        """Whether a failed attempt number `attempt` should be retried"""
+        return error_class in RETRYABLE_ERROR_CLASSES and attempt < self.max_attempts
+
+    def backoff(self, attempt: int, error_class: str = TRANSIENT) -> float:
+        """
+        Delay before the next attempt
+
+        Throttled calls back off from twice the base delay, since quota
+        windows are refilled per minute.
+        """
+        base = self.base_delay * (2 if error_class == THROTTLED else 1)
+        ceiling = min(self.max_delay, base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
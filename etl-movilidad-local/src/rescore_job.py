@@ -0,0 +1,185 @@
+"""
+Background re-scoring job
+Walks news_item in id (keyset) order and re-scores rows produced by an
+older scorer version (model + prompt hash). Runs as its own process with
+its own rate limit, so it never blocks the live pipeline, and resumes
+from its checkpoint after an interruption.
+
+Usage:
+    python rescore_job.py --batch-size 50 --rpm 10
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Dict
+
+from dotenv import load_dotenv
+
+from factories import build_database, build_scorer, with_gazetteer, with_local_classifier
+from rate_limiter import ScoringError, TokenBucket
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "rescore"
+
+
+class RescoreJob:
+    """
+    Resumable, rate-limited re-scoring of stored news
+
+    The checkpoint stores the last processed id together with the scorer
+    version it was produced for; a checkpoint from another version is
+    ignored and the walk starts over.
+    """
+
+    def __init__(self, db, scorer, batch_size: int = 50, requests_per_minute: float = 10):
+        """
+        Initialize re-scoring job
+
+        Args:
+            db: NewsDatabase or SupabaseNewsDatabase instance
+            scorer: Scorer exposing evaluate() and scorer_version
+            batch_size: Rows read and written per batch
+            requests_per_minute: Job-level scoring rate (None/0 = unlimited)
+        """
+        self.db = db
+        self.scorer = scorer
+        self.batch_size = batch_size
+        self.pacer = TokenBucket(requests_per_minute, capacity=1)
+        self.version = scorer.scorer_version
+
+    def _start_id(self, reset: bool) -> Dict:
+        checkpoint = None if reset else self.db.get_job_checkpoint(JOB_NAME)
+        if checkpoint and checkpoint.get('scorer_version') == self.version:
+            logger.info(
+                f"Resuming re-scoring after id {checkpoint['last_id']} "
+                f"({checkpoint['processed']} rows already processed)"
+            )
+            return {'last_id': checkpoint['last_id'], 'processed': checkpoint['processed']}
+        return {'last_id': 0, 'processed': 0}
+
+    def run(self, max_rows: int = None, reset: bool = False) -> Dict:
+        """
+        Re-score rows from older scorer versions
+
+        Args:
+            max_rows: Stop after this many rows (None = until done)
+            reset: Ignore the saved checkpoint
+
+        Returns:
+            Dict with job statistics
+        """
+        position = self._start_id(reset)
+        last_id = position['last_id']
+        processed = position['processed']
+        stats = {'rescored': 0, 'kept': 0, 'discarded': 0, 'failed': 0, 'batches': 0}
+        start_time = time.time()
+
+        logger.info(f"🔁 Re-scoring news to version {self.version}")
+
+        while max_rows is None or stats['rescored'] + stats['failed'] < max_rows:
+            limit = self.batch_size
+            if max_rows is not None:
+                limit = min(limit, max_rows - stats['rescored'] - stats['failed'])
+            rows = self.db.get_rows_to_rescore(self.version, after_id=last_id, limit=limit)
+            if not rows:
+                break
+
+            updates = []
+            for row in rows:
+                time.sleep(self.pacer.reserve(1))
+                try:
+                    result = self.scorer.evaluate(row)
+                except ScoringError as e:
+                    # Left on its old version; the checkpoint moves past it, so
+                    # only a walk started with --reset retries it
+                    stats['failed'] += 1
+                    logger.warning(f"Could not re-score news {row['id']}: [{e.error_class}] {e}")
+                    continue
+                # Local classifier keeps carry the classifier's version, so a
+                # later walk sends them to the LLM
+                updates.append({
+                    **result, 'id': row['id'],
+                    'scorer_version': result.get('scorer_version', self.version)
+                })
+                stats['kept' if result.get('keep') else 'discarded'] += 1
+
+            self.db.update_scoring_batch(updates)
+            stats['rescored'] += len(updates)
+            stats['batches'] += 1
+            processed += len(rows)
+            last_id = rows[-1]['id']
+            self.db.save_job_checkpoint(JOB_NAME, last_id, self.version, processed)
+
+            logger.info(
+                f"✓ Batch {stats['batches']}: {len(updates)}/{len(rows)} rows re-scored "
+                f"(up to id {last_id})"
+            )
+
+        stats['duration'] = time.time() - start_time
+        if stats['failed']:
+            logger.warning(
+                f"⚠️  {stats['failed']} rows could not be re-scored and keep their old "
+                f"version; run again with --reset to retry them"
+            )
+        return stats
+
+
+def main():
+    """Main entry point"""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Re-score news from older scorer versions")
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument(
+        '--rpm', type=float, default=float(os.getenv("RESCORE_RPM", "10")),
+        help='Scoring requests per minute for this job (0 = unlimited)'
+    )
+    parser.add_argument('--max-rows', type=int, default=None)
+    parser.add_argument(
+        '--reset', action='store_true',
+        help='Ignore the saved checkpoint and walk from the first row (retries failed rows)'
+    )
+    args = parser.parse_args()
+
+    project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
+    use_mock = os.getenv("USE_MOCK_ADK", "false").lower() == "true"
+    use_fake_llm = os.getenv("USE_FAKE_LLM", "false").lower() == "true"
+    if not use_mock and not use_fake_llm and not project_id:
+        logger.error("GOOGLE_CLOUD_PROJECT environment variable required")
+        sys.exit(1)
+
+    db = build_database(os.getenv("USE_SUPABASE", "false").lower() == "true")
+    job = RescoreJob(
+        db=db,
+        # Same stages as the live pipeline, so the target version matches
+        # the one it writes
+        scorer=with_gazetteer(with_local_classifier(
+            build_scorer(project_id, use_mock, label_sink=db.save_scoring_label)
+        )),
+        batch_size=args.batch_size,
+        requests_per_minute=args.rpm or None
+    )
+
+    try:
+        stats = job.run(max_rows=args.max_rows, reset=args.reset)
+    except KeyboardInterrupt:
+        logger.info("Re-scoring interrupted; progress is checkpointed")
+        sys.exit(0)
+
+    print("\n" + "="*60)
+    print("RE-SCORING SUMMARY")
+    print("="*60)
+    print(f"Version:        {job.version}")
+    print(f"Re-scored:      {stats['rescored']} ({stats['kept']} kept, {stats['discarded']} discarded)")
+    print(f"Failed:         {stats['failed']}")
+    print(f"Batches:        {stats['batches']}")
+    print(f"Duration:       {stats['duration']:.2f}s")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
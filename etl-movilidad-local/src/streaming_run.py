@@ -0,0 +1,265 @@
+"""
+Streaming ETL run - extract → dedup → score → save → alert as connected
+stages with bounded queues, so each item moves on as soon as it is ready
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from latency_tracker import percentile
+from metrics import METRICS, extract_timed
+from rate_limiter import ScoringError, classify_error
+from urgency import urgency
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+class StreamingRun:
+    """
+    One streaming execution of an ETLPipeline
+
+    Every source is extracted in its own thread; dedup, save and alert run
+    in one thread each and scoring in score_workers threads sharing the
+    pipeline's (thread-safe) scorer. Queues between stages are bounded, so
+    a slow stage blocks the stages feeding it instead of buffering
+    everything in memory.
+
+    Produces the same stats dict as ETLPipeline.run(), plus item_latency
+    (end-to-end seconds from extraction to the item's last stage).
+    """
+
+    def __init__(self, pipeline, queue_size: int = 50, score_workers: int = 8):
+        """
+        Initialize streaming run
+
+        Args:
+            pipeline: ETLPipeline providing extractor, db, scorer and alert_manager
+            queue_size: Capacity of each inter-stage queue
+            score_workers: Threads calling scorer.score concurrently
+        """
+        self.pipeline = pipeline
+        self.queue_size = queue_size
+        self.score_workers = score_workers
+        self.stats = pipeline._new_stats()
+        self._lock = threading.Lock()
+        self._latencies: List[float] = []
+        self._seen_urls = set()
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _error(self, message: str):
+        with self._lock:
+            self.stats['errors'].append(message)
+
+    def _finished(self, envelope: Dict):
+        """Record the end-to-end latency of an item that left the pipeline"""
+        with self._lock:
+            self._latencies.append(time.monotonic() - envelope['started'])
+
+    def _stage(self, name: str, inbox: queue.Queue, handle: Callable, outbox: queue.Queue,
+               producers: int = 1, consumers: int = 1):
+        """
+        Generic stage loop: handle items until every producer is done, then
+        signal every consumer downstream
+
+        handle(envelope) returns the envelope to forward, or None to stop it here.
+        """
+        remaining = producers
+        try:
+            while remaining:
+                envelope = inbox.get()
+                if envelope is _DONE:
+                    remaining -= 1
+                    continue
+                try:
+                    with METRICS.timer('etl_stage_item_seconds', stage=name):
+                        forward = handle(envelope)
+                except Exception as e:
+                    logger.error(f"{name} stage error: {e}")
+                    self._error(f"[{name}] {e}")
+                    self._finished(envelope)
+                    continue
+                if forward is not None and outbox is not None:
+                    outbox.put(forward)
+        finally:
+            if outbox is not None:
+                for _ in range(consumers):
+                    outbox.put(_DONE)
+
+    # Stage handlers ---------------------------------------------------
+
+    @staticmethod
+    def _by_urgency(news_items: List[Dict]) -> List[Dict]:
+        """Most urgent first, as in batch runs (see urgency.py)"""
+        now = datetime.now()
+        return sorted(news_items, key=lambda news: urgency(news, now), reverse=True)
+
+    def _extract_source(self, name: str, extract: Callable, outbox: queue.Queue):
+        try:
+            news_items = extract_timed(name, extract)
+            logger.info(f"✓ Extracted {len(news_items)} from {name}")
+        except Exception as e:
+            logger.error(f"✗ Error extracting {name}: {e}")
+            self._error(f"[extract] {name}: {e}")
+            return
+        extracted_at = time.monotonic()
+        for news in self._by_urgency(news_items):
+            self._count('extracted')
+            outbox.put({'news': news, 'started': extracted_at})
+
+    def _feed_staged(self, outbox: queue.Queue):
+        """Queue due dead-letter retries and the items earlier runs deferred"""
+        try:
+            retries = self.pipeline.dead_letters.due_items()
+            carried = self.pipeline.db.get_deferred_items()
+        except Exception as e:
+            logger.error(f"✗ Error reading retries and deferred items: {e}")
+            self._error(f"[extract] staged items: {e}")
+            return
+        self._count('dead_letter_retries', len(retries))
+        if carried:
+            logger.info(f"✓ {len(carried)} items carried over from earlier runs")
+        # Each URL once, even if it is both deferred and a retry
+        staged = {}
+        for news in retries + [item['news'] for item in carried]:
+            staged.setdefault(news['url'], news)
+        started = time.monotonic()
+        for news in self._by_urgency(list(staged.values())):
+            outbox.put({'news': news, 'started': started, 'staged': True})
+
+    def _dedup(self, envelope: Dict):
+        if envelope.get('staged'):
+            # Dead-lettered and deferred items are staged already and due for scoring
+            return envelope
+        url = envelope['news']['url']
+        with self._lock:
+            seen = url in self._seen_urls
+            self._seen_urls.add(url)
+        # Staged items an earlier run already scored are not scored again
+        if seen or self.pipeline.db.is_duplicate(url) or not self.pipeline.db.stage_items([envelope['news']]):
+            self._count('deduplicated')
+            self._finished(envelope)
+            return None
+        return envelope
+
+    def _score(self, envelope: Dict):
+        try:
+            result = self.pipeline.scorer.score(envelope['news'])
+        except ScoringError as e:
+            # Not a discard: the model never gave a verdict
+            self._count('failed')
+            self._error(f"[{e.error_class}] {e}")
+            self._dead_letter(envelope, e.error_class, e)
+            return None
+        except Exception as e:
+            logger.error(f"Error scoring news: {e}")
+            self._count('failed')
+            self._error(str(e))
+            self._dead_letter(envelope, classify_error(e), e)
+            return None
+
+        self.pipeline.dead_letters.resolve(envelope['news']['url'])
+        self._count('scored')
+        if not result:
+            self.pipeline.db.update_stage(envelope['news']['url'], 'discarded')
+            self._count('discarded')
+            self._finished(envelope)
+            return None
+        self.pipeline.db.update_stage(envelope['news']['url'], 'scored', payload=result)
+        self._count('kept')
+        envelope['news'] = result
+        return envelope
+
+    def _dead_letter(self, envelope: Dict, error_class: str, error: Exception):
+        self.pipeline.dead_letters.record_failure(envelope['news'], error_class, str(error))
+        self._count('dead_lettered')
+        self._finished(envelope)
+
+    def _save(self, envelope: Dict):
+        self.pipeline._save_news(envelope['news'])
+        if envelope['news'].get('severity') in ['high', 'critical']:
+            return envelope
+        self._finished(envelope)
+        return None
+
+    def _alert(self, envelope: Dict):
+        if self.pipeline._send_alert(envelope['news'], time.monotonic() - envelope['started']):
+            self._count('alerted')
+        self._finished(envelope)
+        return None
+
+    def execute(self) -> Dict:
+        """
+        Run all stages until every extracted item has left the pipeline
+
+        Returns:
+            Dict with execution statistics
+        """
+        sources = self.pipeline.extractor.source_tasks()
+        to_dedup = queue.Queue(self.queue_size)
+        to_score = queue.Queue(self.queue_size)
+        to_save = queue.Queue(self.queue_size)
+        to_alert = queue.Queue(self.queue_size)
+
+        self.pipeline.scorer.reset_run_stats()
+        logger.info(
+            f"Streaming run: {len(sources)} sources, {self.score_workers} scoring workers, "
+            f"queues of {self.queue_size}"
+        )
+
+        stages = [
+            threading.Thread(target=self._stage, name="etl-dedup",
+                             args=("dedup", to_dedup, self._dedup, to_score, 1, self.score_workers)),
+            threading.Thread(target=self._stage, name="etl-save",
+                             args=("save", to_save, self._save, to_alert, self.score_workers, 1)),
+            threading.Thread(target=self._stage, name="etl-alert",
+                             args=("alert", to_alert, self._alert, None)),
+        ] + [
+            threading.Thread(target=self._stage, name=f"etl-score-{i}",
+                             args=("score", to_score, self._score, to_save, 1, 1))
+            for i in range(self.score_workers)
+        ]
+        for stage in stages:
+            stage.start()
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, len(sources)),
+                                    thread_name_prefix="etl-extract") as extract_pool:
+                extract_pool.submit(self._feed_staged, to_dedup)
+                for name, extract in sources:
+                    extract_pool.submit(self._extract_source, name, extract, to_dedup)
+        finally:
+            to_dedup.put(_DONE)
+            for stage in stages:
+                stage.join()
+
+        self._record_latency()
+        return self.stats
+
+    def _record_latency(self):
+        """Add end-to-end item latency to the stats and log it"""
+        latencies = self._latencies
+        if not latencies:
+            return
+        self.stats['item_latency'] = {
+            'count': len(latencies),
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'max': max(latencies)
+        }
+        logger.info(
+            f"✓ Item latency (extraction → last stage): "
+            f"p50 {self.stats['item_latency']['p50']:.2f}s | "
+            f"p95 {self.stats['item_latency']['p95']:.2f}s | "
+            f"max {self.stats['item_latency']['max']:.2f}s over {len(latencies)} items"
+        )
@@ -0,0 +1,18 @@
+"""
+Text normalisation shared by matching code
+Accent- and case-insensitive forms used to compare Spanish text (keywords,
+places, areas); no domain imports, so any module can use it
+"""
+import unicodedata
+from typing import Optional
+
+
+def fold(text: Optional[str]) -> str:
+    """Lowercase, accent-free text"""
+    text = unicodedata.normalize('NFKD', (text or '').lower())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+def normalize_area(area: Optional[str]) -> str:
+    """Lowercase, accent-free, single-spaced area (underscores as spaces)"""
+    return ' '.join(fold((area or '').replace('_', ' ')).split())
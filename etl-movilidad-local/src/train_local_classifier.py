@@ -0,0 +1,139 @@
+"""
+Train the local relevance classifier from stored LLM labels
+Evaluates on a held-out split at several confidence thresholds, then
+refits on all labels and saves the model
+
+Usage:
+    python train_local_classifier.py --thresholds 0.8 0.9 0.95
+    python train_local_classifier.py --labels labelled.jsonl --no-save
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+from typing import Dict, List
+
+from dotenv import load_dotenv
+
+from factories import build_database
+from local_classifier import LocalRelevanceClassifier, load_labelled_items
+from local_first_scorer import LocalFirstScorer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class _NoLLM:
+    """Placeholder LLM scorer for offline evaluation (never called)"""
+    scorer_version = 'offline'
+
+    def reset_run_stats(self):
+        pass
+
+
+def evaluate_thresholds(
+    classifier: LocalRelevanceClassifier,
+    items: List[Dict],
+    thresholds: List[float],
+    allow_local_keep: bool
+) -> List[Dict]:
+    """
+    Measure how the local-first stage would behave on held-out labels
+
+    Args:
+        classifier: Classifier trained without the held-out items
+        items: Held-out labelled items
+        thresholds: Confidence thresholds to compare
+        allow_local_keep: Whether confident low/medium keeps are answered locally
+
+    Returns:
+        One dict per threshold with coverage (share answered locally),
+        accuracy of local answers, false discards (LLM keeps discarded
+        locally) and severity accuracy of local keeps
+    """
+    predictions = classifier.predict(items)
+    reports = []
+    for threshold in thresholds:
+        stage = LocalFirstScorer(classifier, _NoLLM(), threshold, allow_local_keep)
+        answered = correct = false_discards = local_keeps = severity_correct = 0
+        for item, prediction in zip(items, predictions):
+            verdict = stage.local_verdict(item, prediction)
+            if verdict is None:
+                continue
+            answered += 1
+            expected_keep = bool(item.get('keep'))
+            if verdict['keep'] == expected_keep:
+                correct += 1
+            elif expected_keep:
+                false_discards += 1
+            if verdict['keep'] and expected_keep:
+                local_keeps += 1
+                severity_correct += verdict['severity'] == item.get('severity')
+        reports.append({
+            'threshold': threshold,
+            'coverage': answered / len(items) if items else 0.0,
+            'accuracy': correct / answered if answered else 0.0,
+            'false_discards': false_discards,
+            'severity_accuracy': severity_correct / local_keeps if local_keeps else None
+        })
+    return reports
+
+
+def main():
+    """Main entry point"""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Train the local relevance classifier")
+    parser.add_argument('--labels', help='Labelled JSONL file (default: labels stored in the database)')
+    parser.add_argument('--output', default=os.getenv("LOCAL_CLASSIFIER_PATH", "data/local_classifier.npz"))
+    parser.add_argument('--holdout', type=float, default=0.2, help='Fraction held out for evaluation')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--epochs', type=int, default=200)
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[0.8, 0.9, 0.95, 0.99])
+    parser.add_argument('--local-keeps', action='store_true',
+                        help='Evaluate with confident low/medium keeps answered locally')
+    parser.add_argument('--no-save', action='store_true', help='Only evaluate')
+    args = parser.parse_args()
+
+    if args.labels:
+        items = load_labelled_items(args.labels)
+    else:
+        items = build_database(os.getenv("USE_SUPABASE", "false").lower() == "true").get_training_labels()
+
+    kept = sum(1 for item in items if item.get('keep'))
+    if kept == 0 or kept == len(items):
+        logger.error(
+            f"Need both kept and discarded labels to train ({len(items)} labels, {kept} kept). "
+            f"Discards are recorded in scoring_label as the pipeline runs."
+        )
+        sys.exit(1)
+
+    random.Random(args.seed).shuffle(items)
+    split = int(len(items) * (1 - args.holdout))
+    train, held_out = items[:split], items[split:]
+
+    classifier = LocalRelevanceClassifier(epochs=args.epochs).fit(train)
+    reports = evaluate_thresholds(classifier, held_out, args.thresholds, args.local_keeps)
+
+    print("\n" + "="*70)
+    print(f"LOCAL CLASSIFIER EVALUATION ({len(train)} train / {len(held_out)} held out, "
+          f"{kept / len(items):.0%} kept)")
+    print("="*70)
+    print(f"{'Threshold':>9} {'Local':>7} {'Accuracy':>9} {'False discards':>15} {'Sev acc':>8}")
+    for report in reports:
+        severity = '-' if report['severity_accuracy'] is None else f"{report['severity_accuracy']:.1%}"
+        print(
+            f"{report['threshold']:>9.2f} {report['coverage']:>7.1%} {report['accuracy']:>9.1%} "
+            f"{report['false_discards']:>15} {severity:>8}"
+        )
+    print("Local = share of items answered without the LLM")
+    print("="*70 + "\n")
+
+    if not args.no_save:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        LocalRelevanceClassifier(epochs=args.epochs).fit(items).save(args.output)
+
+
+if __name__ == "__main__":
+    main()
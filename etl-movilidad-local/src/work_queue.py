@@ -0,0 +1,269 @@
+"""
+Durable local work queue (SQLite) with lease/ack semantics
+The coordinator enqueues extracted items per run; worker processes claim
+batches under a time-limited lease and ack each item with its outcome.
+Leases of crashed workers expire (or are released by the coordinator) and
+the items are claimed again.
+"""
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List
+
+
+class WorkQueue:
+    """SQLite work queue shared by the coordinator and the worker processes"""
+
+    def __init__(self, db_path: str = "data/work_queue.db"):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection that waits on locks instead of failing"""
+        # isolation_level=None: transactions are opened explicitly
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def init_database(self):
+        """Initialize queue schema"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+
+        # status: queued → leased → done
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS work_item (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                retry INTEGER DEFAULT 0,
+                status TEXT DEFAULT 'queued',
+                lease_owner TEXT,
+                lease_expires_at REAL,
+                attempts INTEGER DEFAULT 0,
+                result TEXT,
+                alert_pending INTEGER DEFAULT 0,
+                enqueued_at REAL,
+                updated_at REAL
+            )
+        ''')
+
+        # One row per run; closed once extraction has enqueued everything
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS work_run (
+                run_id TEXT PRIMARY KEY,
+                closed INTEGER DEFAULT 0,
+                created_at REAL
+            )
+        ''')
+
+        # Final counters reported by each worker process
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS worker_report (
+                run_id TEXT NOT NULL,
+                worker_id TEXT NOT NULL,
+                report TEXT NOT NULL,
+                PRIMARY KEY (run_id, worker_id)
+            )
+        ''')
+
+        # Queue files created before alert handoff
+        cursor.execute('PRAGMA table_info(work_item)')
+        columns = {row[1] for row in cursor.fetchall()}
+        for column, definition in (('alert_pending', 'INTEGER DEFAULT 0'), ('enqueued_at', 'REAL')):
+            if column not in columns:
+                cursor.execute(f'ALTER TABLE work_item ADD COLUMN {column} {definition}')
+
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_work_claim ON work_item(run_id, status, id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_work_alert ON work_item(run_id, alert_pending)')
+        conn.close()
+
+    def open_run(self, run_id: str):
+        """Register a run whose items are about to be enqueued"""
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR IGNORE INTO work_run (run_id, created_at) VALUES (?, ?)',
+            (run_id, time.time())
+        )
+        conn.close()
+
+    def close_run(self, run_id: str):
+        """Mark a run as fully enqueued (workers exit once it is drained)"""
+        conn = self._connect()
+        conn.execute('UPDATE work_run SET closed = 1 WHERE run_id = ?', (run_id,))
+        conn.close()
+
+    def is_closed(self, run_id: str) -> bool:
+        conn = self._connect()
+        row = conn.execute('SELECT closed FROM work_run WHERE run_id = ?', (run_id,)).fetchone()
+        conn.close()
+        return bool(row and row[0])
+
+    def enqueue(self, run_id: str, items: List[Dict], retry: bool = False) -> int:
+        """
+        Add items to a run in a single transaction
+
+        Args:
+            run_id: Run the items belong to
+            items: News items
+            retry: Items are dead-letter retries (already staged; skip dedup)
+
+        Returns:
+            Number of items enqueued
+        """
+        if not items:
+            return 0
+        now = time.time()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        conn.executemany(
+            'INSERT INTO work_item (run_id, payload, retry, enqueued_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+            [(run_id, json.dumps(item, default=str), int(retry), now, now) for item in items]
+        )
+        conn.execute('COMMIT')
+        conn.close()
+        return len(items)
+
+    def claim(self, run_id: str, worker_id: str, batch_size: int, lease_seconds: float) -> List[Dict]:
+        """
+        Lease up to batch_size queued (or lease-expired) items of a run
+
+        The select and the update run in one IMMEDIATE transaction, so two
+        workers never lease the same item.
+
+        Returns:
+            List of dicts with id, news, retry and attempts
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        conn.execute('BEGIN IMMEDIATE')
+        rows = conn.execute('''
+            SELECT id, payload, retry, attempts FROM work_item
+            WHERE run_id = ?
+              AND (status = 'queued' OR (status = 'leased' AND lease_expires_at < ?))
+            ORDER BY id
+            LIMIT ?
+        ''', (run_id, now, batch_size)).fetchall()
+        if rows:
+            conn.executemany('''
+                UPDATE work_item SET
+                    status = 'leased', lease_owner = ?, lease_expires_at = ?,
+                    attempts = attempts + 1, updated_at = ?
+                WHERE id = ?
+            ''', [(worker_id, now + lease_seconds, now, row['id']) for row in rows])
+        conn.execute('COMMIT')
+        conn.close()
+
+        return [
+            {'id': row['id'], 'news': json.loads(row['payload']),
+             'retry': bool(row['retry']), 'attempts': row['attempts'] + 1}
+            for row in rows
+        ]
+
+    def ack(self, worker_id: str, results: Dict[int, Dict]):
+        """
+        Complete leased items with their outcome
+
+        Items whose lease was taken over by another worker are left alone.
+        Outcomes with an 'alert' are handed to the coordinator (take_alerts).
+
+        Args:
+            worker_id: Worker holding the leases
+            results: item id → outcome dict (stored as JSON)
+        """
+        if not results:
+            return
+        now = time.time()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        conn.executemany('''
+            UPDATE work_item SET status = 'done', result = ?, alert_pending = ?, updated_at = ?
+            WHERE id = ? AND status = 'leased' AND lease_owner = ?
+        ''', [
+            (json.dumps(result, default=str), int('alert' in result), now, item_id, worker_id)
+            for item_id, result in results.items()
+        ])
+        conn.execute('COMMIT')
+        conn.close()
+
+    def take_alerts(self, run_id: str) -> List[Dict]:
+        """
+        Take the high/critical items acked since the last call
+
+        Returns:
+            List of dicts with news (saved item to alert) and enqueued_at
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        rows = conn.execute(
+            'SELECT id, result, enqueued_at FROM work_item WHERE run_id = ? AND alert_pending = 1',
+            (run_id,)
+        ).fetchall()
+        conn.executemany('UPDATE work_item SET alert_pending = 0 WHERE id = ?', [(row[0],) for row in rows])
+        conn.execute('COMMIT')
+        conn.close()
+        return [{'news': json.loads(row[1])['alert'], 'enqueued_at': row[2]} for row in rows]
+
+    def release(self, worker_id: str) -> int:
+        """
+        Put the items leased by a (crashed) worker back in the queue
+
+        Returns:
+            Number of items released
+        """
+        conn = self._connect()
+        cursor = conn.execute('''
+            UPDATE work_item SET status = 'queued', lease_owner = NULL, lease_expires_at = NULL
+            WHERE status = 'leased' AND lease_owner = ?
+        ''', (worker_id,))
+        released = cursor.rowcount
+        conn.close()
+        return released
+
+    def pending(self, run_id: str) -> int:
+        """Items of a run that are not done yet"""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT COUNT(*) FROM work_item WHERE run_id = ? AND status != 'done'", (run_id,)
+        ).fetchone()
+        conn.close()
+        return row[0]
+
+    def results(self, run_id: str) -> List[Dict]:
+        """Outcomes of the done items of a run"""
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT result FROM work_item WHERE run_id = ? AND status = 'done' ORDER BY id",
+            (run_id,)
+        ).fetchall()
+        conn.close()
+        return [json.loads(row[0]) for row in rows]
+
+    def save_report(self, run_id: str, worker_id: str, report: Dict):
+        """Store a worker's final counters"""
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO worker_report (run_id, worker_id, report) VALUES (?, ?, ?)',
+            (run_id, worker_id, json.dumps(report, default=str))
+        )
+        conn.close()
+
+    def reports(self, run_id: str) -> List[Dict]:
+        """Final counters of every worker of a run"""
+        conn = self._connect()
+        rows = conn.execute(
+            'SELECT report FROM worker_report WHERE run_id = ? ORDER BY worker_id', (run_id,)
+        ).fetchall()
+        conn.close()
+        return [json.loads(row[0]) for row in rows]
+
+    def purge(self, run_id: str):
+        """Delete a finished run from the queue"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        for table in ('work_item', 'work_run', 'worker_report'):
+            conn.execute(f'DELETE FROM {table} WHERE run_id = ?', (run_id,))
+        conn.execute('COMMIT')
+        conn.close()
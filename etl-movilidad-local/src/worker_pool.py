@@ -0,0 +1,396 @@
+"""
+Multi-process ETL run
+The coordinator extracts every source and enqueues the items in a durable
+SQLite work queue; N worker processes claim batches under a lease, then
+deduplicate, score and store them. Alerts and log_execution stay in the
+coordinator.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from metrics import METRICS, extract_timed
+from rate_limiter import ScoringError, classify_error
+from work_queue import WorkQueue
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Scorer counters summed over the workers' reports
+SUMMED_STATS = ('throttled', 'retries', 'timeouts', 'hedged', 'local_answers',
+                'input_tokens', 'output_tokens')
+
+
+def process_item(pipeline, item: Dict) -> Dict:
+    """
+    Deduplicate, score and store one claimed item
+
+    Args:
+        pipeline: The worker's own ETLPipeline
+        item: Claimed work item (news, retry)
+
+    Returns:
+        Outcome dict: outcome (duplicate, discarded, kept or failed), plus the
+        saved news for high/critical items (to alert) and the error of failures
+    """
+    news = item['news']
+    url = news['url']
+    db = pipeline.db
+
+    # Dead-letter retries are staged already and due for scoring
+    if not item['retry'] and (db.is_duplicate(url) or not db.stage_items([news])):
+        return {'outcome': 'duplicate'}
+
+    try:
+        result = pipeline.scorer.score(news)
+    except ScoringError as e:
+        pipeline.dead_letters.record_failure(news, e.error_class, str(e))
+        return {'outcome': 'failed', 'error': f"[{e.error_class}] {e}"}
+    except Exception as e:
+        logger.error(f"Error scoring news: {e}")
+        pipeline.dead_letters.record_failure(news, classify_error(e), str(e))
+        return {'outcome': 'failed', 'error': str(e)}
+
+    if item['retry']:
+        db.delete_dead_letter(url)
+
+    if not result:
+        db.update_stage(url, 'discarded')
+        return {'outcome': 'discarded'}
+
+    db.update_stage(url, 'scored', payload=result)
+    high = result.get('severity') in ['high', 'critical']
+    pipeline._assign_incident(result)
+    news_id = db.insert_news(result, alert_channels=pipeline._alert_channels(result))
+    if news_id:
+        result['id'] = news_id
+        db.update_stage(url, 'saved' if high else 'done', payload=result, news_id=news_id)
+    elif db.is_duplicate(url):
+        db.update_stage(url, 'done')
+
+    outcome = {'outcome': 'kept', 'saved': bool(news_id)}
+    if high and result.get('incident_alert', True):
+        outcome['alert'] = result
+    return outcome
+
+
+def worker_main(
+    worker_id: str,
+    run_id: str,
+    queue_path: str,
+    batch_size: int,
+    lease_seconds: float,
+    poll_interval: float = 0.2,
+    env: Optional[Dict[str, str]] = None
+):
+    """
+    Worker process: claim batches of a run until it is closed and drained
+
+    Every worker builds its own pipeline (scorer, database connection) from
+    the environment; `env` overrides variables first (e.g. the worker's share
+    of the rate limits).
+    """
+    os.environ.update(env or {})
+    # Imported here: main imports this module
+    from main import pipeline_from_env
+
+    pipeline = pipeline_from_env()
+    work_queue = WorkQueue(queue_path)
+    stats = pipeline._new_stats()
+    pipeline.scorer.reset_run_stats()
+    METRICS.start_run()
+    items = 0
+    busy = 0.0
+
+    try:
+        while True:
+            # Read before claiming: once closed, an empty claim means drained
+            closed = work_queue.is_closed(run_id)
+            batch = work_queue.claim(run_id, worker_id, batch_size, lease_seconds)
+            if not batch:
+                if closed:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            started = time.perf_counter()
+            results = {}
+            for item in batch:
+                results[item['id']] = result = process_item(pipeline, item)
+                items += 1
+                if result['outcome'] == 'duplicate':
+                    stats['deduplicated'] += 1
+                elif result['outcome'] == 'failed':
+                    stats['failed'] += 1
+                else:
+                    stats['scored'] += 1
+                    stats[result['outcome']] += 1
+            work_queue.ack(worker_id, results)
+            busy += time.perf_counter() - started
+    finally:
+        pipeline._record_scorer_stats(stats)
+        work_queue.save_report(run_id, worker_id, {
+            'worker_id': worker_id,
+            'pid': os.getpid(),
+            'items': items,
+            'busy_seconds': busy,
+            'metered_calls': pipeline.scorer.get_run_stats().get('metered_calls', 0),
+            'stats': {key: stats[key] for key in SUMMED_STATS},
+            'timings': pipeline._run_timings()
+        })
+        pipeline.close()
+
+
+class WorkerPoolRun:
+    """
+    One multi-process execution of an ETLPipeline
+
+    The coordinator (this process) starts the workers, extracts every source
+    in its own thread and enqueues each source's new URLs as it returns.
+    Workers exit once the run is closed and the queue drained. A worker that
+    dies has its leases released and is replaced (at most `workers` times);
+    items still unfinished at the end are reported in the errors and picked
+    up by the next run (staged as 'extracted', or extracted again).
+
+    Produces the same stats dict as ETLPipeline.run(), plus per-worker
+    counters in stats['workers'].
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        workers: int = 4,
+        batch_size: int = 10,
+        queue_path: str = "data/work_queue.db",
+        lease_seconds: float = 600
+    ):
+        """
+        Initialize worker run
+
+        Args:
+            pipeline: ETLPipeline providing extractor, db, dead letters and alert_manager
+            workers: Worker processes
+            batch_size: Items claimed per lease
+            queue_path: SQLite file of the work queue
+            lease_seconds: Seconds before a claimed item may be claimed again
+        """
+        self.pipeline = pipeline
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.lease_seconds = lease_seconds
+        self.queue = WorkQueue(queue_path)
+        self.run_id = uuid.uuid4().hex
+        self.stats = pipeline._new_stats()
+        self._seen_urls = set()
+        self._lock = threading.Lock()
+        # spawn: workers must not inherit the coordinator's threads or connections
+        self._context = multiprocessing.get_context('spawn')
+        self._processes: Dict[str, multiprocessing.Process] = {}
+
+    def _worker_env(self) -> Dict[str, str]:
+        """Split the model rate limits evenly between the workers"""
+        return {
+            name: str(float(os.getenv(name, default)) / self.workers)
+            for name, default in (('VERTEX_RPM_LIMIT', '60'), ('VERTEX_TPM_LIMIT', '120000'))
+        }
+
+    def _start_worker(self, index: int):
+        worker_id = f"w{index}-{self.run_id[:8]}"
+        process = self._context.Process(
+            target=worker_main,
+            name=f"etl-worker-{index}",
+            args=(worker_id, self.run_id, self.queue.db_path, self.batch_size, self.lease_seconds),
+            kwargs={'env': self._worker_env()},
+            daemon=True
+        )
+        process.start()
+        self._processes[worker_id] = process
+
+    def _extract_source(self, name: str, extract: Callable):
+        try:
+            news_items = extract_timed(name, extract)
+            logger.info(f"✓ Extracted {len(news_items)} from {name}")
+        except Exception as e:
+            logger.error(f"✗ Error extracting {name}: {e}")
+            return
+        unique = []
+        with self._lock:
+            self.stats['extracted'] += len(news_items)
+            # Same URL from two sources: only one worker may score it
+            for news in news_items:
+                if news['url'] in self._seen_urls:
+                    self.stats['deduplicated'] += 1
+                else:
+                    self._seen_urls.add(news['url'])
+                    unique.append(news)
+        self.queue.enqueue(self.run_id, unique)
+
+    def _extract(self):
+        """Enqueue due dead-letter retries and every source's items, then close the run"""
+        try:
+            retries = self.pipeline.dead_letters.due_items()
+            self.stats['dead_letter_retries'] = len(retries)
+            self._seen_urls.update(news['url'] for news in retries)
+            self.queue.enqueue(self.run_id, retries, retry=True)
+
+            sources = self.pipeline.extractor.source_tasks()
+            # One thread per source; enqueueing happens in the source's thread
+            with METRICS.timer('etl_stage_seconds', stage='extract'), \
+                    ThreadPoolExecutor(max_workers=max(1, len(sources)),
+                                       thread_name_prefix="etl-extract") as extract_pool:
+                for name, extract in sources:
+                    extract_pool.submit(self._extract_source, name, extract)
+            logger.info(f"✓ Enqueued {self.stats['extracted'] - self.stats['deduplicated']} items "
+                        f"(+{len(retries)} retries); extraction closed")
+        except Exception as e:
+            message = f"Extraction failed: {e}"
+            logger.error(f"✗ {message}")
+            with self._lock:
+                self.stats['errors'].append(message)
+        finally:
+            # Always closed, or the workers would wait for more items forever
+            self.queue.close_run(self.run_id)
+
+    def _supervise(self, poll_interval: float = 0.5):
+        """
+        Wait for the workers, releasing and replacing the ones that die;
+        high/critical items are alerted as soon as a worker acks them
+        """
+        restarts = 0
+        handled = set()
+        while True:
+            self._alert(self.queue.take_alerts(self.run_id))
+            alive = 0
+            for worker_id, process in list(self._processes.items()):
+                if process.is_alive():
+                    alive += 1
+                    continue
+                if worker_id in handled:
+                    continue
+                handled.add(worker_id)
+                if process.exitcode == 0:
+                    continue
+                released = self.queue.release(worker_id)
+                message = f"Worker {worker_id} exited with code {process.exitcode} ({released} items released)"
+                logger.error(message)
+                self.stats['errors'].append(message)
+                if self.queue.pending(self.run_id) and restarts < self.workers:
+                    restarts += 1
+                    self._start_worker(self.workers + restarts)
+                    alive += 1
+            if not alive:
+                self._alert(self.queue.take_alerts(self.run_id))
+                return
+            time.sleep(poll_interval)
+
+    def _collect(self):
+        """Fold the workers' outcomes and reports into the stats"""
+        for result in self.queue.results(self.run_id):
+            outcome = result['outcome']
+            if outcome == 'duplicate':
+                self.stats['deduplicated'] += 1
+                continue
+            if outcome == 'failed':
+                self.stats['failed'] += 1
+                self.stats['dead_lettered'] += 1
+                self.stats['errors'].append(result['error'])
+                continue
+            self.stats['scored'] += 1
+            self.stats[outcome] += 1
+
+        unfinished = self.queue.pending(self.run_id)
+        if unfinished:
+            message = f"{unfinished} items left unfinished (picked up by the next run)"
+            logger.warning(message)
+            self.stats['errors'].append(message)
+
+        metered = 0
+        workers = []
+        for report in self.queue.reports(self.run_id):
+            for key in SUMMED_STATS:
+                self.stats[key] += report['stats'][key]
+            metered += report['metered_calls']
+            workers.append({
+                'worker_id': report['worker_id'],
+                'items': report['items'],
+                'busy_seconds': round(report['busy_seconds'], 3),
+                'scoring_calls': report['timings']['scoring_calls']
+            })
+        self.stats['workers'] = workers
+        tokens = self.stats['input_tokens'] + self.stats['output_tokens']
+        self.stats['avg_tokens_per_item'] = tokens / metered if metered else 0
+
+    def _recover(self) -> List[Dict]:
+        """
+        Finish the items a dead worker had scored or saved (the worker that
+        claimed them again found them staged and left them alone), and retry
+        alerts that could not be sent
+
+        Returns:
+            The recovered high/critical items to alert
+        """
+        to_alert = []
+        for item in self.pipeline.db.get_unfinished_items():
+            news = item['news']
+            if item['stage'] == 'extracted' or news['url'] not in self._seen_urls:
+                continue
+            if item['stage'] == 'scored':
+                self.pipeline._save_news(news)
+            elif item['news_id'] is not None:
+                news['id'] = item['news_id']
+            self.stats['recovered'] = self.stats.get('recovered', 0) + 1
+            if news.get('severity') in ['high', 'critical']:
+                to_alert.append({'news': news, 'enqueued_at': None})
+        if self.stats.get('recovered'):
+            logger.info(f"✓ Recovered {self.stats['recovered']} unfinished items")
+        return to_alert
+
+    def _alert(self, to_alert: List[Dict]):
+        """Alert items taken from the queue (news, enqueued_at)"""
+        if not to_alert:
+            return
+        with METRICS.timer('etl_stage_seconds', stage='alert'):
+            for item in to_alert:
+                waited = time.time() - item['enqueued_at'] if item['enqueued_at'] else None
+                if self.pipeline._send_alert(item['news'], waited):
+                    self.stats['alerted'] += 1
+
+    def execute(self) -> Dict:
+        """
+        Extract while the workers drain the queue, alerting as they go
+
+        Returns:
+            Dict with execution statistics
+        """
+        self.queue.open_run(self.run_id)
+        logger.info(f"Worker run {self.run_id[:8]}: {self.workers} processes, "
+                    f"batches of {self.batch_size}")
+        try:
+            for index in range(self.workers):
+                self._start_worker(index)
+            # Extraction runs beside the supervisor, which alerts meanwhile
+            extraction = threading.Thread(target=self._extract, name="etl-enqueue")
+            extraction.start()
+            with METRICS.timer('etl_stage_seconds', stage='workers'):
+                self._supervise()
+            extraction.join()
+
+            self._collect()
+            logger.info(
+                f"✓ Workers scored {self.stats['scored']} items: {self.stats['kept']} kept, "
+                f"{self.stats['discarded']} discarded, {self.stats['failed']} failed"
+            )
+            # Alerts whose send failed, and items of dead workers
+            self._alert(self._recover())
+        finally:
+            for process in self._processes.values():
+                if process.is_alive():
+                    process.terminate()
+            self.queue.purge(self.run_id)
+
+        return self.stats